@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 
 from pathlib import Path
 import os
+import sys
+
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -21,15 +24,69 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.1/howto/deployment/checklist/
 
+# Deployment profile: "development" (runserver) or "production"
+# (pre-forked gunicorn workers, see gunicorn.conf.py)
+DJANGO_ENV = os.environ.get("DJANGO_ENV", "development")
+IS_PRODUCTION = DJANGO_ENV == "production"
+TESTING = sys.argv[1:2] == ["test"]
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-p5-)d%b)5t)xl!@3qse-6=2n6v*m!x2)fez&nlzip_wmg95%@t'    # TODO: os.environ.get(...)
+SECRET_KEY = os.environ.get(
+    "DJANGO_SECRET_KEY",
+    'django-insecure-p5-)d%b)5t)xl!@3qse-6=2n6v*m!x2)fez&nlzip_wmg95%@t'
+)
+if IS_PRODUCTION and "DJANGO_SECRET_KEY" not in os.environ:
+    raise ImproperlyConfigured("DJANGO_SECRET_KEY is required in production.")
 JWT_SECRET_KEY = "change_me: uborehjnuobhefjnrbhoijngrvbefhowijnjnh"  # TODO: os.environ.get(...)
 JWT_ISSUER = "WEEKLY_CHEF_APP"   # TODO: os.environ.get(...)
+# Asymmetric signing (see app_auth.keys): a directory of PEM private keys
+# named <kid>.pem (manage.py generate_jwt_key), RSA keys sign RS256,
+# Ed25519 keys EdDSA. The active key signs (default: the last kid), the
+# other keys and <kid>.pub.pem public keys only verify and are published
+# in the JWKS. Without a directory the tokens are signed HS256 with
+# JWT_SECRET_KEY.
+JWT_KEYS_DIR = os.environ.get("JWT_KEYS_DIR", "")
+JWT_ACTIVE_KID = os.environ.get("JWT_ACTIVE_KID", "")
+# an unknown kid reloads the directory at most once per interval (sec)
+JWT_KEYS_RELOAD_INTERVAL = int(os.environ.get("JWT_KEYS_RELOAD_INTERVAL", 30))
+# verify HS256 tokens without kid (issued before the asymmetric keys) while
+# a key signs: only during the migration, anyone knowing JWT_SECRET_KEY can
+# forge them (without a signing key they are the tokens of the app)
+JWT_ACCEPT_LEGACY_HS256 = os.environ.get("JWT_ACCEPT_LEGACY_HS256", "0") == "1"
+JWT_JWKS_MAX_AGE = int(os.environ.get("JWT_JWKS_MAX_AGE", 300))  # sec
+# Refresh token families (see app_auth.revocation): every refresh rotates
+# the refresh token, a reused refresh token revokes its family
+JWT_REFRESH_TOKEN_DAYS = int(os.environ.get("JWT_REFRESH_TOKEN_DAYS", 90))
+# refresh tokens without jti (issued before the families) are exchanged
+JWT_ACCEPT_LEGACY_REFRESH = \
+    os.environ.get("JWT_ACCEPT_LEGACY_REFRESH", "1") == "1"
+# bloom filter of the revoked ids, 2 ** 24 bits (2 MiB) hold ~1.7 million
+# ids at 1 % false positives (which are confirmed by a query)
+JWT_REVOCATION_BLOOM_BITS = int(
+    os.environ.get("JWT_REVOCATION_BLOOM_BITS", 2 ** 24)
+)
+JWT_REVOCATION_BLOOM_HASHES = int(
+    os.environ.get("JWT_REVOCATION_BLOOM_HASHES", 7)
+)
+# interval of loading the revocations of the other workers (sec)
+JWT_REVOCATION_SYNC_INTERVAL = int(
+    os.environ.get("JWT_REVOCATION_SYNC_INTERVAL", 10)
+)
+JWT_TOKEN_CACHE_SIZE = int(os.environ.get("JWT_TOKEN_CACHE_SIZE", 10000))
+JWT_TOKEN_CACHE_TTL = int(os.environ.get("JWT_TOKEN_CACHE_TTL", 300))  # sec
+
+# Cursor pagination of the list endpoints (opt-in, ?cursor= or ?page_size=)
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", 100))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 1000))
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DEBUG keeps every executed SQL string of a request in memory
+DEBUG = os.environ.get("DJANGO_DEBUG", "0" if IS_PRODUCTION else "1") == "1"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",")
+    if host
+]
 
 
 # Application definition
@@ -41,6 +98,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'drf_spectacular',
     'app_auth',
@@ -49,6 +107,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryMetricsMiddleware',
+    'core.middleware.RateLimitMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -109,7 +169,98 @@ DATABASES = {
         'USER': os.environ.get("DB_USER"),
         'PASSWORD': os.environ.get("DB_PASS"),
         'HOST': os.environ.get("DB_HOST"),
+        # persistent connections (seconds, 0 = close after each request),
+        # checked before reuse in production
+        'CONN_MAX_AGE': int(os.environ.get(
+            "DB_CONN_MAX_AGE",
+            600 if IS_PRODUCTION else 0
+        )),
+        'CONN_HEALTH_CHECKS': IS_PRODUCTION,
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+# optional shared cache for multiple workers (requires the redis package)
+if os.environ.get("CACHE_REDIS_URL"):
+    CACHES["shared"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("CACHE_REDIS_URL"),
     }
+
+RESPONSE_CACHE_ALIAS = "shared" if "shared" in CACHES else "default"
+# the versions of the response caches are bumped in one worker only,
+# the other workers would serve stale responses from their own memory
+if IS_PRODUCTION and RESPONSE_CACHE_ALIAS != "shared":
+    raise ImproperlyConfigured("CACHE_REDIS_URL is required in production.")
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", 3600))
+RECIPE_DOCUMENT_CACHE = os.environ.get("RECIPE_DOCUMENT_CACHE", "1") == "1"
+
+
+# Request instrumentation (core.middleware.QueryMetricsMiddleware)
+
+PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "1") == "1"
+PERF_SLOW_REQUEST_MS = int(os.environ.get("PERF_SLOW_REQUEST_MS", 500))
+PERF_QUERY_COUNT_THRESHOLD = int(
+    os.environ.get("PERF_QUERY_COUNT_THRESHOLD", 50)
+)
+PERF_DUPLICATE_QUERY_THRESHOLD = int(
+    os.environ.get("PERF_DUPLICATE_QUERY_THRESHOLD", 10)
+)
+PERF_STACK_LIMIT = int(os.environ.get("PERF_STACK_LIMIT", 40))
+# log the parameters of the slow queries (user data, debugging only)
+PERF_LOG_QUERY_PARAMS = \
+    os.environ.get("PERF_LOG_QUERY_PARAMS", "0") == "1"
+
+
+# Rate limiting (core.middleware.RateLimitMiddleware, core.rate_limit)
+# Token buckets per route group (the first matching group) and client
+# (JWT user_id, else IP), rates as "<requests>/<s|min|hour|day>".
+# Off in the test runner, the test clients share one IP.
+
+RATE_LIMIT_ENABLED = os.environ.get(
+    "RATE_LIMIT_ENABLED",
+    "0" if TESTING else "1"
+) == "1"
+RATE_LIMIT_GROUPS = {
+    "auth": {
+        "prefixes": ["/api/v1/token/", "/api/v1/async/token/"],
+        "methods": ["POST"],
+        "rate": os.environ.get("RATE_LIMIT_AUTH", "30/min"),
+    },
+    "write": {
+        "prefixes": ["/api/v1/"],
+        "methods": ["POST", "PUT", "PATCH", "DELETE"],
+        "rate": os.environ.get("RATE_LIMIT_WRITE", "300/min"),
+    },
+}
+# "local": buckets per process, "shared": additionally counted in the
+# RESPONSE_CACHE_ALIAS cache for all workers
+RATE_LIMIT_STORE = os.environ.get("RATE_LIMIT_STORE", "local")
+# META key of the client IP behind a reverse proxy, e.g. HTTP_X_REAL_IP
+RATE_LIMIT_IP_HEADER = os.environ.get("RATE_LIMIT_IP_HEADER", "REMOTE_ADDR")
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", 100000))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.middleware": {
+            "handlers": ["console"],
+            "level": os.environ.get("PERF_LOG_LEVEL", "WARNING"),
+        },
+    },
 }
 
 
@@ -131,6 +282,42 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing (see app_auth.hashers)
+# The policy hashes new passwords, hashes of the other policies are still
+# verified and rehashed with the policy on login.
+PASSWORD_HASHER_POLICIES = {
+    "pbkdf2": "app_auth.hashers.PBKDF2PasswordHasher",
+    "argon2": "app_auth.hashers.Argon2PasswordHasher",  # needs argon2-cffi
+    "scrypt": "app_auth.hashers.ScryptPasswordHasher",
+}
+PASSWORD_HASHER_POLICY = os.environ.get("PASSWORD_HASHER_POLICY", "pbkdf2")
+if PASSWORD_HASHER_POLICY not in PASSWORD_HASHER_POLICIES:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER_POLICY must be one of {list(PASSWORD_HASHER_POLICIES)}."
+    )
+PASSWORD_HASHERS = [PASSWORD_HASHER_POLICIES[PASSWORD_HASHER_POLICY]] + [
+    hasher for policy, hasher in PASSWORD_HASHER_POLICIES.items()
+    if policy != PASSWORD_HASHER_POLICY
+]
+# costs, changing them rehashes the passwords on login
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.environ.get("PASSWORD_PBKDF2_ITERATIONS", 390000)
+)
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get("PASSWORD_ARGON2_TIME_COST", 2))
+PASSWORD_ARGON2_MEMORY_COST = int(  # KiB
+    os.environ.get("PASSWORD_ARGON2_MEMORY_COST", 102400)
+)
+PASSWORD_ARGON2_PARALLELISM = int(
+    os.environ.get("PASSWORD_ARGON2_PARALLELISM", 8)
+)
+PASSWORD_SCRYPT_WORK_FACTOR = int(
+    os.environ.get("PASSWORD_SCRYPT_WORK_FACTOR", 2 ** 14)
+)
+# threads of the async login checking the passwords
+PASSWORD_HASHING_WORKERS = int(
+    os.environ.get("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
@@ -16,12 +16,14 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from app_auth import views as auth_views
 from core import views as core_views
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/health-check", core_views.health_check, name="heath-check"),
+    path(".well-known/jwks.json", auth_views.JWKSAPIView.as_view()),
     path("api/v1/", include("app_auth.urls")),
     path("api/v1/", include("recipe.urls")),
 ]
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_wsgi_application()
+
+if os.environ.get("DJANGO_WARMUP", "1") == "1":
+    from app.warmup import warm_up
+    warm_up()
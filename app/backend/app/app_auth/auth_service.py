@@ -1,11 +1,14 @@
 from datetime import datetime, timezone, timedelta
 from typing import Union
+from uuid import uuid4
 
 from django.core.exceptions import ObjectDoesNotExist
 
 from djdevted.request import IRequest
 
 from app import settings
+from app_auth import keys, revocation
+from app_auth.hashers import acheck_password
 from recipe.serializers import UserPostSerializer
 from core.models import User
 
@@ -37,6 +40,32 @@ def login_user(request: IRequest) -> dict:
     Handle user login
     Raises ValueError
     """
+    username, password = _get_credentials(request)
+
+    user: User = User.objects.get(username=username)
+    if not user.check_password(password):
+        raise ObjectDoesNotExist()
+
+    return _create_access_refresh_token(user.id, user.is_staff)
+
+
+async def alogin_user(request: IRequest) -> dict:
+    """
+    Handle user login under ASGI, the password is checked
+    in the hashing thread pool (see app_auth.hashers)
+    Raises ValueError
+    """
+    username, password = _get_credentials(request)
+
+    user: User = await User.objects.aget(username=username)
+    if not await acheck_password(user, password):
+        raise ObjectDoesNotExist()
+
+    return _create_access_refresh_token(user.id, user.is_staff)
+
+
+def _get_credentials(request: IRequest) -> tuple[str, str]:
+    """Returns username and password, raises ValueError if missing"""
     username = request.data.get("username")
     password = request.data.get("password")
 
@@ -46,15 +75,41 @@ def login_user(request: IRequest) -> dict:
     if not password:
         raise ValueError("The password field is required.")
 
-    user: User = User.objects.get(username=username)
-    if not user.check_password(password):
-        raise ObjectDoesNotExist()
-
-    return _create_access_refresh_token(user.id, user.is_staff)
+    return username, password
 
 
 def refresh_token(request: IRequest) -> dict:
-    """Handle refreshing token"""
+    """
+    Handle refreshing token
+    Rotates the refresh token within its family without reading the user,
+    tokens of deleted or changed users are revoked (see app_auth.revocation)
+    """
+    decoded_token = _decode_refresh_token(request)
+
+    if "jti" not in decoded_token:
+        return _exchange_legacy_refresh_token(decoded_token)
+
+    revocation.use_refresh_token(decoded_token)
+    return _create_access_refresh_token(
+        decoded_token["user_id"],
+        decoded_token.get("is_staff", False),
+        family=decoded_token["fam"]
+    )
+
+
+def revoke_refresh_token(request: IRequest) -> None:
+    """Handle logout, revokes the family of the refresh token"""
+    decoded_token = _decode_refresh_token(request)
+    if "fam" not in decoded_token:
+        raise ValueError("The refresh token has no family.")
+
+    revocation.revoke_family(
+        decoded_token["fam"],
+        decoded_token.get("user_id")
+    )
+
+
+def _decode_refresh_token(request: IRequest) -> dict:
     refresh_token = request.data.get("refresh_token")
     if not refresh_token:
         raise ValueError("No refresh token in request body.")
@@ -64,19 +119,35 @@ def refresh_token(request: IRequest) -> dict:
     if not decoded_token.get("is_refresh_token"):
         raise ValueError("The passed token is no refresh token.")
 
+    return decoded_token
+
+
+def _exchange_legacy_refresh_token(decoded_token: dict) -> dict:
+    """Refresh tokens without jti (and exp) start a new family"""
+    if not settings.JWT_ACCEPT_LEGACY_REFRESH:
+        raise ValueError("The refresh token is revoked.")
+
     user_id = decoded_token.get("user_id")
     user: User = User.objects.get(id=user_id)
+    if revocation.is_user_revoked(user.id, decoded_token.get("iat", 0)):
+        raise ValueError("The refresh token is revoked.")
 
     return _create_access_refresh_token(user.id, user.is_staff)
 
 
-def _create_access_refresh_token(user_id: int, is_staff: bool) -> dict:
-    """Generates and returns an access and refresh jwt token"""
-    refresh_token_data = {"user_id": user_id}
-    access_token_data = refresh_token_data | {"is_staff": is_staff}
+def _create_access_refresh_token(
+    user_id: int,
+    is_staff: bool,
+    family: Union[None, str] = None
+) -> dict:
+    """
+    Generates and returns an access and refresh jwt token
+    The refresh token starts a new family without family
+    """
+    token_data = {"user_id": user_id, "is_staff": is_staff}
     return {
-        "token": _create_access_token(access_token_data),
-        "refresh_token": _create_refresh_token(refresh_token_data)
+        "token": _create_access_token(token_data),
+        "refresh_token": _create_refresh_token(token_data, family)
     }
 
 
@@ -86,21 +157,32 @@ def _create_access_token(data: dict) -> str:
     return _create_token(payload, exp_duration=EXP_DURATION)
 
 
-def _create_refresh_token(data: dict) -> str:
-    """Generates and returns an refresh jwt token"""
-    payload = data | {"is_refresh_token": True}
-    return _create_token(payload, exp_duration=None)
+def _create_refresh_token(
+    data: dict,
+    family: Union[None, str] = None
+) -> str:
+    """Generates and returns an refresh jwt token of the family"""
+    payload = data | {
+        "is_refresh_token": True,
+        "jti": uuid4().hex,
+        "fam": family or uuid4().hex,
+    }
+    return _create_token(
+        payload,
+        exp_duration={"days": settings.JWT_REFRESH_TOKEN_DAYS}
+    )
 
 
 def _create_token(
     data: dict,
     exp_duration: Union[dict, None] = EXP_DURATION
 ) -> str:
-    """Create a jwt token"""
+    """Create a jwt token signed with the active key"""
     creation_date = datetime.now(tz=timezone.utc)
     issuer = settings.JWT_ISSUER
     jwt_token_settings: dict = {
         "iss": issuer,
+        "iat": creation_date.timestamp(),
         "creation_date": str(creation_date)
     }
     if exp_duration:
@@ -108,19 +190,27 @@ def _create_token(
         jwt_token_settings = {"exp": exp} | jwt_token_settings
     payload = data | jwt_token_settings
 
-    return jwt.encode(payload, key=settings.JWT_SECRET_KEY, algorithm="HS256")
+    key = keys.get_signing_key()
+    headers = {"kid": key.kid} if key.kid else None
+    return jwt.encode(
+        payload,
+        key=key.signing_key,
+        algorithm=key.algorithm,
+        headers=headers
+    )
 
 
 def decode_token(token: str) -> dict:
     """
-    Validate an given jwt token
+    Validate an given jwt token with the key of its kid
     Raises jwt.ExpiredSignatureError
     Raises jwt.InvalidSignatureError
     Returns decoded token data
     """
+    key = keys.get_verifying_key(token)
     return jwt.decode(
         token,
-        settings.JWT_SECRET_KEY,
+        key.verifying_key,
         issuer=settings.JWT_ISSUER,
-        algorithms=["HS256"]
+        algorithms=[key.algorithm]
     )
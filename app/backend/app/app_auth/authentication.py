@@ -1,12 +1,18 @@
 """
 Module for custom jwt authentication classes
 """
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from typing import Union
 
+from rest_framework import exceptions
 from rest_framework.authentication import BaseAuthentication
 
 from djdevted.request import IRequest
 
+from app import settings
 from app_auth import auth_service
 
 
@@ -25,20 +31,131 @@ class JWTAuthUser:
         return f"{self.id} | {self.is_staff} | {self.is_authenticated}"
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of already verified tokens
+    Entries expire after the ttl or the token 'exp' claim,
+    whichever comes first
+    """
+
+    def __init__(self, maxsize: int, ttl: int) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Union[None, JWTAuthUser]:
+        """Returns the cached user of the token or None"""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, user = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def peek(self, token: str) -> Union[None, JWTAuthUser]:
+        """
+        Returns the cached user of the token or None,
+        without lock, counters and LRU update (e.g. for rate limiting)
+        """
+        entry = self._entries.get(self._key(token))
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+
+    def set(
+        self,
+        token: str,
+        user: JWTAuthUser,
+        exp: Union[None, int, float] = None
+    ) -> None:
+        """Caches the user of an verified token"""
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> dict:
+        """Returns the hit/miss counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+
+token_cache = VerifiedTokenCache(
+    settings.JWT_TOKEN_CACHE_SIZE,
+    settings.JWT_TOKEN_CACHE_TTL
+)
+
+
 class JWTAuthentication(BaseAuthentication):
     """Class for set needed data to the request object"""
 
     def authenticate(self, request: IRequest):
+        """
+        Returns the user of the access token (anonymous without a valid one)
+        Raises AuthenticationFailed for a refresh token, those are only
+        exchanged (they live JWT_REFRESH_TOKEN_DAYS) and never cached
+        """
         BEARER_PREFIX = "Bearer "
         try:
             token: str = request.META["HTTP_AUTHORIZATION"]
             token = token.replace(BEARER_PREFIX, "")
-            decoded_token = auth_service.decode_token(token)
-            user = JWTAuthUser(
-                decoded_token["user_id"],
-                decoded_token["is_staff"]
-            )
+            user = token_cache.get(token)
+            if user is None:
+                decoded_token = auth_service.decode_token(token)
+                if decoded_token.get("is_refresh_token"):
+                    raise exceptions.AuthenticationFailed(
+                        "A refresh token can not authenticate requests."
+                    )
+                user = JWTAuthUser(
+                    decoded_token["user_id"],
+                    decoded_token["is_staff"]
+                )
+                token_cache.set(token, user, decoded_token.get("exp"))
             return (user, None)
+        except exceptions.AuthenticationFailed:
+            raise
         except Exception:
             user = JWTAuthUser(None, None)
             return (user, None)
+
+    def authenticate_header(self, request: IRequest) -> str:
+        """A failed authentication is answered with 401"""
+        return "Bearer"
@@ -0,0 +1,99 @@
+"""
+Password hashers with costs from the settings
+(PASSWORD_PBKDF2_ITERATIONS, PASSWORD_ARGON2_*, PASSWORD_SCRYPT_*)
+The algorithm names equal Django's hashers, so the stored hashes stay
+valid. A hash with other costs or of another algorithm than the policy
+(PASSWORD_HASHER_POLICY) is rehashed when the user logs in.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import hashers
+
+from app import settings
+from core.models import User
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+
+    @property
+    def time_cost(self) -> int:
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self) -> int:
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+
+    @property
+    def work_factor(self) -> int:
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+
+_executor: Union[None, ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool of the password hashing (created lazily,
+    so every pre-forked worker gets its own threads)
+    The hash functions release the GIL, the threads hash in parallel.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            settings.PASSWORD_HASHING_WORKERS,
+            thread_name_prefix="password-hashing"
+        )
+    return _executor
+
+
+def must_rehash(encoded: str) -> bool:
+    """Returns whether the hash differs from the policy"""
+    preferred = hashers.get_hasher()
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or \
+        preferred.must_update(encoded)
+
+
+async def acheck_password(user: User, password: str) -> bool:
+    """
+    Checks the password in the hashing thread pool, the event loop keeps
+    serving requests meanwhile
+    Rehashes and saves an outdated hash like User.check_password.
+    """
+    loop = asyncio.get_running_loop()
+    encoded = user.password
+    is_correct = await loop.run_in_executor(
+        get_executor(),
+        hashers.check_password,
+        password,
+        encoded
+    )
+    if is_correct and must_rehash(encoded):
+        user.password = await loop.run_in_executor(
+            get_executor(),
+            hashers.make_password,
+            password
+        )
+        await sync_to_async(user.save)(update_fields=["password"])
+    return is_correct
@@ -0,0 +1,218 @@
+"""
+Keys of the JWT signing and verification (settings.JWT_KEYS_DIR)
+The parsed keys are cached, the directory is checked for changed files
+at most once per JWT_KEYS_RELOAD_INTERVAL and once more per interval for
+an unknown kid, so a key copied into the directory is used without a
+restart (and tokens of made up kids cannot force a scan per request).
+Tokens without kid are HS256 tokens of JWT_SECRET_KEY, they verify
+without a signing key or with JWT_ACCEPT_LEGACY_HS256 only.
+"""
+import json
+import os
+import threading
+import time
+from typing import NamedTuple, Union
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from django.core.exceptions import ImproperlyConfigured
+
+import jwt  # type: ignore
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm  # type: ignore
+
+from app import settings
+
+
+PRIVATE_KEY_SUFFIX = ".pem"
+PUBLIC_KEY_SUFFIX = ".pub.pem"
+LEGACY_ALGORITHM = "HS256"
+
+
+class JWTKey(NamedTuple):
+    kid: Union[None, str]
+    algorithm: str
+    verifying_key: object
+    # None for verify-only keys (<kid>.pub.pem)
+    signing_key: object = None
+
+
+def get_algorithm(public_key) -> str:
+    """Returns the JWT algorithm of the public key"""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type {type(public_key).__name__}.")
+
+
+def load_keys(directory: str) -> dict[str, JWTKey]:
+    """Returns the keys of the directory by kid, ordered by kid"""
+    keys: dict[str, JWTKey] = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(PRIVATE_KEY_SUFFIX):
+            continue
+        with open(os.path.join(directory, name), "rb") as file:
+            data = file.read()
+
+        if name.endswith(PUBLIC_KEY_SUFFIX):
+            kid = name[:-len(PUBLIC_KEY_SUFFIX)]
+            public_key = serialization.load_pem_public_key(data)
+            # a private key of the kid wins
+            keys.setdefault(
+                kid,
+                JWTKey(kid, get_algorithm(public_key), public_key)
+            )
+            continue
+
+        kid = name[:-len(PRIVATE_KEY_SUFFIX)]
+        private_key = serialization.load_pem_private_key(data, password=None)
+        public_key = private_key.public_key()
+        keys[kid] = JWTKey(
+            kid,
+            get_algorithm(public_key),
+            public_key,
+            private_key
+        )
+    return dict(sorted(keys.items()))
+
+
+def get_jwk(key: JWTKey) -> dict:
+    """Returns the public JSON Web Key of the key"""
+    algorithm = RSAAlgorithm if key.algorithm == "RS256" else OKPAlgorithm
+    return json.loads(algorithm.to_jwk(key.verifying_key)) | {
+        "kid": key.kid,
+        "alg": key.algorithm,
+        "use": "sig",
+    }
+
+
+class KeyRing:
+    """
+    Cache of the parsed keys of the directory
+    (parsing a PEM key costs more than verifying a signature)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        active_kid: str = "",
+        reload_interval: int = 30
+    ) -> None:
+        self.directory = directory
+        self.active_kid = active_kid
+        self.reload_interval = reload_interval
+        self._keys: dict[str, JWTKey] = {}
+        self._files: Union[None, tuple] = None
+        self._checked_at = 0.0
+        self._forced_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def get_files(self) -> tuple:
+        """Returns name and mtime of the files (the cache validator)"""
+        return tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns)
+            for entry in os.scandir(self.directory)
+        ))
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Reloads the keys if the files of the directory changed
+        Forced (unknown kid) at most once per interval too
+        """
+        if not self.directory:
+            return
+        if self._files is not None and self.is_fresh(force):
+            return
+
+        with self._lock:
+            if self._files is not None and self.is_fresh(force):
+                return
+            self._checked_at = time.monotonic()
+            if force:
+                self._forced_at = self._checked_at
+            files = self.get_files()
+            if files != self._files:
+                self._keys = load_keys(self.directory)
+                self._files = files
+
+    def is_fresh(self, force: bool = False) -> bool:
+        """Returns if the last (forced) check is within the interval"""
+        checked_at = self._forced_at if force else self._checked_at
+        return time.monotonic() - checked_at < self.reload_interval
+
+    @property
+    def keys(self) -> dict[str, JWTKey]:
+        self.refresh()
+        return self._keys
+
+    def get_signing_key(self) -> Union[None, JWTKey]:
+        """
+        Returns the active key (JWT_ACTIVE_KID or the last kid)
+        or None without keys
+        """
+        keys = self.keys
+        if self.active_kid:
+            key = keys.get(self.active_kid)
+            if key is None or key.signing_key is None:
+                raise ImproperlyConfigured(
+                    f"No private key of JWT_ACTIVE_KID {self.active_kid}."
+                )
+            return key
+
+        signing_keys = [key for key in keys.values() if key.signing_key]
+        return signing_keys[-1] if signing_keys else None
+
+    def get_verifying_key(self, kid: str) -> Union[None, JWTKey]:
+        """
+        Returns the key of the kid, looks for new keys if unknown
+        (at most once per interval)
+        """
+        key = self.keys.get(kid)
+        if key is None:
+            # signed by a worker which already loaded a new key
+            self.refresh(force=True)
+            key = self._keys.get(kid)
+        return key
+
+    def get_jwks(self) -> dict:
+        """Returns the JSON Web Key Set of the public keys"""
+        return {"keys": [get_jwk(key) for key in self.keys.values()]}
+
+
+key_ring = KeyRing(
+    settings.JWT_KEYS_DIR,
+    settings.JWT_ACTIVE_KID,
+    settings.JWT_KEYS_RELOAD_INTERVAL
+)
+
+
+def get_signing_key() -> JWTKey:
+    """Returns the active key or the HS256 secret without keys"""
+    key = key_ring.get_signing_key()
+    if key is None:
+        return JWTKey(
+            None,
+            LEGACY_ALGORITHM,
+            settings.JWT_SECRET_KEY,
+            settings.JWT_SECRET_KEY
+        )
+    return key
+
+
+def get_verifying_key(token: str) -> JWTKey:
+    """
+    Returns the key of the kid in the token header
+    Raises jwt.InvalidSignatureError for an unknown kid
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is None:
+        if settings.JWT_ACCEPT_LEGACY_HS256 or \
+                key_ring.get_signing_key() is None:
+            return JWTKey(None, LEGACY_ALGORITHM, settings.JWT_SECRET_KEY)
+        raise jwt.InvalidSignatureError("The token has no kid.")
+
+    key = key_ring.get_verifying_key(kid)
+    if key is None:
+        raise jwt.InvalidSignatureError(f"Unknown kid {kid}.")
+    return key
@@ -0,0 +1,238 @@
+"""
+Revocation of refresh tokens
+Every refresh token has an id (jti) and the id of its family (fam),
+the tokens rotated from one login. A refresh revokes the jti of the
+used token. A used token presented again (the stolen copy or the
+original after the thief refreshed) revokes the whole family.
+The revoked ids are kept in a bloom filter per process, synced from
+core.models.RevokedToken every JWT_REVOCATION_SYNC_INTERVAL, so a
+refresh checks the revocations in memory and queries only for the rare
+possibly revoked ids.
+Deleting a user or changing the password or is_staff of a user revokes
+the refresh tokens issued to the user until then (the row of the user
+id, its created_at is the cutoff compared with the iat of the token).
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Union
+
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from app import settings
+from core.models import RevokedToken, User
+
+
+# rows committed late (a lower created_at) are synced with this overlap
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """Fixed size bloom filter of strings (no false negatives)"""
+
+    def __init__(self, bits: int, hashes: int) -> None:
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, value: str) -> Iterator[int]:
+        # double hashing, k positions of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + i * second) % self.bits for i in range(self.hashes)
+        )
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._array[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+    def clear(self) -> None:
+        self._array = bytearray(len(self._array))
+
+
+class RevocationList:
+    """Bloom filter of the revoked ids, synced from the revocation table"""
+
+    def __init__(self, bits: int, hashes: int, sync_interval: int) -> None:
+        self.filter = BloomFilter(bits, hashes)
+        self.sync_interval = sync_interval
+        self._latest: Union[None, datetime] = None
+        self._synced_at: Union[None, float] = None
+        self._lock = threading.Lock()
+
+    def sync(self, force: bool = False) -> None:
+        """Adds the revocations since the last sync (of all workers)"""
+        if not force and self._synced_at is not None and \
+                time.monotonic() - self._synced_at < self.sync_interval:
+            return
+
+        with self._lock:
+            self._synced_at = time.monotonic()
+            rows = RevokedToken.objects.all()
+            if self._latest is not None:
+                rows = rows.filter(created_at__gte=self._latest - SYNC_OVERLAP)
+            for token_id, created_at in rows.values_list(
+                "token_id",
+                "created_at"
+            ).iterator(chunk_size=10000):
+                self.filter.add(token_id)
+                if self._latest is None or created_at > self._latest:
+                    self._latest = created_at
+
+    def add(self, token_id: str) -> None:
+        self.filter.add(token_id)
+
+    def might_be_revoked(self, *token_ids: str) -> bool:
+        self.sync()
+        return any(token_id in self.filter for token_id in token_ids)
+
+    def clear(self) -> None:
+        """Empties the filter, the next check loads all revocations"""
+        with self._lock:
+            self.filter.clear()
+            self._latest = None
+            self._synced_at = None
+
+
+revocation_list = RevocationList(
+    settings.JWT_REVOCATION_BLOOM_BITS,
+    settings.JWT_REVOCATION_BLOOM_HASHES,
+    settings.JWT_REVOCATION_SYNC_INTERVAL
+)
+
+
+def is_revoked(*token_ids: str) -> bool:
+    """Returns whether one of the ids is revoked"""
+    if not revocation_list.might_be_revoked(*token_ids):
+        return False
+    # confirm, the bloom filter has false positives
+    return RevokedToken.objects.filter(token_id__in=token_ids).exists()
+
+
+def revoke(
+    token_id: str,
+    user_id: Union[None, int],
+    expires_at: datetime
+) -> bool:
+    """Revokes the id, returns False if it was already revoked"""
+    revocation_list.add(token_id)
+    try:
+        # savepoint, the unique violation must not break the transaction
+        with transaction.atomic():
+            RevokedToken.objects.create(
+                token_id=token_id,
+                user_id=user_id,
+                expires_at=expires_at
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def revoke_family(family: str, user_id: Union[None, int]) -> None:
+    """Revokes every refresh token of the family"""
+    # the tokens of the family expire at the latest after a full duration
+    expires_at = datetime.now(timezone.utc) + \
+        timedelta(days=settings.JWT_REFRESH_TOKEN_DAYS)
+    revoke(family, user_id, expires_at)
+
+
+def get_user_token_id(user_id: int) -> str:
+    """Returns the revoked id of the tokens of the user"""
+    return f"user:{user_id}"
+
+
+def revoke_user(user_id: int) -> None:
+    """
+    Revokes the refresh tokens issued to the user until now,
+    a later revocation moves the cutoff
+    """
+    token_id = get_user_token_id(user_id)
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(days=settings.JWT_REFRESH_TOKEN_DAYS)
+    revocation_list.add(token_id)
+    # a new created_at is synced by the other workers too
+    RevokedToken.objects.update_or_create(
+        token_id=token_id,
+        defaults={
+            "user_id": user_id,
+            "expires_at": expires_at,
+            "created_at": now,
+        }
+    )
+
+
+def is_user_revoked(user_id: int, issued_at: float) -> bool:
+    """Returns whether the tokens of the user issued at the time are revoked"""
+    token_id = get_user_token_id(user_id)
+    if not revocation_list.might_be_revoked(token_id):
+        return False
+    return RevokedToken.objects.filter(
+        token_id=token_id,
+        created_at__gte=datetime.fromtimestamp(issued_at, timezone.utc)
+    ).exists()
+
+
+def use_refresh_token(decoded_token: dict) -> None:
+    """
+    Revokes the decoded refresh token on use (one insert, no read)
+    Raises ValueError if the token, its family or its user is revoked,
+    a reused token revokes its family
+    """
+    jti = decoded_token["jti"]
+    family = decoded_token["fam"]
+    user_id = decoded_token.get("user_id")
+    expires_at = datetime.fromtimestamp(decoded_token["exp"], timezone.utc)
+
+    # tokens without iat were issued before the user revocations
+    if is_user_revoked(user_id, decoded_token.get("iat", 0)):
+        raise ValueError("The refresh token is revoked.")
+    # the unique jti also catches a reuse not synced yet
+    if is_revoked(jti, family) or not revoke(jti, user_id, expires_at):
+        revoke_family(family, user_id)
+        raise ValueError("The refresh token is revoked.")
+
+
+def _remember_user_change(
+    sender,
+    instance: User,
+    update_fields=None,
+    **kwargs
+):
+    """Marks a new password (set_password) or is_staff of a saved user"""
+    if instance._state.adding:
+        return
+    # _password is only set by set_password, not by the rehash on login
+    instance._revoke_tokens = instance._password is not None
+    if not instance._revoke_tokens and \
+            (update_fields is None or "is_staff" in update_fields):
+        instance._revoke_tokens = User.objects.filter(
+            pk=instance.pk
+        ).exclude(is_staff=instance.is_staff).exists()
+
+
+def _on_user_saved(sender, instance: User, created: bool, **kwargs):
+    if getattr(instance, "_revoke_tokens", False):
+        instance._revoke_tokens = False
+        revoke_user(instance.pk)
+
+
+def _on_user_deleted(sender, instance: User, **kwargs):
+    revoke_user(instance.pk)
+
+
+def connect_signals() -> None:
+    """Connects the receivers revoking the tokens of changed users"""
+    pre_save.connect(_remember_user_change, sender=User)
+    post_save.connect(_on_user_saved, sender=User)
+    post_delete.connect(_on_user_deleted, sender=User)
@@ -95,7 +95,9 @@ class TestAuthService(TestCase):
 
         decoded_token = auth_service.decode_token(access_token)
 
-        self.assertNotIn("exp", decoded_token)
+        self.assertIn("exp", decoded_token)
+        self.assertIn("jti", decoded_token)
+        self.assertIn("fam", decoded_token)
         self.assertIn("is_refresh_token", decoded_token)
         self.assertTrue(decoded_token["is_refresh_token"])
         self.assertEqual(decoded_token["id"], comparing_id)
@@ -124,7 +126,7 @@ class TestAuthService(TestCase):
         self.assertIn("creation_date", decoded_token)
         self.assertIn("creation_date", decoded_refresh_token)
         self.assertIn("exp", decoded_token)
-        self.assertNotIn("exp", decoded_refresh_token)
+        self.assertIn("exp", decoded_refresh_token)
         self.assertIn("iss", decoded_token)
         self.assertIn("iss", decoded_refresh_token)
 
@@ -0,0 +1,118 @@
+"""
+Test jwt authentication and the verified token cache
+"""
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from rest_framework import exceptions
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework import status
+
+from app_auth import auth_service
+from app_auth.authentication import (
+    JWTAuthentication,
+    JWTAuthUser,
+    VerifiedTokenCache,
+    token_cache,
+)
+
+
+def auth_request(token: str):
+    factory = APIRequestFactory()
+    return factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+class VerifiedTokenCacheTests(TestCase):
+    """Test the bounded ttl token cache"""
+
+    def test_hit_and_miss(self):
+        """Test counting hits and misses"""
+        cache = VerifiedTokenCache(maxsize=10, ttl=60)
+        user = JWTAuthUser(1, False)
+
+        self.assertIsNone(cache.get("token"))
+        cache.set("token", user)
+
+        self.assertIs(cache.get("token"), user)
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_lru_eviction(self):
+        """Test the least recently used token is evicted"""
+        cache = VerifiedTokenCache(maxsize=2, ttl=60)
+        cache.set("token1", JWTAuthUser(1, False))
+        cache.set("token2", JWTAuthUser(2, False))
+        _ = cache.get("token1")
+        cache.set("token3", JWTAuthUser(3, False))
+
+        self.assertIsNotNone(cache.get("token1"))
+        self.assertIsNone(cache.get("token2"))
+        self.assertIsNotNone(cache.get("token3"))
+
+    def test_expired_by_exp_claim(self):
+        """Test the token 'exp' claim is honoured"""
+        cache = VerifiedTokenCache(maxsize=10, ttl=60)
+        cache.set("token", JWTAuthUser(1, False), exp=time.time() - 1)
+
+        self.assertIsNone(cache.get("token"))
+
+    def test_expired_by_ttl(self):
+        """Test the entries expire after the ttl"""
+        cache = VerifiedTokenCache(maxsize=10, ttl=60)
+        cache.set("token", JWTAuthUser(1, False))
+
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get("token"))
+
+
+class JWTAuthenticationTests(TestCase):
+    """Test authenticating requests with the token cache"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.token = auth_service._create_access_token(
+            {"user_id": 5, "is_staff": True}
+        )
+
+    def test_decode_once(self):
+        """Test the token is verified only on the first request"""
+        auth = JWTAuthentication()
+        with mock.patch.object(
+            auth_service,
+            "decode_token",
+            wraps=auth_service.decode_token
+        ) as decode_token:
+            user1, _ = auth.authenticate(auth_request(self.token))
+            user2, _ = auth.authenticate(auth_request(self.token))
+
+        self.assertEqual(decode_token.call_count, 1)
+        self.assertEqual(user1.id, 5)
+        self.assertTrue(user2.is_staff)
+        self.assertEqual(token_cache.stats["hits"], 1)
+
+    def test_invalid_token_not_cached(self):
+        """Test invalid tokens are anonymous and not cached"""
+        auth = JWTAuthentication()
+        user, _ = auth.authenticate(auth_request("invalid"))
+
+        self.assertFalse(user.is_authenticated)
+        self.assertEqual(token_cache.stats["size"], 0)
+
+    def test_refresh_token_rejected(self):
+        """Test a refresh token is no bearer token and is not cached"""
+        refresh_token = auth_service._create_access_refresh_token(
+            5,
+            True
+        )["refresh_token"]
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            JWTAuthentication().authenticate(auth_request(refresh_token))
+        self.assertEqual(token_cache.stats["size"], 0)
+
+        res = APIClient().get(
+            "/api/v1/recipe/",
+            HTTP_AUTHORIZATION=f"Bearer {refresh_token}"
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,144 @@
+"""
+Test the password hasher policy and the async login
+"""
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth.hashers import identify_hasher
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from app import settings
+from app_auth import auth_service
+from core.tests.test_model_user import create_user
+
+
+URL_LOGIN = "/api/v1/token/"
+URL_ASYNC_LOGIN = "/api/v1/async/token/"
+USERNAME = "hasher_user"
+PASSWORD = "secretPW"
+SCRYPT_FIRST = [settings.PASSWORD_HASHER_POLICIES["scrypt"]] + [
+    hasher for hasher in settings.PASSWORD_HASHERS
+    if hasher != settings.PASSWORD_HASHER_POLICIES["scrypt"]
+]
+
+
+def get_iterations(encoded: str) -> int:
+    return int(encoded.split("$")[1])
+
+
+def use_cheap_costs(test_case: TestCase) -> None:
+    """Lowers the hashing costs for the duration of the test"""
+    for patcher in [
+        patch.object(settings, "PASSWORD_PBKDF2_ITERATIONS", 1000),
+        patch.object(settings, "PASSWORD_SCRYPT_WORK_FACTOR", 2 ** 10),
+    ]:
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+
+
+class PasswordHasherTests(TestCase):
+    """Test the hashers follow the costs and the policy of the settings"""
+
+    def setUp(self):
+        use_cheap_costs(self)
+        self.client = APIClient()
+        self.user = create_user(username=USERNAME, password=PASSWORD)
+
+    def login(self) -> None:
+        res = self.client.post(
+            URL_LOGIN,
+            {"username": USERNAME, "password": PASSWORD}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+
+    def test_hash_with_setting_costs(self):
+        """Test new passwords are hashed with the configured iterations"""
+        self.assertEqual(
+            identify_hasher(self.user.password).algorithm,
+            "pbkdf2_sha256"
+        )
+        self.assertEqual(get_iterations(self.user.password), 1000)
+
+    def test_rehash_on_changed_costs(self):
+        """Test the login rehashes a password with outdated costs"""
+        with patch.object(settings, "PASSWORD_PBKDF2_ITERATIONS", 2000):
+            self.login()
+
+        self.assertEqual(get_iterations(self.user.password), 2000)
+        self.assertTrue(self.user.check_password(PASSWORD))
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_FIRST)
+    def test_rehash_on_changed_policy(self):
+        """Test the login rehashes a password of another policy"""
+        self.login()
+
+        self.assertEqual(
+            identify_hasher(self.user.password).algorithm,
+            "scrypt"
+        )
+        self.assertTrue(self.user.check_password(PASSWORD))
+
+
+class AsyncLoginApiTests(TestCase):
+    """Test the async login hashing in the thread pool"""
+
+    def setUp(self):
+        use_cheap_costs(self)
+        self.user = create_user(username=USERNAME, password=PASSWORD)
+
+    async def test_login(self):
+        """Test logging in returns the tokens of the user"""
+        res = await self.async_client.post(
+            URL_ASYNC_LOGIN,
+            {"username": USERNAME, "password": PASSWORD},
+            content_type="application/json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        decoded_token = auth_service.decode_token(res.json()["token"])
+        self.assertEqual(decoded_token["user_id"], self.user.id)
+
+    async def test_login_form_data(self):
+        """Test logging in with form data like the sync login"""
+        res = await self.async_client.post(
+            URL_ASYNC_LOGIN,
+            {"username": USERNAME, "password": PASSWORD}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    async def test_login_wrong_data(self):
+        """Test wrong passwords, unknown users and missing fields"""
+        res1 = await self.async_client.post(
+            URL_ASYNC_LOGIN,
+            {"username": USERNAME, "password": "wrong"}
+        )
+        res2 = await self.async_client.post(
+            URL_ASYNC_LOGIN,
+            {"username": "notExisting", "password": PASSWORD}
+        )
+        res3 = await self.async_client.post(
+            URL_ASYNC_LOGIN,
+            {"username": USERNAME}
+        )
+
+        self.assertEqual(res1.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(res2.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(res3.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_rehash_on_changed_costs(self):
+        """Test the async login rehashes a password with outdated costs"""
+        with patch.object(settings, "PASSWORD_PBKDF2_ITERATIONS", 2000):
+            res = await self.async_client.post(
+                URL_ASYNC_LOGIN,
+                {"username": USERNAME, "password": PASSWORD}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        await sync_to_async(self.user.refresh_from_db)()
+        self.assertEqual(get_iterations(self.user.password), 2000)
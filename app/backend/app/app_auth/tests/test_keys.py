@@ -0,0 +1,200 @@
+"""
+Test the asymmetric JWT signing, the key rotation and the JWKS
+"""
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+import jwt  # type: ignore
+
+from app import settings
+from app_auth import auth_service, keys
+
+
+URL_JWKS = "/.well-known/jwks.json"
+
+
+def generate_key(directory: str, kid: str, algorithm: str = "RS256") -> None:
+    call_command(
+        "generate_jwt_key",
+        dir=directory,
+        kid=kid,
+        algorithm=algorithm,
+        stdout=StringIO()
+    )
+
+
+class KeyRingTests(TestCase):
+    """Test signing and verifying with the keys of the directory"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.key_ring = keys.KeyRing(self.directory, reload_interval=3600)
+        patcher = patch.object(keys, "key_ring", self.key_ring)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_token(self) -> str:
+        return auth_service._create_access_token({
+            "user_id": 1,
+            "is_staff": False,
+        })
+
+    def test_sign_rs256(self):
+        """Test tokens are signed RS256 with the kid of the key"""
+        generate_key(self.directory, "k1")
+        token = self.create_token()
+
+        header = jwt.get_unverified_header(token)
+        self.assertEqual(header["alg"], "RS256")
+        self.assertEqual(header["kid"], "k1")
+        self.assertEqual(auth_service.decode_token(token)["user_id"], 1)
+
+    def test_sign_eddsa(self):
+        """Test tokens are signed EdDSA with an Ed25519 key"""
+        generate_key(self.directory, "k1", "EdDSA")
+        token = self.create_token()
+
+        self.assertEqual(jwt.get_unverified_header(token)["alg"], "EdDSA")
+        self.assertEqual(auth_service.decode_token(token)["user_id"], 1)
+
+    def test_rotation(self):
+        """Test a new key signs and the tokens of the old key verify"""
+        generate_key(self.directory, "k1")
+        old_token = self.create_token()
+
+        generate_key(self.directory, "k2", "EdDSA")
+        self.key_ring.refresh(force=True)
+        new_token = self.create_token()
+
+        self.assertEqual(jwt.get_unverified_header(new_token)["kid"], "k2")
+        self.assertEqual(auth_service.decode_token(old_token)["user_id"], 1)
+        self.assertEqual(auth_service.decode_token(new_token)["user_id"], 1)
+
+    def test_unknown_kid_reloads(self):
+        """Test a token of a key added by another worker verifies"""
+        generate_key(self.directory, "k1")
+        self.key_ring.refresh()
+        other_ring = keys.KeyRing(self.directory)
+        generate_key(self.directory, "k2")
+
+        with patch.object(keys, "key_ring", other_ring):
+            token = self.create_token()
+
+        self.assertEqual(auth_service.decode_token(token)["user_id"], 1)
+
+    def test_retired_key_verifies(self):
+        """Test a retired key only verifies"""
+        generate_key(self.directory, "k1")
+        token = self.create_token()
+        generate_key(self.directory, "k2")
+        call_command(
+            "generate_jwt_key",
+            dir=self.directory,
+            retire="k1",
+            stdout=StringIO()
+        )
+        self.key_ring.refresh(force=True)
+
+        self.assertEqual(self.key_ring.get_signing_key().kid, "k2")
+        self.assertIsNone(self.key_ring.keys["k1"].signing_key)
+        self.assertEqual(auth_service.decode_token(token)["user_id"], 1)
+
+    def test_keys_parsed_once(self):
+        """Test the parsed keys are cached"""
+        generate_key(self.directory, "k1")
+        with patch.object(keys, "load_keys", wraps=keys.load_keys) as load:
+            for _ in range(3):
+                auth_service.decode_token(self.create_token())
+
+        self.assertEqual(load.call_count, 1)
+
+    def test_unknown_kid(self):
+        """Test a token of an unknown kid is rejected"""
+        generate_key(self.directory, "k1")
+        token = jwt.encode(
+            {"user_id": 1, "iss": settings.JWT_ISSUER},
+            settings.JWT_SECRET_KEY,
+            algorithm="HS256",
+            headers={"kid": "unknown"}
+        )
+
+        with self.assertRaises(jwt.InvalidSignatureError):
+            auth_service.decode_token(token)
+
+    def test_unknown_kid_reload_throttled(self):
+        """Test unknown kids check the directory once per interval"""
+        generate_key(self.directory, "k1")
+        self.key_ring.refresh()
+        token = jwt.encode(
+            {"user_id": 1, "iss": settings.JWT_ISSUER},
+            settings.JWT_SECRET_KEY,
+            algorithm="HS256",
+            headers={"kid": "unknown"}
+        )
+
+        with patch.object(
+            self.key_ring,
+            "get_files",
+            wraps=self.key_ring.get_files
+        ) as get_files:
+            for _ in range(3):
+                with self.assertRaises(jwt.InvalidSignatureError):
+                    auth_service.decode_token(token)
+
+        self.assertEqual(get_files.call_count, 1)
+
+    def test_legacy_hs256_token(self):
+        """Test tokens without kid verify with the secret if accepted"""
+        with patch.object(keys, "key_ring", keys.KeyRing("")):
+            legacy_token = self.create_token()
+            # without keys HS256 are the tokens of the app
+            self.assertEqual(
+                auth_service.decode_token(legacy_token)["user_id"],
+                1
+            )
+        generate_key(self.directory, "k1")
+
+        self.assertNotIn("kid", jwt.get_unverified_header(legacy_token))
+        with self.assertRaises(jwt.InvalidSignatureError):
+            auth_service.decode_token(legacy_token)
+        with patch.object(settings, "JWT_ACCEPT_LEGACY_HS256", True):
+            self.assertEqual(
+                auth_service.decode_token(legacy_token)["user_id"],
+                1
+            )
+
+    def test_jwks(self):
+        """Test the JWKS verifies the tokens without the API"""
+        generate_key(self.directory, "k1")
+        generate_key(self.directory, "k2", "EdDSA")
+        token = self.create_token()
+
+        res = APIClient().get(URL_JWKS)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("max-age", res["Cache-Control"])
+        jwks = jwt.PyJWKSet.from_dict(res.json())
+        self.assertEqual([key.key_id for key in jwks.keys], ["k1", "k2"])
+        for jwk in res.json()["keys"]:
+            self.assertNotIn("d", jwk)
+
+        key = next(
+            key for key in jwks.keys
+            if key.key_id == jwt.get_unverified_header(token)["kid"]
+        )
+        decoded_token = jwt.decode(
+            token,
+            key.key,
+            issuer=settings.JWT_ISSUER,
+            algorithms=["EdDSA"]
+        )
+        self.assertEqual(decoded_token["user_id"], 1)
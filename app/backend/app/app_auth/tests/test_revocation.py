@@ -0,0 +1,234 @@
+"""
+Test the refresh token families and their revocation
+"""
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from app import settings
+from app_auth import auth_service, revocation
+from core import models
+from core.tests.test_model_user import setup_user
+
+
+URL_REFRESH = "/api/v1/token/refresh/"
+URL_REVOKE = "/api/v1/token/revoke/"
+
+
+class BloomFilterTests(TestCase):
+    """Test the bloom filter of the revoked ids"""
+
+    def test_no_false_negatives(self):
+        """Test every added id is contained"""
+        bloom_filter = revocation.BloomFilter(2 ** 12, 5)
+        ids = [f"id{i}" for i in range(200)]
+        for token_id in ids:
+            bloom_filter.add(token_id)
+
+        self.assertTrue(all(token_id in bloom_filter for token_id in ids))
+        false_positives = sum(
+            f"other{i}" in bloom_filter for i in range(1000)
+        )
+        self.assertLess(false_positives, 50)
+
+    def test_clear(self):
+        """Test clearing removes the ids"""
+        bloom_filter = revocation.BloomFilter(1024, 3)
+        bloom_filter.add("id")
+        bloom_filter.clear()
+
+        self.assertNotIn("id", bloom_filter)
+
+
+class RefreshTokenFamilyTests(TestCase):
+    """Test rotating and revoking refresh tokens"""
+
+    def setUp(self):
+        revocation.revocation_list.clear()
+        self.client = APIClient()
+        self.user = setup_user()
+        self.refresh_token = auth_service._create_access_refresh_token(
+            self.user.id,
+            self.user.is_staff
+        )["refresh_token"]
+
+    def refresh(self, refresh_token: str):
+        return self.client.post(
+            URL_REFRESH,
+            {"refresh_token": refresh_token}
+        )
+
+    def test_rotation(self):
+        """Test a refresh returns a new refresh token of the family"""
+        res = self.refresh(self.refresh_token)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        old = auth_service.decode_token(self.refresh_token)
+        new = auth_service.decode_token(res.data["refresh_token"])
+        self.assertNotEqual(old["jti"], new["jti"])
+        self.assertEqual(old["fam"], new["fam"])
+        self.assertEqual(
+            auth_service.decode_token(res.data["token"])["user_id"],
+            self.user.id
+        )
+
+    def test_refresh_without_read(self):
+        """Test a refresh only inserts the used jti"""
+        revocation.revocation_list.sync()
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.refresh(self.refresh_token)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        statements = [
+            query["sql"].split()[0].upper() for query in queries
+            if "SAVEPOINT" not in query["sql"].upper()
+        ]
+        self.assertEqual(statements, ["INSERT"])
+
+    def test_reuse_revokes_family(self):
+        """Test a reused refresh token revokes the rotated tokens"""
+        res1 = self.refresh(self.refresh_token)
+        res2 = self.refresh(self.refresh_token)
+        res3 = self.refresh(res1.data["refresh_token"])
+
+        self.assertEqual(res1.status_code, status.HTTP_200_OK)
+        self.assertEqual(res2.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res3.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reuse_not_synced(self):
+        """Test a reuse in another worker (not in the filter) is caught"""
+        self.assertEqual(self.refresh(self.refresh_token).status_code, 200)
+        revocation.revocation_list.clear()
+        revocation.revocation_list.sync()
+        # revoked after this worker synced
+        models.RevokedToken.objects.all().delete()
+        revocation.revocation_list.clear()
+        self.refresh(self.refresh_token)
+
+        with patch.object(revocation.revocation_list, "sync"):
+            res = self.refresh(self.refresh_token)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_revoke(self):
+        """Test revoking a family kills its refresh tokens"""
+        res1 = self.client.post(
+            URL_REVOKE,
+            {"refresh_token": self.refresh_token}
+        )
+        res2 = self.refresh(self.refresh_token)
+
+        self.assertEqual(res1.status_code, status.HTTP_200_OK)
+        self.assertEqual(res2.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sync_revocations_of_other_workers(self):
+        """Test the sync loads the revocations of the table"""
+        family = auth_service.decode_token(self.refresh_token)["fam"]
+        revocation.revocation_list.sync()
+        models.RevokedToken.objects.create(
+            token_id=family,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=1)
+        )
+
+        self.assertFalse(revocation.revocation_list.might_be_revoked(family))
+        revocation.revocation_list.sync(force=True)
+        self.assertTrue(revocation.revocation_list.might_be_revoked(family))
+        self.assertEqual(
+            self.refresh(self.refresh_token).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_password_change_revokes_user(self):
+        """Test a new password revokes the tokens issued before"""
+        self.user.set_password("newSecretPW")
+        self.user.save()
+        new_token = auth_service._create_access_refresh_token(
+            self.user.id,
+            self.user.is_staff
+        )["refresh_token"]
+
+        self.assertEqual(
+            self.refresh(self.refresh_token).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(self.refresh(new_token).status_code, 200)
+
+    def test_is_staff_change_revokes_user(self):
+        """Test a changed is_staff revokes the tokens of the old role"""
+        self.user.is_staff = True
+        self.user.save()
+
+        self.assertEqual(
+            self.refresh(self.refresh_token).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_user_delete_revokes_user(self):
+        """Test the tokens of a deleted user are revoked"""
+        self.user.delete()
+
+        self.assertEqual(
+            self.refresh(self.refresh_token).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_other_changes_keep_tokens(self):
+        """Test a rehash on login or a new email keep the tokens"""
+        self.user.password = self.user.password
+        self.user.save(update_fields=["password"])
+        self.user.email = "new@mail.com"
+        self.user.save()
+
+        self.assertEqual(self.refresh(self.refresh_token).status_code, 200)
+        self.assertFalse(models.RevokedToken.objects.filter(
+            token_id=revocation.get_user_token_id(self.user.id)
+        ).exists())
+
+    def test_legacy_refresh_token(self):
+        """Test a refresh token without jti starts a family"""
+        legacy_token = auth_service._create_token(
+            {"user_id": self.user.id, "is_refresh_token": True},
+            exp_duration=None
+        )
+
+        res = self.refresh(legacy_token)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            "fam",
+            auth_service.decode_token(res.data["refresh_token"])
+        )
+        with patch.object(settings, "JWT_ACCEPT_LEGACY_REFRESH", False):
+            res = self.refresh(legacy_token)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_prune(self):
+        """Test pruning deletes the expired revocations"""
+        now = datetime.now(timezone.utc)
+        models.RevokedToken.objects.create(
+            token_id="expired",
+            expires_at=now - timedelta(days=1)
+        )
+        models.RevokedToken.objects.create(
+            token_id="valid",
+            expires_at=now + timedelta(days=1)
+        )
+
+        call_command("prune_revoked_tokens", stdout=StringIO())
+
+        self.assertEqual(
+            list(models.RevokedToken.objects.values_list(
+                "token_id",
+                flat=True
+            )),
+            ["valid"]
+        )
@@ -1,11 +1,14 @@
 from django.test import TestCase
+from django.urls import resolve
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from djdevted.test import assert_query_budget
+
 from core.tests.test_model_user import setup_user, create_user # noqa
 from core import models
-from app_auth import auth_service
+from app_auth import auth_service, revocation
 
 
 URL_TOKEN = "/api/v1/token"
@@ -182,8 +185,83 @@ class PublicAuthTokenApiTests(TestCase):
 
     def test_refresh_token_invalid_token(self):
         """Test passing invalid and expired token"""
-        refresh_token = auth_service._create_refresh_token({"user_id": 1})
+        expired_token = auth_service._create_token(
+            {"user_id": self.user.id, "is_refresh_token": True},
+            {"seconds": -5}
+        )
+
+        res1 = self.client.post(URL_REFRESH, {"refresh_token": "invalid"})
+        res2 = self.client.post(URL_REFRESH, {"refresh_token": expired_token})
+
+        self.assertEqual(res1.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res2.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_login_query_budget(self):
+        """Test logging in reads only the user"""
+        username = "teddy_test"
+        password = "secretPW"
+        create_user(username=username, password=password)
+
+        with assert_query_budget(self, 1):
+            res = self.client.post(
+                f"{URL_TOKEN}/",
+                {"username": username, "password": password}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_refresh_token_deleted_user(self):
+        """Test passing the refresh token of a deleted user"""
+        refresh_token = auth_service._create_access_refresh_token(
+            self.user.id,
+            self.user.is_staff
+        )["refresh_token"]
+        self.user.delete()
 
         res = self.client.post(URL_REFRESH, {"refresh_token": refresh_token})
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_refresh_query_budget(self):
+        """Test refreshing a token only inserts the used jti"""
+        refresh_token = auth_service._create_refresh_token(
+            {"user_id": self.user.id}
+        )
+        # no ids of the users of other tests
+        revocation.revocation_list.clear()
+        revocation.revocation_list.sync()
+
+        # savepoint, insert, release savepoint
+        with assert_query_budget(self, 3):
+            res = self.client.post(
+                URL_REFRESH,
+                {"refresh_token": refresh_token}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_endpoints_resolve_to_own_views(self):
+        """Test login, refresh and register are separate endpoints"""
+        view_names = [
+            resolve(url).view_name
+            for url in [f"{URL_TOKEN}/", URL_REFRESH, URL_REGISTER]
+        ]
+
+        self.assertEqual(
+            view_names,
+            ["token-login", "token-refresh", "token-register"]
+        )
+
+    def test_login_without_authenticators(self):
+        """Test the login ignores the credentials of other auth schemes"""
+        username = "teddy_test"
+        password = "secretPW"
+        create_user(username=username, password=password)
+
+        res = self.client.post(
+            f"{URL_TOKEN}/",
+            {"username": username, "password": password},
+            HTTP_AUTHORIZATION="Basic invalid"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -4,7 +4,25 @@ from app_auth import views
 
 
 urlpatterns = [
-    path("token/", views.AuthTokenAPIView.as_view()),
-    path("token/refresh/", views.AuthTokenAPIView.as_view()),
-    path("token/register/", views.AuthTokenAPIView.as_view()),
+    path("token/", views.LoginAPIView.as_view(), name="token-login"),
+    path(
+        "token/refresh/",
+        views.RefreshTokenAPIView.as_view(),
+        name="token-refresh"
+    ),
+    path(
+        "token/register/",
+        views.RegisterAPIView.as_view(),
+        name="token-register"
+    ),
+    path(
+        "token/revoke/",
+        views.RevokeTokenAPIView.as_view(),
+        name="token-revoke"
+    ),
+    path(
+        "async/token/",
+        views.AsyncLoginView.as_view(),
+        name="async-token-login"
+    ),
 ]
@@ -1,5 +1,9 @@
 from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpRequest, HttpResponse
+from django.views import View
 
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.request import Request
 from rest_framework.views import Response, APIView
 
 import jwt  # type: ignore
@@ -7,24 +11,24 @@ import jwt  # type: ignore
 from djdevted import response as res
 from djdevted.request import IRequest
 
-from app_auth import auth_service
+from app import settings
+from app_auth import auth_service, keys
+from recipe.views.async_read import json_response
 
 
-class AuthTokenAPIView(APIView):
+class PublicAuthAPIView(APIView):
     """
-    Handle JWT generating and refreshing tokens
-    Handle register user
-    Handle logging user in
+    Base of the token endpoints, called without a valid access token
+    No authenticators (no session lookup, no JWT verification)
     """
+    authentication_classes: list = []
+    permission_classes: list = []
 
-    def post(self, request: IRequest, *args, **kwargs) -> Response:
-        if request.path == "/api/v1/token/refresh/":
-            return self.refresh(request, *args, **kwargs)
-        if request.path == "/api/v1/token/register/":
-            return self.register(request, *args, **kwargs)
-        return self.login(request, *args, **kwargs)
 
-    def login(self, request: IRequest, *args, **kwargs) -> Response:
+class LoginAPIView(PublicAuthAPIView):
+    """Handle logging user in"""
+
+    def post(self, request: IRequest, *args, **kwargs) -> Response:
         """Handle user login, generating and returning jwt token"""
         try:
             result = auth_service.login_user(request)
@@ -36,7 +40,11 @@ class AuthTokenAPIView(APIView):
         except Exception as exp:
             return res.error_500_internal_server_error(exp)
 
-    def refresh(self, request: IRequest, *args, **kwargs) -> Response:
+
+class RefreshTokenAPIView(PublicAuthAPIView):
+    """Handle refreshing tokens"""
+
+    def post(self, request: IRequest, *args, **kwargs) -> Response:
         """
         Handle generating an new access token
         when the refresh token is valid
@@ -48,10 +56,37 @@ class AuthTokenAPIView(APIView):
             return res.error_400_bad_request(exp)
         except jwt.InvalidSignatureError:
             return res.error_401_unauthorized("Invalid Token signature.")
+        except jwt.InvalidTokenError as exp:
+            return res.error_400_bad_request(exp)
         except Exception as exp:
             return res.error_500_internal_server_error(exp)
 
-    def register(self, request: IRequest, *args, **kwargs):
+
+class RevokeTokenAPIView(PublicAuthAPIView):
+    """Handle revoking tokens"""
+
+    def post(self, request: IRequest, *args, **kwargs) -> Response:
+        """
+        Handle logout, the refresh token and the tokens
+        rotated from it can not be refreshed anymore
+        """
+        try:
+            auth_service.revoke_refresh_token(request)
+            return res.success({"revoked": True})
+        except ValueError as exp:
+            return res.error_400_bad_request(exp)
+        except jwt.InvalidSignatureError:
+            return res.error_401_unauthorized("Invalid Token signature.")
+        except jwt.InvalidTokenError as exp:
+            return res.error_400_bad_request(exp)
+        except Exception as exp:
+            return res.error_500_internal_server_error(exp)
+
+
+class RegisterAPIView(PublicAuthAPIView):
+    """Handle register user"""
+
+    def post(self, request: IRequest, *args, **kwargs) -> Response:
         """
         Handle user registration and
         Returns valid access and refresh token
@@ -63,3 +98,53 @@ class AuthTokenAPIView(APIView):
             return res.error_400_bad_request(exp)
         except Exception as exp:
             return res.error_500_internal_server_error(exp)
+
+
+class JWKSAPIView(PublicAuthAPIView):
+    """
+    Publish the public keys of the tokens (JSON Web Key Set)
+    Services verify the tokens locally with the key of the kid,
+    e.g. with jwt.PyJWKClient, without a request to this API.
+    """
+
+    def get(self, request: IRequest, *args, **kwargs) -> Response:
+        response = res.success(keys.key_ring.get_jwks())
+        response["Cache-Control"] = \
+            f"public, max-age={settings.JWT_JWKS_MAX_AGE}"
+        return response
+
+
+class AsyncLoginView(View):
+    """
+    Handle user login under ASGI
+    The password hashing runs in a thread pool, the event loop
+    keeps serving requests during a login spike.
+    """
+    http_method_names = ["post"]
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # like APIView, the token authenticates (no session cookie)
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def post(self, request: HttpRequest) -> HttpResponse:
+        # the parsers read the loaded body, not the ASGI body stream
+        request.body
+        drf_request = Request(
+            request,
+            parsers=[JSONParser(), FormParser(), MultiPartParser()]
+        )
+        try:
+            result = await auth_service.alogin_user(drf_request)
+            return json_response(result)
+        except ValueError as exp:
+            return json_response({"error": str(exp)}, status=400)
+        except ObjectDoesNotExist:
+            return json_response(
+                {"error": "Wrong user data given."},
+                status=403
+            )
+        except Exception as exp:
+            return json_response({"error": str(exp)}, status=500)
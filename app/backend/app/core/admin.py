@@ -23,3 +23,4 @@ admin.site.register(models.RecipeCart)
 admin.site.register(models.RecipeCartIngredient)
 admin.site.register(models.Tag)
 admin.site.register(models.Unit)
+admin.site.register(models.RevokedToken)
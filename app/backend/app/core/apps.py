@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from core.middleware import install_execute_wrapper
+        from core.ratings import connect_signals
+        connect_signals()
+        connection_created.connect(
+            install_execute_wrapper,
+            dispatch_uid="core.middleware.install_execute_wrapper"
+        )
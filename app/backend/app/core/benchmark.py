@@ -0,0 +1,425 @@
+"""
+In-process benchmark of the API endpoints
+The requests go through the real URL conf and middleware
+(django.test.Client / AsyncClient), so the latencies include routing,
+authentication, queries and rendering but no network.
+"""
+import asyncio
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Union
+
+from asgiref.sync import async_to_sync
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.db import connection, transaction
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+
+from app_auth import auth_service
+from core import models, rate_limit
+
+
+DEFAULT_ENDPOINTS = [
+    "/api/v1/unit/",
+    "/api/v1/ingredient/",
+    "/api/v1/ingredient/search/?search=tomate",
+    "/api/v1/recipe/",
+    "/api/v1/recipe/?detail=1",
+    "/api/v1/recipe/top-rated/",
+    "/api/v1/recipe/search/?search=pasta",
+    "/api/v1/recipe/{recipe_id}/",
+    "/api/v1/recipe/{recipe_id}/full/",
+    "/api/v1/recipe-rating/?detail=1",
+    "/api/v1/recipe-cart/?detail=1",
+    "/api/v1/recipe-cart/shopping-list/",
+    "/api/v1/user/me/",
+    "/api/v1/user/me/cart/",
+    "/api/v1/user/me/cart/count/",
+]
+# sync route -> async route (recipe.views.async_read)
+ASYNC_ENDPOINT_PAIRS = [
+    ("/api/v1/recipe/?detail=1", "/api/v1/async/recipe/?detail=1"),
+    (
+        "/api/v1/recipe/{recipe_id}/full/",
+        "/api/v1/async/recipe/{recipe_id}/full/",
+    ),
+    ("/api/v1/ingredient/", "/api/v1/async/ingredient/"),
+    ("/api/v1/food-shop/", "/api/v1/async/food-shop/"),
+]
+LOGIN_ENDPOINT = "/api/v1/token/"
+LOGIN_USERNAME = "benchmark_login_user"
+LOGIN_PASSWORD = "benchmark-login-password"
+PERCENTILES = [50, 95, 99]
+QUERY_COUNT_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    """Returns the nearest-rank percentile of the values"""
+    ordered = sorted(values)
+    rank = math.ceil(percentile / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def get_query_count(response) -> Union[None, int]:
+    """Returns the query count of the Server-Timing header or None"""
+    match = QUERY_COUNT_RE.search(response.get("Server-Timing", ""))
+    return int(match.group(1)) if match else None
+
+
+def get_default_host() -> str:
+    """Returns the first concrete host of ALLOWED_HOSTS or localhost"""
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+class HostAsyncClient(AsyncClient):
+    """AsyncClient sending the Host header of the benchmark"""
+
+    def __init__(self, host: str, **defaults) -> None:
+        super().__init__(**defaults)
+        self.host = host.encode("latin1")
+
+    def request(self, **request):
+        request["headers"] = [
+            (name, self.host if name == b"host" else value)
+            for name, value in request["headers"]
+        ]
+        return super().request(**request)
+
+
+def get_token(user: models.User) -> str:
+    return auth_service._create_access_refresh_token(
+        user.id,
+        user.is_staff
+    )["token"]
+
+
+def get_auth_client(user: models.User, host: str) -> Client:
+    """Returns a client sending the access token of the user"""
+    return Client(
+        HTTP_HOST=host,
+        HTTP_AUTHORIZATION=f"Bearer {get_token(user)}"
+    )
+
+
+def get_url_params(user: models.User) -> dict:
+    """Returns the values of the endpoint placeholders"""
+    recipe = models.Recipe.objects.order_by("-rating_count", "id").first()
+    return {
+        "user_id": user.id,
+        "recipe_id": recipe.id if recipe else 0,
+    }
+
+
+def measure_endpoint(
+    send: Callable[[], object],
+    requests: int,
+    warmup: int
+) -> dict:
+    """Sends warmup + requests requests, returns the latency summary"""
+    for _ in range(warmup):
+        send()
+
+    timed = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        timed.append(timed_request(send))
+    return summarize(timed, time.perf_counter() - start)
+
+
+def timed_request(send: Callable[[], object]) -> tuple[float, object]:
+    start = time.perf_counter()
+    response = send()
+    return (time.perf_counter() - start) * 1000, response
+
+
+def summarize(timed: list[tuple[float, object]], total: float) -> dict:
+    """Returns the latency summary of the (duration ms, response) pairs"""
+    durations = [duration for duration, _ in timed]
+    query_counts = []
+    status_codes: dict[str, int] = {}
+    for _, response in timed:
+        status_code = str(response.status_code)
+        status_codes[status_code] = status_codes.get(status_code, 0) + 1
+        query_count = get_query_count(response)
+        if query_count is not None:
+            query_counts.append(query_count)
+
+    result = {
+        "requests": len(timed),
+        "throughput_rps": round(len(timed) / total, 1),
+        "mean_ms": round(statistics.fmean(durations), 3),
+        "status_codes": status_codes,
+        "queries": max(query_counts) if query_counts else None,
+    }
+    for percentile in PERCENTILES:
+        result[f"p{percentile}_ms"] = round(
+            get_percentile(durations, percentile),
+            3
+        )
+    return result
+
+
+def run_benchmark(
+    user: models.User,
+    endpoints: list[str],
+    requests: int = 100,
+    warmup: int = 10,
+    host: Union[None, str] = None,
+    label: str = ""
+) -> dict:
+    """Benchmarks the endpoints as the user, returns the report"""
+    client = get_auth_client(user, host or get_default_host())
+    url_params = get_url_params(user)
+
+    results = {}
+    for endpoint in endpoints:
+        url = endpoint.format(**url_params)
+        results[endpoint] = measure_endpoint(
+            lambda: client.get(url),
+            requests,
+            warmup
+        )
+
+    return get_report(label, requests, results)
+
+
+def get_report(label: str, requests: int, results: dict, **extra) -> dict:
+    return {
+        "label": label,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+        },
+        "dataset": get_dataset_size(),
+        "requests_per_endpoint": requests,
+        "endpoints": results,
+        **extra,
+    }
+
+
+def measure_sync_concurrent(
+    user: models.User,
+    url: str,
+    requests: int,
+    concurrency: int,
+    host: str
+) -> dict:
+    """
+    Sends the requests from concurrency threads (a threaded WSGI server),
+    every thread with its own client and database connection
+    """
+    local = threading.local()
+
+    def send():
+        if not hasattr(local, "client"):
+            local.client = get_auth_client(user, host)
+        return local.client.get(url)
+
+    start = time.perf_counter()
+    if concurrency == 1:
+        timed = [timed_request(send) for _ in range(requests)]
+    else:
+        with ThreadPoolExecutor(concurrency) as executor:
+            timed = list(executor.map(
+                lambda _: timed_request(send),
+                range(requests)
+            ))
+    return summarize(timed, time.perf_counter() - start)
+
+
+async def measure_async_concurrent(
+    user: models.User,
+    url: str,
+    requests: int,
+    concurrency: int,
+    host: str
+) -> dict:
+    """Sends the requests as concurrency concurrent tasks on one loop"""
+    client = HostAsyncClient(host)
+    token = get_token(user)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send() -> tuple[float, object]:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(
+                url,
+                authorization=f"Bearer {token}"
+            )
+            return (time.perf_counter() - start) * 1000, response
+
+    start = time.perf_counter()
+    timed = await asyncio.gather(*(send() for _ in range(requests)))
+    return summarize(list(timed), time.perf_counter() - start)
+
+
+def run_async_comparison(
+    user: models.User,
+    requests: int = 200,
+    concurrency: int = 20,
+    host: Union[None, str] = None,
+    label: str = ""
+) -> dict:
+    """
+    Benchmarks the sync routes (threads) against their async variants
+    (one event loop) with the same concurrency
+    """
+    host = host or get_default_host()
+    url_params = get_url_params(user)
+
+    results = {}
+    for sync_endpoint, async_endpoint in ASYNC_ENDPOINT_PAIRS:
+        sync_url = sync_endpoint.format(**url_params)
+        async_url = async_endpoint.format(**url_params)
+        results[sync_endpoint] = {
+            "sync": measure_sync_concurrent(
+                user,
+                sync_url,
+                requests,
+                concurrency,
+                host
+            ),
+            "async": async_to_sync(measure_async_concurrent)(
+                user,
+                async_url,
+                requests,
+                concurrency,
+                host
+            ),
+        }
+    return get_report(label, requests, results, concurrency=concurrency)
+
+
+def get_policy_hashers(policy: str) -> list[str]:
+    """Returns PASSWORD_HASHERS with the hasher of the policy first"""
+    hasher = settings.PASSWORD_HASHER_POLICIES[policy]
+    return [hasher] + [
+        other for other in settings.PASSWORD_HASHERS if other != hasher
+    ]
+
+
+def run_login_benchmark(
+    policies: Union[None, list[str]] = None,
+    requests: int = 20,
+    warmup: int = 2,
+    host: Union[None, str] = None,
+    label: str = ""
+) -> dict:
+    """
+    Benchmarks the login per password hasher policy
+    The logins run one after another in this process (one core), the
+    throughput is the logins per second per core (not rate limited),
+    a policy with a response other than 200 reports an error instead.
+    The user of the logins is rolled back.
+    """
+    client = Client(HTTP_HOST=host or get_default_host())
+    credentials = {"username": LOGIN_USERNAME, "password": LOGIN_PASSWORD}
+
+    results = {}
+    for policy in policies or settings.PASSWORD_HASHER_POLICIES:
+        with override_settings(PASSWORD_HASHERS=get_policy_hashers(policy)):
+            try:
+                password = make_password(LOGIN_PASSWORD)
+            except ValueError as exp:
+                # e.g. argon2-cffi is not installed
+                results[policy] = {"error": str(exp)}
+                continue
+
+            with transaction.atomic():
+                models.User.objects.create(
+                    username=LOGIN_USERNAME,
+                    password=password
+                )
+                with rate_limit.disabled():
+                    result = measure_endpoint(
+                        lambda: client.post(LOGIN_ENDPOINT, credentials),
+                        requests,
+                        warmup
+                    )
+                transaction.set_rollback(True)
+            result["algorithm"] = get_hasher().algorithm
+        if set(result["status_codes"]) != {"200"}:
+            # a failed or throttled login skips the hashing
+            result["error"] = (
+                f"Not every login succeeded: {result['status_codes']}."
+            )
+        else:
+            result["logins_per_sec_per_core"] = result["throughput_rps"]
+        results[policy] = result
+
+    return get_report(label, requests, results, cpu_count=os.cpu_count())
+
+
+def measure_rate_limit_overhead(
+    limiter,
+    requests: list,
+    iterations: int = 10000
+) -> float:
+    """
+    Microbenchmark of the rate limiter, returns the mean microseconds
+    per check (route group, client key and token bucket)
+    """
+    start = time.perf_counter()
+    for i in range(iterations):
+        limiter.check(requests[i % len(requests)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def get_dataset_size() -> dict:
+    """Returns the row count of the large tables"""
+    return {
+        model._meta.db_table: model.objects.count()
+        for model in [
+            models.User,
+            models.Ingredient,
+            models.Recipe,
+            models.RecipeIngredient,
+            models.RecipeRating,
+            models.RecipeCart,
+            models.RecipeCartIngredient,
+        ]
+    }
+
+
+def compare_reports(baseline: dict, report: dict) -> dict:
+    """
+    Returns per endpoint the relative change of the percentiles
+    (0.1 = 10 % slower than the baseline)
+    """
+    changes = {}
+    for endpoint, result in report["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(endpoint)
+        if base is None:
+            continue
+        changes[endpoint] = {
+            f"p{percentile}": round(
+                result[f"p{percentile}_ms"] / base[f"p{percentile}_ms"] - 1,
+                3
+            )
+            for percentile in PERCENTILES
+            if base.get(f"p{percentile}_ms")
+        }
+    return changes
+
+
+def write_report(report: dict, path: str) -> None:
+    """Writes the report as stable, diffable JSON"""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+        file.write("\n")
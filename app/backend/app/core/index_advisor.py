@@ -0,0 +1,245 @@
+"""
+Index advisor
+Explains the slow queries of the instrumentation log (warning records
+of core.middleware) and recommends indexes for the tables the planner
+reads with a full scan, on the columns the query filters them by.
+The log has no query parameters by default (PERF_LOG_QUERY_PARAMS),
+such queries are explained with their generic plan (PostgreSQL) or
+with NULL parameters (SQLite).
+"""
+import itertools
+import json
+import re
+from typing import Iterable, NamedTuple, Union
+
+from django.apps import apps
+from django.db import DatabaseError, connection, transaction
+
+from core.middleware import get_fingerprint
+
+
+# a compared column or a bare boolean column (operator None)
+COMPARISON_RE = re.compile(
+    r'"(?P<table>\w+)"\."(?P<column>\w+)"'
+    r'(?: (?P<operator>=|IN|IS|>=|<=|>|<|LIKE|BETWEEN)|(?=\)| AND | OR |$))'
+)
+EQUALITY_OPERATORS = {None, "=", "IN", "IS"}
+SQLITE_SCAN_RE = re.compile(r"^SCAN (?:TABLE )?\"?(\w+)\"?")
+MAX_INDEX_NAME_LENGTH = 30
+PLACEHOLDER_RE = re.compile(r"%%|%s")
+
+
+class IndexRecommendation(NamedTuple):
+    table: str
+    columns: tuple[str, ...]
+    query_count: int
+    total_ms: float
+    sample_sql: str
+
+    @property
+    def definition(self) -> str:
+        """The index as models.Index for the Meta of the model"""
+        model = get_model(self.table)
+        fields = [get_field_name(model, column) for column in self.columns]
+        name = f"{self.table}_{'_'.join(fields)}"
+        name = f"{name[:MAX_INDEX_NAME_LENGTH - 4]}_idx"
+        return f'models.Index(fields={fields}, name="{name}")'
+
+
+def read_log_queries(lines: Iterable[str]) -> list[dict]:
+    """
+    Returns the slow queries of the JSON records in the log lines
+    (lines without a JSON record are skipped)
+    """
+    queries = []
+    for line in lines:
+        start = line.find("{")
+        if start == -1:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            queries += record.get("slow_queries", [])
+    return queries
+
+
+def get_model(table: str):
+    for model in apps.get_models():
+        if model._meta.db_table == table:
+            return model
+    return None
+
+
+def get_field_name(model, column: str) -> str:
+    if model is None:
+        return column
+    for field in model._meta.concrete_fields:
+        if field.column == column:
+            return field.name
+    return column
+
+
+def get_full_scans(
+    sql: str,
+    params: Union[None, list, dict] = None
+) -> set[str]:
+    """Returns the tables the plan of the query reads with a full scan"""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            if params is None:
+                plan = explain_generic(cursor, sql)
+            else:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return get_seq_scans(plan[0]["Plan"])
+        if connection.vendor == "sqlite":
+            if params is None:
+                params = [None] * sum(
+                    match.group() == "%s"
+                    for match in PLACEHOLDER_RE.finditer(sql)
+                )
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            details = [row[-1] for row in cursor.fetchall()]
+            return {
+                match.group(1)
+                for match in map(SQLITE_SCAN_RE.match, details)
+                if match and "USING" not in match.string
+            }
+    return set()
+
+
+def explain_generic(cursor, sql: str):
+    """
+    Returns the generic plan of the query (PostgreSQL), planned
+    without the parameter values, like a prepared statement
+    """
+    numbers = itertools.count(1)
+    statement = PLACEHOLDER_RE.sub(
+        lambda match: "%" if match.group() == "%%" else f"${next(numbers)}",
+        sql
+    )
+    args = ", ".join(["NULL"] * (next(numbers) - 1))
+    cursor.execute("SET LOCAL plan_cache_mode = force_generic_plan")
+    cursor.execute(f"PREPARE index_advisor_query AS {statement}")
+    execute = "EXECUTE index_advisor_query"
+    if args:
+        execute = f"{execute}({args})"
+    try:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {execute}")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.execute("DEALLOCATE index_advisor_query")
+
+
+def get_seq_scans(node: dict) -> set[str]:
+    """Returns the relations of the 'Seq Scan' nodes (PostgreSQL)"""
+    tables = set()
+    if node.get("Node Type") == "Seq Scan":
+        tables.add(node["Relation Name"])
+    for child in node.get("Plans", []):
+        tables |= get_seq_scans(child)
+    return tables
+
+
+def get_filter_columns(sql: str, table: str) -> tuple[str, ...]:
+    """
+    Returns the compared columns of the table in the query,
+    equality columns first (leading index columns), then ranges
+    """
+    equality, ranges = [], []
+    for match in COMPARISON_RE.finditer(sql):
+        if match.group("table") != table:
+            continue
+        columns = equality if match.group("operator") in \
+            EQUALITY_OPERATORS else ranges
+        if match.group("column") not in equality + ranges:
+            columns.append(match.group("column"))
+    return tuple(equality + ranges)
+
+
+def is_indexed(table: str, columns: tuple[str, ...]) -> bool:
+    """Returns whether an index starts with the columns"""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return any(
+        tuple(constraint["columns"][:len(columns)]) == columns
+        for constraint in constraints.values()
+        if constraint["index"] or constraint["unique"] or
+        constraint["primary_key"]
+    )
+
+
+def get_table_rows(table: str) -> int:
+    """Returns the (estimated on PostgreSQL) row count of the table"""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE relname = %s",
+                [table]
+            )
+            row = cursor.fetchone()
+            return max(int(row[0]), 0) if row else 0
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}"
+        )
+        return cursor.fetchone()[0]
+
+
+def advise_indexes(
+    queries: list[dict],
+    min_rows: int = 1000
+) -> list[IndexRecommendation]:
+    """
+    Returns the missing indexes of the queries, the most expensive
+    first (by the summed duration of the logged queries)
+    Queries sharing a fingerprint are explained once.
+    """
+    groups: dict[str, dict] = {}
+    for query in queries:
+        group = groups.setdefault(get_fingerprint(query["sql"]), {
+            "sql": query["sql"],
+            "params": query.get("params"),
+            "count": 0,
+            "ms": 0.0,
+        })
+        group["count"] += 1
+        group["ms"] += query.get("ms", 0)
+
+    recommendations: dict[tuple, dict] = {}
+    for group in groups.values():
+        try:
+            # savepoint, a failing EXPLAIN must not break the transaction
+            with transaction.atomic():
+                tables = get_full_scans(group["sql"], group["params"])
+        except DatabaseError:
+            continue
+        for table in tables:
+            columns = get_filter_columns(group["sql"], table)
+            if not columns or is_indexed(table, columns) or \
+                    get_table_rows(table) < min_rows:
+                continue
+            recommendation = recommendations.setdefault((table, columns), {
+                "count": 0,
+                "ms": 0.0,
+                "sql": group["sql"],
+            })
+            recommendation["count"] += group["count"]
+            recommendation["ms"] += group["ms"]
+
+    return sorted(
+        (
+            IndexRecommendation(
+                table,
+                columns,
+                values["count"],
+                round(values["ms"], 1),
+                values["sql"]
+            )
+            for (table, columns), values in recommendations.items()
+        ),
+        key=lambda recommendation: -recommendation.total_ms
+    )
@@ -0,0 +1,57 @@
+"""
+Django command to recommend missing indexes from the query log
+e.g. PERF_SLOW_REQUEST_MS=0 python manage.py run_benchmark 2> perf.log
+    python manage.py advise_indexes perf.log
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.index_advisor import advise_indexes, read_log_queries
+
+
+class Command(BaseCommand):
+    """Django command to recommend missing indexes"""
+    help = "Recommends indexes for the logged slow queries (EXPLAIN)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "log_files",
+            nargs="+",
+            help="Logs with the warning records of core.middleware."
+        )
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=1000,
+            help="Ignore full scans of smaller tables."
+        )
+        parser.add_argument("--json", action="store_true")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        queries = []
+        for path in options["log_files"]:
+            with open(path, encoding="utf-8") as file:
+                queries += read_log_queries(file)
+
+        recommendations = advise_indexes(queries, options["min_rows"])
+        if options["json"]:
+            self.stdout.write(json.dumps([
+                recommendation._asdict() | {
+                    "definition": recommendation.definition
+                }
+                for recommendation in recommendations
+            ], indent=2))
+            return
+
+        self.stdout.write(f"\nExplained {len(queries)} logged queries...")
+        for recommendation in recommendations:
+            self.stdout.write(
+                f"{recommendation.table} ({', '.join(recommendation.columns)})"
+                f": {recommendation.query_count} queries, "
+                f"{recommendation.total_ms} ms\n"
+                f"    {recommendation.definition}"
+            )
+        if not recommendations:
+            self.stdout.write(self.style.SUCCESS("No missing indexes!"))
@@ -0,0 +1,68 @@
+"""
+Django command to benchmark the login per password hasher policy
+Writes the logins per second per core of every policy as JSON
+e.g. PASSWORD_PBKDF2_ITERATIONS=600000 python manage.py benchmark_login
+    --policy pbkdf2 --policy scrypt --output login_benchmark.json
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import run_login_benchmark, write_report
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the login"""
+    help = "Benchmarks the login throughput per password hasher policy."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--policy",
+            action="append",
+            dest="policies",
+            help="Hasher policy, repeatable (default: all policies)."
+        )
+        parser.add_argument("--requests", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--host",
+            help="Host header (default: first of ALLOWED_HOSTS)."
+        )
+        parser.add_argument("--label", default="")
+        parser.add_argument("--output", default="login_benchmark.json")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        policies = options["policies"] or list(
+            settings.PASSWORD_HASHER_POLICIES
+        )
+        unknown = set(policies) - set(settings.PASSWORD_HASHER_POLICIES)
+        if unknown:
+            raise CommandError(f"Unknown policies: {sorted(unknown)}.")
+
+        self.stdout.write(
+            f"\nBenchmarking the login of {len(policies)} policies "
+            f"with {options['requests']} requests..."
+        )
+        report = run_login_benchmark(
+            policies,
+            requests=options["requests"],
+            warmup=options["warmup"],
+            host=options["host"],
+            label=options["label"]
+        )
+        write_report(report, options["output"])
+
+        for policy, result in report["endpoints"].items():
+            if "error" in result:
+                self.stdout.write(self.style.WARNING(
+                    f"{policy}: {result['error']}"
+                ))
+                continue
+            self.stdout.write(
+                f"{policy}: {result['logins_per_sec_per_core']} logins/s "
+                f"per core, p50 {result['p50_ms']} ms, "
+                f"p99 {result['p99_ms']} ms"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Login benchmark written to {options['output']}!"
+        ))
@@ -0,0 +1,58 @@
+"""
+Django command to benchmark the async read views against the sync
+viewsets under concurrency (threads vs. one event loop)
+e.g. python manage.py compare_async_views --concurrency 50
+    --output async_benchmark.json
+"""
+from django.core.management.base import BaseCommand
+
+from core.benchmark import run_async_comparison, write_report
+from core.management.commands.run_benchmark import (
+    Command as BenchmarkCommand,
+)
+
+
+class Command(BaseCommand):
+    """Django command to compare the sync and async read views"""
+    help = "Benchmarks the sync and async read views under concurrency."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            help="User of the requests (default: first non staff user)."
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument(
+            "--host",
+            help="Host header (default: first of ALLOWED_HOSTS)."
+        )
+        parser.add_argument("--label", default="")
+        parser.add_argument("--output", default="async_benchmark.json")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        user = BenchmarkCommand.get_user(options["username"])
+        self.stdout.write(
+            f"\nComparing sync and async views with {options['requests']} "
+            f"requests, {options['concurrency']} concurrent..."
+        )
+        report = run_async_comparison(
+            user,
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            host=options["host"],
+            label=options["label"]
+        )
+        write_report(report, options["output"])
+
+        for endpoint, results in report["endpoints"].items():
+            for mode, result in results.items():
+                self.stdout.write(
+                    f"{endpoint} ({mode}): p50 {result['p50_ms']} ms, "
+                    f"p99 {result['p99_ms']} ms, "
+                    f"{result['throughput_rps']} req/s"
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f"Comparison written to {options['output']}!"
+        ))
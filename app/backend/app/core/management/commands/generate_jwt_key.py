@@ -0,0 +1,105 @@
+"""
+Django command to generate a JWT signing key into JWT_KEYS_DIR
+The kid is the creation time, so the new key sorts last and becomes
+the active key (unless JWT_ACTIVE_KID pins one) within
+JWT_KEYS_RELOAD_INTERVAL, while the old keys still verify.
+Rotation without downtime:
+    1. python manage.py generate_jwt_key --algorithm EdDSA
+    2. after the lifetime of the old tokens, retire the old key:
+       python manage.py generate_jwt_key --retire <old kid>
+       (keeps <old kid>.pub.pem for verification) and delete it later
+"""
+import os
+from datetime import datetime, timezone
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app import settings
+from app_auth.keys import PRIVATE_KEY_SUFFIX, PUBLIC_KEY_SUFFIX
+
+
+class Command(BaseCommand):
+    """Django command to generate and retire JWT signing keys"""
+    help = "Generates a JWT signing key (RS256 or EdDSA) into the key dir."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir",
+            default=settings.JWT_KEYS_DIR,
+            help="Key directory (default: JWT_KEYS_DIR)."
+        )
+        parser.add_argument(
+            "--algorithm",
+            choices=["RS256", "EdDSA"],
+            default="RS256"
+        )
+        parser.add_argument("--key-size", type=int, default=2048)
+        parser.add_argument("--kid", help="Key id (default: UTC time).")
+        parser.add_argument(
+            "--retire",
+            metavar="KID",
+            help="Replace the private key of the kid by its public key."
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        directory = options["dir"]
+        if not directory:
+            raise CommandError("No key directory, set JWT_KEYS_DIR.")
+        os.makedirs(directory, exist_ok=True)
+
+        if options["retire"]:
+            self.retire(directory, options["retire"])
+            return
+
+        kid = options["kid"] or \
+            datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        path = os.path.join(directory, f"{kid}{PRIVATE_KEY_SUFFIX}")
+        if os.path.exists(path):
+            raise CommandError(f"Key {kid} exists.")
+
+        if options["algorithm"] == "EdDSA":
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            private_key = rsa.generate_private_key(
+                public_exponent=65537,
+                key_size=options["key_size"]
+            )
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        # readable by the owner only
+        descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(pem)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['algorithm']} key {kid} written to {path}!"
+        ))
+
+    def retire(self, directory: str, kid: str) -> None:
+        path = os.path.join(directory, f"{kid}{PRIVATE_KEY_SUFFIX}")
+        if not os.path.exists(path):
+            raise CommandError(f"No private key {kid}.")
+
+        with open(path, "rb") as file:
+            private_key = serialization.load_pem_private_key(
+                file.read(),
+                password=None
+            )
+        public_path = os.path.join(directory, f"{kid}{PUBLIC_KEY_SUFFIX}")
+        with open(public_path, "wb") as file:
+            file.write(private_key.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo
+            ))
+        os.remove(path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Key {kid} retired, {public_path} only verifies!"
+        ))
@@ -0,0 +1,73 @@
+"""
+Django command to generate a synthetic dataset for load tests
+e.g. python manage.py generate_synthetic_data --ingredients 1000000
+    --recipes 100000 --carts 1000000 --ingredients-per-cart 10
+"""
+from django.core.management.base import BaseCommand
+
+from core import models
+from core.synthetic_data import (
+    SYNTHETIC_PASSWORD,
+    DatasetSize,
+    SyntheticDataGenerator,
+)
+
+
+class Command(BaseCommand):
+    """Django command to generate a synthetic dataset"""
+    help = "Generates a reproducible synthetic dataset (COPY/bulk inserts)."
+
+    def add_arguments(self, parser):
+        defaults = DatasetSize()
+        for field in DatasetSize._fields:
+            parser.add_argument(
+                f"--{field.replace('_', '-')}",
+                type=int,
+                default=getattr(defaults, field)
+            )
+        parser.add_argument(
+            "--prefix",
+            default="syn",
+            help="Prefix of the generated names (unique per dataset)."
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        size = DatasetSize(**{
+            field: options[field] for field in DatasetSize._fields
+        })
+        self.stdout.write(f"\nGenerating synthetic dataset {size}...")
+        generator = SyntheticDataGenerator(
+            size,
+            prefix=options["prefix"],
+            seed=options["seed"],
+            batch_size=options["batch_size"]
+        )
+        counts = generator.generate()
+        self.notify_caches()
+
+        for table, count in counts.items():
+            self.stdout.write(f"{table}: {count} rows")
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated dataset! Users '{options['prefix']}_user<n>' "
+            f"log in with '{SYNTHETIC_PASSWORD}'."
+        ))
+
+    @staticmethod
+    def notify_caches() -> None:
+        """The inserts skip post_save, invalidate the cached responses"""
+        from recipe.signals import bulk_saved
+
+        for model in [
+            models.User,
+            models.Ingredient,
+            models.Recipe,
+            models.RecipeIngredient,
+            models.RecipeTag,
+            models.RecipeRating,
+            models.RecipeCart,
+            models.RecipeCartIngredient,
+        ]:
+            bulk_saved.send(sender=model, objects=[])
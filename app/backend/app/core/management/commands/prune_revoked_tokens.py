@@ -0,0 +1,24 @@
+"""
+Django command to delete the expired refresh token revocations
+The bloom filters keep the ids until the workers restart
+(gunicorn max_requests), which rebuilds them from the pruned table.
+"""
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+
+from core.models import RevokedToken
+
+
+class Command(BaseCommand):
+    """Django command to prune the revocation table"""
+    help = "Deletes the revocations of expired refresh tokens."
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        count, _ = RevokedToken.objects.filter(
+            expires_at__lt=datetime.now(timezone.utc)
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {count} expired revocations!"
+        ))
@@ -0,0 +1,18 @@
+"""
+Django command to rebuild the recipe rating aggregates
+"""
+from django.core.management.base import BaseCommand
+
+from core.ratings import rebuild_recipe_ratings
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the recipe rating aggregates"""
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        self.stdout.write("\nRebuilding recipe rating aggregates...")
+        updated = rebuild_recipe_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt ratings of {updated} recipes!")
+        )
@@ -0,0 +1,86 @@
+"""
+Django command to benchmark the API endpoints in-process
+Writes p50/p95/p99 latency and throughput per endpoint as JSON
+e.g. python manage.py run_benchmark --username syn_user0
+    --output benchmark.json --baseline benchmark_last_release.json
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import models
+from core.benchmark import (
+    DEFAULT_ENDPOINTS,
+    compare_reports,
+    run_benchmark,
+    write_report,
+)
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API endpoints"""
+    help = "Benchmarks the API endpoints through the URL conf in-process."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            help="User of the requests (default: first non staff user)."
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            help="Endpoint path, repeatable ({recipe_id} is replaced)."
+        )
+        parser.add_argument("--requests", type=int, default=100)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument(
+            "--host",
+            help="Host header (default: first of ALLOWED_HOSTS)."
+        )
+        parser.add_argument("--label", default="")
+        parser.add_argument("--output", default="benchmark.json")
+        parser.add_argument(
+            "--baseline",
+            help="Report to compare the percentiles with."
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        user = self.get_user(options["username"])
+        endpoints = options["endpoints"] or DEFAULT_ENDPOINTS
+        self.stdout.write(
+            f"\nBenchmarking {len(endpoints)} endpoints "
+            f"with {options['requests']} requests..."
+        )
+        report = run_benchmark(
+            user,
+            endpoints,
+            requests=options["requests"],
+            warmup=options["warmup"],
+            host=options["host"],
+            label=options["label"]
+        )
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as file:
+                report["changes"] = compare_reports(json.load(file), report)
+        write_report(report, options["output"])
+
+        for endpoint, result in report["endpoints"].items():
+            self.stdout.write(
+                f"{endpoint}: p50 {result['p50_ms']} ms, "
+                f"p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms, "
+                f"{result['throughput_rps']} req/s"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Benchmark written to {options['output']}!"
+        ))
+
+    @staticmethod
+    def get_user(username) -> models.User:
+        users = models.User.objects.order_by("id")
+        user = users.filter(username=username).first() if username \
+            else users.filter(is_staff=False).first()
+        if user is None:
+            raise CommandError("No user to benchmark with.")
+        return user
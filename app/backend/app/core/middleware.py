@@ -0,0 +1,335 @@
+"""
+Request instrumentation middleware
+Records per request the query count, the SQL time, duplicated queries
+(same SQL with different parameters, e.g. N+1) and the render time.
+Emits them as 'Server-Timing' header and as one JSON log line.
+Requests above the thresholds are logged as warning with the stacks
+of the duplicated queries and the slowest queries (read by the
+advise_indexes command).
+Async requests (ASGI) run their queries in executor threads: every
+connection has an execute wrapper reporting to the metrics of the
+request in the context (copied into the threads by sync_to_async).
+RateLimitMiddleware answers throttled requests with 429 and Retry-After.
+"""
+import asyncio
+import heapq
+import json
+import logging
+import math
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Callable, Union
+
+from asgiref.sync import sync_to_async
+
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from app import settings
+from core import rate_limit
+
+
+logger = logging.getLogger(__name__)
+
+IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+MAX_STACKS = 5
+MAX_SLOW_QUERIES = 5
+
+# metrics of the current async request
+current_metrics: ContextVar = ContextVar("current_metrics", default=None)
+
+
+def get_fingerprint(sql: str) -> str:
+    """Returns the SQL without the length of IN (...) lists"""
+    return IN_LIST_RE.sub("IN (...)", sql)
+
+
+class RequestMetrics:
+    """Query metrics of one request (used as database execute wrapper)"""
+
+    def __init__(self, track_queries: bool = True) -> None:
+        self.start = time.perf_counter()
+        self.track_queries = track_queries
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.render_start = None
+        self.render_time = 0.0
+        self.fingerprints: Counter = Counter()
+        self.stacks: dict[str, list[str]] = {}
+        # heap of (duration, query number, sql, params)
+        self.slow_queries: list[tuple] = []
+
+    def __call__(self, execute: Callable, sql: str, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.sql_time += duration
+            self.query_count += 1
+            if not many:
+                self.add_slow_query(duration, sql, params)
+            fingerprint = get_fingerprint(sql)
+            self.fingerprints[fingerprint] += 1
+            # the stack is only captured for the first duplicate
+            if self.fingerprints[fingerprint] == 2 and \
+                    len(self.stacks) < MAX_STACKS:
+                self.stacks[fingerprint] = get_app_stack()
+
+    def add_slow_query(self, duration: float, sql: str, params) -> None:
+        # the params contain user data (emails, password hashes, token ids)
+        if not settings.PERF_LOG_QUERY_PARAMS:
+            params = None
+        query = (duration, self.query_count, sql, params)
+        if len(self.slow_queries) < MAX_SLOW_QUERIES:
+            heapq.heappush(self.slow_queries, query)
+        elif duration > self.slow_queries[0][0]:
+            heapq.heapreplace(self.slow_queries, query)
+
+    def get_slow_queries(self) -> list[dict]:
+        """
+        The slowest queries, slowest first
+        The parameters only with the opt-in PERF_LOG_QUERY_PARAMS
+        """
+        queries = []
+        for duration, _, sql, params in sorted(
+            self.slow_queries,
+            reverse=True
+        ):
+            query = {"sql": sql, "ms": round(duration * 1000, 1)}
+            if params is not None:
+                query["params"] = list(params) \
+                    if isinstance(params, (list, tuple)) else params
+            queries.append(query)
+        return queries
+
+    @property
+    def duplicates(self) -> dict:
+        """Fingerprint -> count of every query executed more than once"""
+        return {
+            fingerprint: count
+            for fingerprint, count in self.fingerprints.items()
+            if count > 1
+        }
+
+    def start_render(self, response: HttpResponse) -> HttpResponse:
+        self.render_start = time.perf_counter()
+        return response
+
+    def end_render(self, response: HttpResponse) -> None:
+        if self.render_start is not None:
+            self.render_time = time.perf_counter() - self.render_start
+
+    def get_server_timing(self, total: float) -> str:
+        duplicate_count = sum(self.duplicates.values())
+        app_time = total - self.sql_time - self.render_time
+        metrics = [
+            f"app;dur={app_time * 1000:.1f}",
+            f"render;dur={self.render_time * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ]
+        if self.track_queries:
+            metrics = [
+                f'db;dur={self.sql_time * 1000:.1f};'
+                f'desc="{self.query_count} queries"',
+                f'dup;desc="{duplicate_count} duplicated queries"',
+                *metrics,
+            ]
+        return ", ".join(metrics)
+
+
+def get_app_stack() -> list[str]:
+    """Returns the frames of the project code of the current stack"""
+    base_dir = str(settings.BASE_DIR)
+    return [
+        f"{frame.filename}:{frame.lineno} in {frame.name}"
+        for frame in traceback.extract_stack(limit=settings.PERF_STACK_LIMIT)
+        if frame.filename.startswith(base_dir) and
+        "site-packages" not in frame.filename and
+        frame.filename != __file__
+    ]
+
+
+def execute_with_current_metrics(
+    execute: Callable,
+    sql: str,
+    params,
+    many,
+    context
+):
+    """Execute wrapper reporting to the metrics of the current request"""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_execute_wrapper(sender, connection, **kwargs) -> None:
+    """
+    Installs execute_with_current_metrics on a new connection
+    (connection_created receiver, the connections are per thread)
+    """
+    if execute_with_current_metrics not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_with_current_metrics)
+
+
+def get_view_name(request: HttpRequest) -> Union[None, str]:
+    """Returns the URL name (else the route) the request resolved to"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+    return match.view_name or match.route
+
+
+class QueryMetricsMiddleware:
+    """
+    Instruments every request with RequestMetrics
+    The 'app' timing is the view time without SQL (mostly serializing)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # marks the instance as coroutine function for the handler
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.acall(request)
+        if not settings.PERF_INSTRUMENTATION:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        request.query_metrics = metrics
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+
+        total = time.perf_counter() - metrics.start
+        response["Server-Timing"] = metrics.get_server_timing(total)
+        self.log(request, response, metrics, total)
+        return response
+
+    async def acall(self, request: HttpRequest) -> HttpResponse:
+        if not settings.PERF_INSTRUMENTATION:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        request.query_metrics = metrics
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+
+        total = time.perf_counter() - metrics.start
+        response["Server-Timing"] = metrics.get_server_timing(total)
+        self.log(request, response, metrics, total)
+        return response
+
+    def process_template_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponse
+    ) -> HttpResponse:
+        metrics = getattr(request, "query_metrics", None)
+        if metrics is not None:
+            metrics.start_render(response)
+            response.add_post_render_callback(metrics.end_render)
+        return response
+
+    def log(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        metrics: RequestMetrics,
+        total: float
+    ) -> None:
+        duplicates = metrics.duplicates
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": get_view_name(request),
+            "status": response.status_code,
+            "render_ms": round(metrics.render_time * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+        }
+        if metrics.track_queries:
+            record |= {
+                "queries": metrics.query_count,
+                "duplicated_queries": sum(duplicates.values()),
+                "sql_ms": round(metrics.sql_time * 1000, 1),
+            }
+        is_slow = total * 1000 >= settings.PERF_SLOW_REQUEST_MS or \
+            metrics.query_count >= settings.PERF_QUERY_COUNT_THRESHOLD or \
+            any(count >= settings.PERF_DUPLICATE_QUERY_THRESHOLD
+                for count in duplicates.values())
+
+        if not is_slow:
+            logger.info(json.dumps(record))
+            return
+
+        record["duplicates"] = [
+            {
+                "sql": fingerprint,
+                "count": count,
+                "stack": metrics.stacks.get(fingerprint, []),
+            }
+            for fingerprint, count in duplicates.items()
+        ]
+        record["slow_queries"] = metrics.get_slow_queries()
+        logger.warning(json.dumps(record, default=str))
+
+
+def throttled_response(wait: float) -> HttpResponse:
+    """Returns 429 with the seconds to wait (like DRF's Throttled)"""
+    seconds = math.ceil(wait)
+    response = JsonResponse(
+        {
+            "detail": "Request was throttled. "
+                      f"Expected available in {seconds} seconds."
+        },
+        status=429
+    )
+    response["Retry-After"] = str(seconds)
+    return response
+
+
+class RateLimitMiddleware:
+    """Rejects requests over the token bucket of their route group"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # marks the instance as coroutine function for the handler
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.acall(request)
+        if settings.RATE_LIMIT_ENABLED:
+            wait = rate_limit.rate_limiter.check(request)
+            if wait:
+                return throttled_response(wait)
+        return self.get_response(request)
+
+    async def acall(self, request: HttpRequest) -> HttpResponse:
+        if settings.RATE_LIMIT_ENABLED:
+            limiter = rate_limit.rate_limiter
+            # the shared store is a (sync) cache request
+            wait = await sync_to_async(limiter.check)(request) \
+                if limiter.is_shared else limiter.check(request)
+            if wait:
+                return throttled_response(wait)
+        return await self.get_response(request)
@@ -0,0 +1,271 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DayTime',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('day_time_name', models.CharField(max_length=10, unique=True)),
+            ],
+            options={
+                'db_table': 'day_time',
+            },
+        ),
+        migrations.CreateModel(
+            name='FoodShop',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('shop_name', models.CharField(max_length=100, unique=True)),
+                ('address', models.CharField(max_length=75)),
+                ('zip_code', models.CharField(max_length=10)),
+                ('city', models.CharField(max_length=100)),
+                ('shop_comment', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+            options={
+                'db_table': 'food_shop',
+            },
+        ),
+        migrations.CreateModel(
+            name='FoodShopArea',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('area_name', models.CharField(max_length=100)),
+                ('area_order_number', models.IntegerField()),
+                ('food_shop', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.foodshop')),
+            ],
+            options={
+                'db_table': 'food_shop_area',
+                'unique_together': {('food_shop', 'area_name'), ('food_shop', 'area_order_number')},
+            },
+        ),
+        migrations.CreateModel(
+            name='FoodShopAreaPart',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('area_part_name', models.CharField(max_length=100)),
+                ('area_part_order_number', models.IntegerField()),
+                ('area', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.foodshoparea')),
+            ],
+            options={
+                'db_table': 'food_shop_area_part',
+                'unique_together': {('area', 'area_part_name'), ('area', 'area_part_order_number')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Recipe',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('recipe_name', models.CharField(max_length=50, unique=True)),
+                ('person_count', models.IntegerField()),
+                ('prep_description', models.TextField(max_length=1000)),
+                ('cooking_duration_min', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'recipe',
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('tag_name', models.CharField(max_length=25, unique=True)),
+            ],
+            options={
+                'db_table': 'tag',
+            },
+        ),
+        migrations.CreateModel(
+            name='Unit',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('unit_name', models.CharField(max_length=20, unique=True)),
+            ],
+            options={
+                'db_table': 'unit',
+            },
+        ),
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=35, unique=True)),
+                ('email', models.CharField(blank=True, max_length=255, null=True)),
+                ('is_staff', models.BooleanField(default=False)),
+            ],
+            options={
+                'db_table': 'user',
+            },
+        ),
+        migrations.CreateModel(
+            name='Watchlist',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('watchlist_name', models.CharField(max_length=50)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.user')),
+            ],
+            options={
+                'db_table': 'watchlist',
+                'unique_together': {('user', 'watchlist_name')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeImage',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('image_path', models.CharField(max_length=255, unique=True)),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.recipe')),
+            ],
+            options={
+                'db_table': 'recipe_image',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeCart',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('recipe_name', models.CharField(max_length=75)),
+                ('day_time', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.daytime')),
+                ('food_shop', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.foodshop')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.user')),
+            ],
+            options={
+                'db_table': 'recipe_cart',
+            },
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.user'),
+        ),
+        migrations.CreateModel(
+            name='Ingredient',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('ingredient_name', models.CharField(max_length=50, unique=True)),
+                ('default_price', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('ingredient_display_name', models.CharField(max_length=50)),
+                ('quantity_per_unit', models.DecimalField(decimal_places=2, max_digits=9)),
+                ('is_spices', models.BooleanField(default=False)),
+                ('search_description', models.CharField(blank=True, max_length=100, null=True)),
+                ('unit', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.unit')),
+            ],
+            options={
+                'db_table': 'ingredient',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeWatchlist',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.recipe')),
+                ('watchlist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.watchlist')),
+            ],
+            options={
+                'db_table': 'recipe_watchlist',
+                'unique_together': {('watchlist', 'recipe')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeTag',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.recipe')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.tag')),
+            ],
+            options={
+                'db_table': 'recipe_tag',
+                'unique_together': {('recipe', 'tag')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeRating',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('rating', models.DecimalField(decimal_places=1, max_digits=2)),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.recipe')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.user')),
+            ],
+            options={
+                'db_table': 'recipe_rating',
+                'unique_together': {('user', 'recipe')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeIngredient',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('unit_quantity', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.ingredient')),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.recipe')),
+            ],
+            options={
+                'db_table': 'recipe_ingredient',
+                'unique_together': {('recipe', 'ingredient')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeFavorite',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.recipe')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.user')),
+            ],
+            options={
+                'db_table': 'recipe_favorite',
+                'unique_together': {('user', 'recipe')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeCartIngredient',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('buy_unit_quantity', models.IntegerField()),
+                ('is_done', models.BooleanField(blank=True, default=False)),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.ingredient')),
+                ('shopping_cart_recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.recipecart')),
+            ],
+            options={
+                'db_table': 'recipe_cart_ingredient',
+                'unique_together': {('shopping_cart_recipe', 'ingredient')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PreferredUserFoodShop',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('food_shop', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.foodshop')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='core.user')),
+            ],
+            options={
+                'db_table': 'preferred_user_food_shop',
+                'unique_together': {('user', 'food_shop')},
+            },
+        ),
+        migrations.CreateModel(
+            name='FoodShopAreaPartIngredient',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('ingredient_price', models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True)),
+                ('area_part', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.foodshopareapart')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.ingredient')),
+            ],
+            options={
+                'db_table': 'food_shop_area_part_ingredient',
+                'unique_together': {('ingredient', 'area_part')},
+            },
+        ),
+    ]
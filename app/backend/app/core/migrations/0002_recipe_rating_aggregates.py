@@ -0,0 +1,45 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+def rebuild_recipe_ratings(apps, schema_editor):
+    from core.ratings import rebuild_recipe_ratings
+
+    rebuild_recipe_ratings(
+        apps.get_model("core", "Recipe"),
+        apps.get_model("core", "RecipeRating")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_avg',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=3),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_sum',
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=12),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-rating_avg', '-rating_count'], name='recipe_top_rated_idx'),
+        ),
+        migrations.RunPython(
+            rebuild_recipe_ratings,
+            migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_recipe_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipecart',
+            index=models.Index(fields=['user', 'date'], name='recipe_cart_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipecart',
+            index=models.Index(fields=['user', 'id'], name='recipe_cart_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reciperating',
+            index=models.Index(fields=['user', 'id'], name='recipe_rating_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['user', 'id'], name='watchlist_user_id_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_owner_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipecartingredient',
+            index=models.Index(fields=['shopping_cart_recipe', 'is_done'], name='cart_ingredient_cart_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reciperating',
+            index=models.Index(fields=['recipe', 'rating'], name='recipe_rating_recipe_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+"""
+pg_trgm and the GIN indexes of the search (recipe.services.search),
+built from the same expressions as the search queries.
+PostgreSQL only. The indexes are not part of the model state, their
+expressions are defined by the search. Indexes created by the former
+post_migrate hook are kept.
+"""
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from core import models
+from recipe.services import search
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """AddIndex on PostgreSQL only, an existing index is kept"""
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        connection = schema_editor.connection
+        if connection.vendor != "postgresql":
+            return
+        model = to_state.apps.get_model(app_label, self.model_name)
+        with connection.cursor() as cursor:
+            existing = connection.introspection.get_constraints(
+                cursor,
+                model._meta.db_table
+            )
+        if self.index.name not in existing:
+            super().database_forwards(
+                app_label,
+                schema_editor,
+                from_state,
+                to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(
+                app_label,
+                schema_editor,
+                from_state,
+                to_state
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_revoked_token'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                *[
+                    AddPostgresIndex(model._meta.model_name, index)
+                    for model in search.SEARCH_CONFIGS
+                    for index in search.get_search_indexes(model)
+                ],
+                AddPostgresIndex(
+                    models.Tag._meta.model_name,
+                    search.get_tag_search_index()
+                ),
+            ],
+        ),
+    ]
@@ -1,4 +1,4 @@
-from .user import User
+from .user import User, RevokedToken
 from .recipe import (
     Ingredient,
     Recipe,
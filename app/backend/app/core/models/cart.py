@@ -41,6 +41,16 @@ class RecipeCart(models.Model):
 
     class Meta:
         db_table = 'recipe_cart'
+        indexes = [
+            models.Index(
+                fields=["user", "date"],
+                name="recipe_cart_user_date_idx"
+            ),
+            models.Index(
+                fields=["user", "id"],
+                name="recipe_cart_user_id_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id} | {self.user} | {self.recipe_name}"
@@ -59,6 +69,12 @@ class RecipeCartIngredient(models.Model):
     class Meta:
         db_table = 'recipe_cart_ingredient'
         unique_together = (('shopping_cart_recipe', 'ingredient'),)
+        indexes = [
+            models.Index(
+                fields=["shopping_cart_recipe", "is_done"],
+                name="cart_ingredient_cart_done_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id}"
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 from core.models import User
 
@@ -83,9 +83,27 @@ class Recipe(models.Model):
         blank=False,
         null=True
     )
+    # denormalized RecipeRating aggregates, maintained by core.ratings
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.DecimalField(
+        max_digits=12,
+        decimal_places=1,
+        default=0
+    )
+    rating_avg = models.DecimalField(
+        max_digits=3,
+        decimal_places=2,
+        default=0
+    )
 
     class Meta:
         db_table = "recipe"
+        indexes = [
+            models.Index(
+                fields=["-rating_avg", "-rating_count"],
+                name="recipe_top_rated_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id} | {self.recipe_name} | user: {self.user}"
@@ -153,10 +171,29 @@ class RecipeRating(models.Model):
     class Meta:
         db_table = "recipe_rating"
         unique_together = (("user", "recipe"),)
+        indexes = [
+            models.Index(
+                fields=["user", "id"],
+                name="recipe_rating_user_id_idx"
+            ),
+            models.Index(
+                fields=["recipe", "rating"],
+                name="recipe_rating_recipe_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id} | {self.recipe} | {self.rating}"
 
+    def save(self, *args, **kwargs):
+        # the recipe aggregates are updated by signals in this transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
 
 class RecipeTag(models.Model):
     id = models.BigAutoField(primary_key=True)
@@ -188,6 +225,12 @@ class Watchlist(models.Model):
     class Meta:
         db_table = "watchlist"
         unique_together = (("user", "watchlist_name"),)
+        indexes = [
+            models.Index(
+                fields=["user", "id"],
+                name="watchlist_user_id_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id} | {self.user} | {self.watchlist_name}"
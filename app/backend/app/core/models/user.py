@@ -71,3 +71,30 @@ class User(AbstractBaseUser):
 
     def __str__(self) -> str:
         return f"{self.id} | {self.username}"
+
+
+class RevokedToken(models.Model):
+    """
+    Revoked refresh token (jti) or refresh token family
+    (see app_auth.revocation), append only until expired
+    """
+
+    token_id = models.CharField(max_length=32, unique=True)
+    # no foreign key, tokens of deleted users can be revoked
+    user_id = models.BigIntegerField(null=True)
+    # the revoked tokens are expired afterwards, the row can be pruned
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "revoked_token"
+        indexes = [
+            # incremental sync of the bloom filters
+            models.Index(
+                fields=["created_at"],
+                name="revoked_token_created_at_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.token_id} | {self.user_id} | {self.expires_at}"
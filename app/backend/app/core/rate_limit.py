@@ -0,0 +1,215 @@
+"""
+Rate limiting with token buckets per route group and client
+(see settings.RATE_LIMIT_GROUPS and core.middleware.RateLimitMiddleware)
+A client is the user of an already verified token or the client IP.
+The in-process buckets are checked first (no lock, no I/O), the shared
+store (RATE_LIMIT_STORE = "shared") then limits across all workers.
+"""
+import math
+import time
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Union
+
+from django.core.cache import caches
+from django.http import HttpRequest
+
+from app import settings
+from app_auth.authentication import token_cache
+
+
+BEARER_PREFIX = "Bearer "
+PERIODS = {
+    "s": 1, "sec": 1, "second": 1,
+    "m": 60, "min": 60, "minute": 60,
+    "h": 3600, "hour": 3600,
+    "d": 86400, "day": 86400,
+}
+
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    """
+    Returns capacity (burst) and refill per second of a rate
+    '<requests>/<period>', e.g. '30/min'
+    """
+    count, period = rate.split("/")
+    return int(count), int(count) / PERIODS[period]
+
+
+class TokenBuckets:
+    """
+    In-process token buckets by key
+    Lock-free: a bucket is a list [tokens, updated] changed in place and
+    the dict operations are atomic. Concurrent requests of one client
+    may both take the last token, which is one request too many at most.
+    """
+
+    def __init__(self, capacity: int, rate: float, max_keys: int) -> None:
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        self._buckets: dict[str, list] = {}
+
+    def acquire(self, key: str, now: float) -> float:
+        """Takes a token, returns 0 or the seconds until the next token"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self.evict(now)
+            self._buckets[key] = [self.capacity - 1.0, now]
+            return 0.0
+
+        tokens = min(
+            self.capacity,
+            bucket[0] + (now - bucket[1]) * self.rate
+        )
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / self.rate
+
+    def evict(self, now: float) -> None:
+        """Removes the full buckets (idle clients), else the oldest half"""
+        full_after = self.capacity / self.rate
+        idle = [
+            key for key, (_, updated) in list(self._buckets.items())
+            if now - updated >= full_after
+        ]
+        if not idle:
+            idle = list(self._buckets)[:len(self._buckets) // 2]
+        for key in idle:
+            self._buckets.pop(key, None)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class SharedWindows:
+    """
+    Request counters in the shared cache (all workers)
+    A window of capacity requests lasts capacity / rate seconds, the
+    sustained rate of the token bucket with the atomic incr/add of the
+    cache (the burst at a window border is up to twice the capacity).
+    """
+
+    def __init__(self, capacity: int, rate: float, cache_alias: str) -> None:
+        self.capacity = capacity
+        self.window = capacity / rate
+        self.cache_alias = cache_alias
+
+    def acquire(self, key: str, now: float) -> float:
+        """Counts the request, returns 0 or the seconds until the window"""
+        cache = caches[self.cache_alias]
+        index = int(now // self.window)
+        cache_key = f"rate_limit:{key}:{index}"
+        try:
+            count = cache.incr(cache_key)
+        except ValueError:
+            # first request of the window
+            if cache.add(cache_key, 1, timeout=math.ceil(self.window) + 1):
+                count = 1
+            else:
+                count = cache.incr(cache_key)
+        if count <= self.capacity:
+            return 0.0
+        return (index + 1) * self.window - now
+
+
+class RouteGroup(NamedTuple):
+    name: str
+    prefixes: tuple[str, ...]
+    methods: frozenset[str]
+    buckets: TokenBuckets
+    shared: Union[None, SharedWindows]
+
+
+def get_client_key(request: HttpRequest) -> str:
+    """
+    Returns 'user:<id>' for a token verified before (JWT user_id),
+    else 'ip:<address>'. The limiter does not verify tokens itself.
+    """
+    authorization = request.META.get("HTTP_AUTHORIZATION")
+    if authorization:
+        user = token_cache.peek(authorization.replace(BEARER_PREFIX, ""))
+        if user is not None and user.id:
+            return f"user:{user.id}"
+
+    address = request.META.get(settings.RATE_LIMIT_IP_HEADER) or \
+        request.META.get("REMOTE_ADDR", "")
+    # the last address is the one added by the own proxy
+    return f"ip:{address.split(',')[-1].strip()}"
+
+
+class RateLimiter:
+    """Token buckets of the route groups"""
+
+    def __init__(
+        self,
+        groups: dict[str, dict],
+        store: str = "local",
+        max_keys: int = 100000,
+        cache_alias: str = "default"
+    ) -> None:
+        self.is_shared = store == "shared"
+        self.groups = []
+        for name, group in groups.items():
+            capacity, rate = parse_rate(group["rate"])
+            self.groups.append(RouteGroup(
+                name,
+                tuple(group["prefixes"]),
+                frozenset(group["methods"]),
+                TokenBuckets(capacity, rate, max_keys),
+                SharedWindows(capacity, rate, cache_alias)
+                if self.is_shared else None
+            ))
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        return cls(
+            settings.RATE_LIMIT_GROUPS,
+            settings.RATE_LIMIT_STORE,
+            settings.RATE_LIMIT_MAX_KEYS,
+            settings.RESPONSE_CACHE_ALIAS
+        )
+
+    def get_group(self, path: str, method: str) -> Union[None, RouteGroup]:
+        """Returns the first group of the request"""
+        for group in self.groups:
+            if method in group.methods and path.startswith(group.prefixes):
+                return group
+        return None
+
+    def check(self, request: HttpRequest) -> float:
+        """Returns 0 or the seconds the client has to wait"""
+        group = self.get_group(request.path, request.method)
+        if group is None:
+            return 0.0
+
+        key = f"{group.name}:{get_client_key(request)}"
+        wait = group.buckets.acquire(key, time.monotonic())
+        if wait or group.shared is None:
+            return wait
+        # wall clock, the windows are shared across machines
+        return group.shared.acquire(key, time.time())
+
+    def clear(self) -> None:
+        for group in self.groups:
+            group.buckets.clear()
+
+
+rate_limiter = RateLimiter.from_settings()
+
+
+@contextmanager
+def disabled() -> Iterator[None]:
+    """
+    Lets every request of this process pass (e.g. the login benchmark,
+    its logins of one client would be throttled)
+    """
+    global rate_limiter
+    previous, rate_limiter = rate_limiter, RateLimiter({})
+    try:
+        yield
+    finally:
+        rate_limiter = previous
@@ -0,0 +1,121 @@
+"""
+Maintains the denormalized rating aggregates of recipes
+(rating_count, rating_sum, rating_avg) on RecipeRating changes
+Every change is one 'UPDATE recipe SET ... = ... + delta' statement,
+executed in the transaction of the rating write.
+"""
+from decimal import Decimal
+from typing import Union
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.aggregates import Avg, Count, Sum
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from core import models
+
+
+AVG_FIELD = DecimalField(max_digits=3, decimal_places=2)
+SUM_FIELD = DecimalField(max_digits=12, decimal_places=1)
+
+
+def apply_rating_delta(
+    recipe_id: Union[None, int],
+    sum_delta: Decimal,
+    count_delta: int
+) -> None:
+    """Adds the deltas to the aggregates of the recipe"""
+    if recipe_id is None or (not sum_delta and not count_delta):
+        return
+
+    new_count = F("rating_count") + count_delta
+    new_sum = F("rating_sum") + sum_delta
+    models.Recipe.objects.filter(id=recipe_id).update(
+        rating_count=new_count,
+        rating_sum=new_sum,
+        rating_avg=Case(
+            When(rating_count=-count_delta, then=Value(0)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=AVG_FIELD
+        )
+    )
+
+
+def rebuild_recipe_ratings(
+    recipe_model=models.Recipe,
+    rating_model=models.RecipeRating
+) -> int:
+    """
+    Recomputes the aggregates of all recipes from the ratings
+    (the models are passed by the migration, historical models)
+    Returns the number of updated recipes
+    """
+    ratings = rating_model.objects.filter(
+        recipe_id=OuterRef("id")
+    ).order_by().values("recipe_id")
+    count = ratings.annotate(value=Count("id")).values("value")
+    rating_sum = ratings.annotate(value=Sum("rating")).values("value")
+    rating_avg = ratings.annotate(value=Avg("rating")).values("value")
+
+    with transaction.atomic():
+        return recipe_model.objects.update(
+            rating_count=Coalesce(
+                Subquery(count),
+                0
+            ),
+            rating_sum=Coalesce(
+                Subquery(rating_sum),
+                Decimal(0),
+                output_field=SUM_FIELD
+            ),
+            rating_avg=Coalesce(
+                Subquery(rating_avg),
+                Decimal(0),
+                output_field=AVG_FIELD
+            ),
+        )
+
+
+def _remember_old_rating(sender, instance: models.RecipeRating, **kwargs):
+    """Stores the rating before the update on the instance"""
+    instance._rating_before = None
+    if instance.pk is not None:
+        instance._rating_before = models.RecipeRating.objects.filter(
+            pk=instance.pk
+        ).values_list("recipe_id", "rating").first()
+
+
+def _on_rating_saved(sender, instance: models.RecipeRating, **kwargs):
+    before = getattr(instance, "_rating_before", None)
+    rating = Decimal(str(instance.rating))
+
+    if before is None:
+        apply_rating_delta(instance.recipe_id, rating, 1)
+    elif before[0] == instance.recipe_id:
+        apply_rating_delta(instance.recipe_id, rating - before[1], 0)
+    else:
+        apply_rating_delta(before[0], -before[1], -1)
+        apply_rating_delta(instance.recipe_id, rating, 1)
+    instance._rating_before = (instance.recipe_id, rating)
+
+
+def _on_rating_deleted(sender, instance: models.RecipeRating, **kwargs):
+    rating = Decimal(str(instance.rating))
+    apply_rating_delta(instance.recipe_id, -rating, -1)
+
+
+def connect_signals() -> None:
+    """Connects the rating aggregate receivers"""
+    pre_save.connect(_remember_old_rating, sender=models.RecipeRating)
+    post_save.connect(_on_rating_saved, sender=models.RecipeRating)
+    post_delete.connect(_on_rating_deleted, sender=models.RecipeRating)
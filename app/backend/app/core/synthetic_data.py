@@ -0,0 +1,358 @@
+"""
+Generator of scalable, reproducible synthetic datasets
+Rows are streamed in batches, with COPY on PostgreSQL and bulk_create
+on other databases. Every name starts with the prefix, so the
+generated rows can be found (and several datasets can coexist).
+"""
+import csv
+import io
+import random
+from datetime import date, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Type
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Model
+
+from core import models
+from core.ratings import rebuild_recipe_ratings
+
+
+SYNTHETIC_PASSWORD = "synthetic-password"
+
+UNIT_NAMES = ["stk.", "Packung(en)", "g", "kg", "ml", "l", "EL", "TL"]
+DAY_TIME_NAMES = ["vormittag", "mittag", "nachmittag", "abend"]
+TAG_NAMES = [
+    "vegan", "vegetarisch", "pasta", "reis", "suppe", "salat", "fisch",
+    "fleisch", "schnell", "dessert", "frühstück", "backen", "scharf",
+    "asiatisch", "italienisch", "low carb", "grillen", "snack",
+]
+WORDS = [
+    "tomate", "knoblauch", "zwiebel", "paprika", "spagetti", "reis",
+    "linsen", "kartoffel", "karotte", "brokkoli", "spinat", "feta",
+    "mozzarella", "hähnchen", "lachs", "tofu", "kichererbsen", "basilikum",
+    "oregano", "chili", "ingwer", "zitrone", "apfel", "banane", "hafer",
+    "joghurt", "sahne", "butter", "mehl", "zucker", "honig", "curry",
+]
+# weights of the ratings 1 to 5 (most ratings are good)
+RATING_WEIGHTS = [4, 6, 15, 35, 40]
+
+
+class DatasetSize(NamedTuple):
+    users: int = 100
+    ingredients: int = 1000
+    recipes: int = 1000
+    ingredients_per_recipe: int = 8
+    tags_per_recipe: int = 2
+    ratings_per_recipe: int = 5
+    carts: int = 1000
+    ingredients_per_cart: int = 10
+
+
+def batched(rows: Iterable, batch_size: int) -> Iterator[list]:
+    """Splits the rows into lists of batch_size rows"""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def insert_rows(
+    model: Type[Model],
+    fields: list[str],
+    rows: Iterable[tuple],
+    batch_size: int = 10000
+) -> int:
+    """
+    Inserts the rows (tuples of the field values) without signals
+    Returns the number of inserted rows
+    """
+    count = 0
+    for batch in batched(rows, batch_size):
+        if connection.vendor == "postgresql":
+            copy_rows(model, fields, batch)
+        else:
+            model.objects.bulk_create(
+                [model(**dict(zip(fields, row))) for row in batch],
+                batch_size=batch_size
+            )
+        count += len(batch)
+    return count
+
+
+def copy_rows(model: Type[Model], fields: list[str], rows: list) -> None:
+    """Inserts the rows with one 'COPY ... FROM STDIN' (PostgreSQL)"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        ["" if value is None else value for value in row] for row in rows
+    )
+    buffer.seek(0)
+
+    quote = connection.ops.quote_name
+    columns = ", ".join(
+        quote(model._meta.get_field(field).column) for field in fields
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {quote(model._meta.db_table)} ({columns}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+
+def get_ids(model: Type[Model], **filters) -> list[int]:
+    """Returns the ids of the filtered rows ordered by id"""
+    return list(model.objects.filter(**filters).order_by(
+        "id"
+    ).values_list("id", flat=True).iterator(chunk_size=10000))
+
+
+class SyntheticDataGenerator:
+    """
+    Generates a dataset of the given size
+    The same seed and size generate the same rows
+    """
+
+    def __init__(
+        self,
+        size: DatasetSize,
+        prefix: str = "syn",
+        seed: int = 42,
+        batch_size: int = 10000
+    ) -> None:
+        self.size = size
+        self.prefix = prefix
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.counts: dict[str, int] = {}
+
+    def generate(self) -> dict[str, int]:
+        """Inserts the dataset, returns the row count per table"""
+        with transaction.atomic():
+            unit_ids = self.get_or_create_ids(models.Unit, "unit_name",
+                                              UNIT_NAMES)
+            tag_ids = self.get_or_create_ids(models.Tag, "tag_name",
+                                             TAG_NAMES)
+            day_time_ids = self.get_or_create_ids(
+                models.DayTime,
+                "day_time_name",
+                DAY_TIME_NAMES
+            )
+            user_ids = self.generate_users()
+            ingredient_ids = self.generate_ingredients(unit_ids)
+            recipe_ids = self.generate_recipes(user_ids)
+            self.generate_recipe_ingredients(recipe_ids, ingredient_ids)
+            self.generate_recipe_tags(recipe_ids, tag_ids)
+            self.generate_ratings(recipe_ids, user_ids)
+            cart_ids = self.generate_carts(user_ids, day_time_ids)
+            self.generate_cart_ingredients(cart_ids, ingredient_ids)
+            rebuild_recipe_ratings()
+        return self.counts
+
+    def insert(
+        self,
+        model: Type[Model],
+        fields: list[str],
+        rows: Iterable[tuple]
+    ) -> None:
+        self.counts[model._meta.db_table] = insert_rows(
+            model,
+            fields,
+            rows,
+            self.batch_size
+        )
+
+    @staticmethod
+    def get_or_create_ids(
+        model: Type[Model],
+        field: str,
+        names: list[str]
+    ) -> list[int]:
+        for name in names:
+            model.objects.get_or_create(**{field: name})
+        return get_ids(model, **{f"{field}__in": names})
+
+    def get_name(self, index: int) -> str:
+        words = self.rng.sample(WORDS, 2)
+        return f"{self.prefix} {words[0]} {words[1]} {index}"
+
+    def generate_users(self) -> list[int]:
+        password = make_password(SYNTHETIC_PASSWORD)
+        self.insert(
+            models.User,
+            ["username", "email", "password", "is_staff"],
+            (
+                (f"{self.prefix}_user{i}", f"{self.prefix}_user{i}@email.com",
+                 password, False)
+                for i in range(self.size.users)
+            )
+        )
+        return get_ids(models.User, username__startswith=f"{self.prefix}_")
+
+    def generate_ingredients(self, unit_ids: list[int]) -> list[int]:
+        rng = self.rng
+        self.insert(
+            models.Ingredient,
+            [
+                "ingredient_name",
+                "ingredient_display_name",
+                "default_price",
+                "quantity_per_unit",
+                "unit_id",
+                "is_spices",
+                "search_description",
+            ],
+            (
+                (name, name[:50], round(rng.uniform(0.19, 19.99), 2),
+                 rng.choice([1, 100, 250, 500, 1000]), rng.choice(unit_ids),
+                 rng.random() < 0.1, " ".join(rng.sample(WORDS, 4)))
+                for name in (
+                    self.get_name(i) for i in range(self.size.ingredients)
+                )
+            )
+        )
+        return get_ids(
+            models.Ingredient,
+            ingredient_name__startswith=f"{self.prefix} "
+        )
+
+    def generate_recipes(self, user_ids: list[int]) -> list[int]:
+        rng = self.rng
+        self.insert(
+            models.Recipe,
+            [
+                "recipe_name",
+                "person_count",
+                "prep_description",
+                "cooking_duration_min",
+                "user_id",
+                # NOT NULL without a database default (COPY),
+                # filled by rebuild_recipe_ratings
+                "rating_count",
+                "rating_sum",
+                "rating_avg",
+            ],
+            (
+                (self.get_name(i), rng.randint(1, 6),
+                 " ".join(rng.choices(WORDS, k=40)), rng.randint(5, 120),
+                 rng.choice(user_ids), 0, 0, 0)
+                for i in range(self.size.recipes)
+            )
+        )
+        return get_ids(
+            models.Recipe,
+            recipe_name__startswith=f"{self.prefix} "
+        )
+
+    def sample(self, ids: list[int], count: int) -> list[int]:
+        return self.rng.sample(ids, min(count, len(ids)))
+
+    def generate_recipe_ingredients(
+        self,
+        recipe_ids: list[int],
+        ingredient_ids: list[int]
+    ) -> None:
+        count = self.size.ingredients_per_recipe
+        self.insert(
+            models.RecipeIngredient,
+            ["recipe_id", "ingredient_id", "unit_quantity"],
+            (
+                (recipe_id, ingredient_id, self.rng.randint(1, 20) / 2)
+                for recipe_id in recipe_ids
+                for ingredient_id in self.sample(
+                    ingredient_ids,
+                    self.rng.randint(max(1, count // 2), count * 3 // 2)
+                )
+            )
+        )
+
+    def generate_recipe_tags(
+        self,
+        recipe_ids: list[int],
+        tag_ids: list[int]
+    ) -> None:
+        self.insert(
+            models.RecipeTag,
+            ["recipe_id", "tag_id"],
+            (
+                (recipe_id, tag_id)
+                for recipe_id in recipe_ids
+                for tag_id in self.sample(
+                    tag_ids,
+                    self.rng.randint(0, self.size.tags_per_recipe * 2)
+                )
+            )
+        )
+
+    def generate_ratings(
+        self,
+        recipe_ids: list[int],
+        user_ids: list[int]
+    ) -> None:
+        """
+        Few recipes get many ratings, most recipes get few
+        (exponentially distributed around ratings_per_recipe)
+        """
+        rng = self.rng
+        mean = self.size.ratings_per_recipe
+        self.insert(
+            models.RecipeRating,
+            ["user_id", "recipe_id", "rating"],
+            (
+                (user_id, recipe_id,
+                 rng.choices(range(1, 6), RATING_WEIGHTS)[0])
+                for recipe_id in recipe_ids
+                for user_id in self.sample(
+                    user_ids,
+                    int(rng.expovariate(1 / mean)) if mean else 0
+                )
+            )
+        )
+
+    def generate_carts(
+        self,
+        user_ids: list[int],
+        day_time_ids: list[int]
+    ) -> list[int]:
+        """Carts are spread over the last and the next 30 days"""
+        rng = self.rng
+        today = date.today()
+        self.insert(
+            models.RecipeCart,
+            ["user_id", "date", "day_time_id", "recipe_name"],
+            (
+                (rng.choice(user_ids),
+                 today + timedelta(days=rng.randint(-30, 30)),
+                 rng.choice(day_time_ids), f"{self.prefix} cart {i}")
+                for i in range(self.size.carts)
+            )
+        )
+        return get_ids(
+            models.RecipeCart,
+            recipe_name__startswith=f"{self.prefix} cart "
+        )
+
+    def generate_cart_ingredients(
+        self,
+        cart_ids: list[int],
+        ingredient_ids: list[int]
+    ) -> None:
+        rng = self.rng
+        self.insert(
+            models.RecipeCartIngredient,
+            [
+                "shopping_cart_recipe_id",
+                "ingredient_id",
+                "buy_unit_quantity",
+                "is_done",
+            ],
+            (
+                (cart_id, ingredient_id, rng.randint(1, 4),
+                 rng.random() < 0.3)
+                for cart_id in cart_ids
+                for ingredient_id in self.sample(
+                    ingredient_ids,
+                    self.size.ingredients_per_cart
+                )
+            )
+        )
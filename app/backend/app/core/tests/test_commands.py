@@ -1,13 +1,26 @@
 """
 Test custom django management commands.
 """
+import json
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2OPError  # type: ignore
 
 from django.core.management import call_command
+from django.db import connection
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+
+from app import settings
+from core import models, rate_limit, synthetic_data
+from core.benchmark import (
+    LOGIN_USERNAME,
+    get_percentile,
+    run_login_benchmark,
+)
 
 
 @patch("core.management.commands.wait_for_db.Command.check")
@@ -33,3 +46,190 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=["default"])
+
+
+class BenchmarkCommandTests(TestCase):
+    """Test the synthetic data and benchmark commands"""
+
+    def generate(self, **options) -> None:
+        call_command(
+            "generate_synthetic_data",
+            users=5,
+            ingredients=20,
+            recipes=10,
+            carts=8,
+            ingredients_per_cart=3,
+            stdout=StringIO(),
+            **options
+        )
+
+    def test_generate_synthetic_data(self):
+        """Test generating a dataset of the given size"""
+        self.generate()
+
+        self.assertEqual(models.User.objects.count(), 5)
+        self.assertEqual(models.Ingredient.objects.count(), 20)
+        self.assertEqual(models.Recipe.objects.count(), 10)
+        self.assertEqual(models.RecipeCart.objects.count(), 8)
+        self.assertEqual(models.RecipeCartIngredient.objects.count(), 24)
+        self.assertTrue(models.RecipeIngredient.objects.exists())
+        rating_count = sum(
+            models.Recipe.objects.values_list("rating_count", flat=True)
+        )
+        self.assertEqual(rating_count, models.RecipeRating.objects.count())
+
+    def test_copy_not_null_columns(self):
+        """Test the COPY rows set every NOT NULL column (no db defaults)"""
+        copied = []
+
+        def copy_rows(model, fields, rows):
+            copied.append((model, fields))
+            model.objects.bulk_create(
+                [model(**dict(zip(fields, row))) for row in rows]
+            )
+
+        with patch.object(connection, "vendor", "postgresql"), \
+                patch.object(synthetic_data, "copy_rows", copy_rows):
+            self.generate()
+
+        self.assertIn(models.Recipe, [model for model, _ in copied])
+        for model, fields in copied:
+            required = {
+                field.name for field in model._meta.concrete_fields
+                if not field.null and not field.primary_key
+            }
+            columns = {field.removesuffix("_id") for field in fields}
+            self.assertLessEqual(required, columns, model.__name__)
+
+    def test_generate_reproducible(self):
+        """Test the same seed generates the same rows"""
+        self.generate(seed=1, prefix="a")
+        self.generate(seed=1, prefix="b")
+
+        names = list(models.Recipe.objects.order_by("id").values_list(
+            "recipe_name",
+            flat=True
+        ))
+        self.assertEqual(
+            [name[2:] for name in names[:10]],
+            [name[2:] for name in names[10:]]
+        )
+
+    def test_run_benchmark(self):
+        """Test the benchmark report of the endpoints"""
+        self.generate()
+        endpoint = "/api/v1/recipe/{recipe_id}/full/"
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "benchmark.json")
+            call_command(
+                "run_benchmark",
+                endpoints=[endpoint],
+                requests=5,
+                warmup=1,
+                output=output,
+                stdout=StringIO()
+            )
+            call_command(
+                "run_benchmark",
+                endpoints=[endpoint],
+                requests=5,
+                warmup=0,
+                output=output,
+                baseline=output,
+                stdout=StringIO()
+            )
+            with open(output, encoding="utf-8") as file:
+                report = json.load(file)
+
+        result = report["endpoints"][endpoint]
+        self.assertEqual(result["status_codes"], {"200": 5})
+        self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertGreater(result["throughput_rps"], 0)
+        self.assertIn("p95", report["changes"][endpoint])
+        self.assertEqual(report["dataset"]["recipe"], 10)
+
+    def test_compare_async_views(self):
+        """Test the sync and async views answer alike in the comparison"""
+        self.generate()
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "async_benchmark.json")
+            # one thread, the test database is not shared across threads
+            call_command(
+                "compare_async_views",
+                requests=3,
+                concurrency=1,
+                output=output,
+                stdout=StringIO()
+            )
+            with open(output, encoding="utf-8") as file:
+                report = json.load(file)
+
+        self.assertEqual(report["concurrency"], 1)
+        for results in report["endpoints"].values():
+            self.assertEqual(results["sync"]["status_codes"], {"200": 3})
+            self.assertEqual(results["async"]["status_codes"], {"200": 3})
+
+    @patch.object(settings, "PASSWORD_SCRYPT_WORK_FACTOR", 2 ** 10)
+    @patch.object(settings, "PASSWORD_PBKDF2_ITERATIONS", 1000)
+    def test_benchmark_login(self):
+        """Test the login throughput per hasher policy"""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "login_benchmark.json")
+            call_command(
+                "benchmark_login",
+                policies=["pbkdf2", "scrypt"],
+                requests=3,
+                warmup=1,
+                output=output,
+                stdout=StringIO()
+            )
+            with open(output, encoding="utf-8") as file:
+                report = json.load(file)
+
+        pbkdf2 = report["endpoints"]["pbkdf2"]
+        scrypt = report["endpoints"]["scrypt"]
+        self.assertEqual(pbkdf2["status_codes"], {"200": 3})
+        self.assertEqual(pbkdf2["algorithm"], "pbkdf2_sha256")
+        self.assertEqual(scrypt["status_codes"], {"200": 3})
+        self.assertEqual(scrypt["algorithm"], "scrypt")
+        self.assertGreater(scrypt["logins_per_sec_per_core"], 0)
+        self.assertFalse(
+            models.User.objects.filter(username=LOGIN_USERNAME).exists()
+        )
+
+    @patch.object(settings, "PASSWORD_PBKDF2_ITERATIONS", 1000)
+    @patch.object(settings, "RATE_LIMIT_ENABLED", True)
+    def test_benchmark_login_rate_limited(self):
+        """Test the benchmark logins are not throttled by the limiter"""
+        limiter = rate_limit.RateLimiter({
+            "auth": {
+                "prefixes": ["/api/v1/token/"],
+                "methods": ["POST"],
+                "rate": "1/min",
+            },
+        })
+        with patch.object(rate_limit, "rate_limiter", limiter):
+            report = run_login_benchmark(["pbkdf2"], requests=3, warmup=1)
+            self.assertIs(rate_limit.rate_limiter, limiter)
+
+        pbkdf2 = report["endpoints"]["pbkdf2"]
+        self.assertEqual(pbkdf2["status_codes"], {"200": 3})
+        self.assertGreater(pbkdf2["logins_per_sec_per_core"], 0)
+
+    def test_benchmark_login_failed(self):
+        """Test failed logins are reported as error, not as throughput"""
+        # an unusable password, every login fails
+        with patch("core.benchmark.make_password", return_value="!"):
+            report = run_login_benchmark(["pbkdf2"], requests=2, warmup=0)
+
+        pbkdf2 = report["endpoints"]["pbkdf2"]
+        self.assertIn("error", pbkdf2)
+        self.assertNotIn("logins_per_sec_per_core", pbkdf2)
+
+    def test_percentile(self):
+        """Test the nearest-rank percentile"""
+        values = list(range(1, 101))
+
+        self.assertEqual(get_percentile(values, 50), 50)
+        self.assertEqual(get_percentile(values, 99), 99)
+        self.assertEqual(get_percentile([3.0], 95), 3.0)
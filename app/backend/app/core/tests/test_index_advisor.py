@@ -0,0 +1,122 @@
+"""
+Test the index advisor
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core import models
+from core.index_advisor import (
+    advise_indexes,
+    get_filter_columns,
+    read_log_queries,
+)
+from core.tests.test_model_recipe import create_unit, create_ingredient
+
+
+def get_logged_query(queryset, ms: float = 1.0) -> dict:
+    """Returns the query as logged by the middleware"""
+    sql, params = queryset.query.sql_with_params()
+    return {"sql": sql, "params": list(params), "ms": ms}
+
+
+class IndexAdvisorTests(TestCase):
+    """Test recommending indexes"""
+
+    def setUp(self):
+        unit = create_unit("advisor_unit")
+        for i in range(3):
+            create_ingredient(f"advisor_ing{i}", f"Advisor {i}", unit)
+
+    def test_read_log_queries(self):
+        """Test reading the slow queries of the log records"""
+        record = {"path": "/", "slow_queries": [{"sql": "SELECT 1"}]}
+        lines = [
+            "some other line",
+            f"WARNING core.middleware {json.dumps(record)}",
+            '{"path": "/", "queries": 1}',
+            "{broken",
+        ]
+
+        self.assertEqual(read_log_queries(lines), [{"sql": "SELECT 1"}])
+
+    def test_filter_columns(self):
+        """Test equality columns lead the index columns"""
+        sql = (
+            'SELECT * FROM "recipe_cart" WHERE ("recipe_cart"."date" >= %s '
+            'AND "recipe_cart"."user_id" = %s AND "user"."id" = %s)'
+        )
+
+        self.assertEqual(
+            get_filter_columns(sql, "recipe_cart"),
+            ("user_id", "date")
+        )
+
+    def test_recommend_missing_index(self):
+        """Test a full scan on a filtered column is recommended"""
+        query = get_logged_query(
+            models.Ingredient.objects.filter(is_spices=True),
+            ms=2.5
+        )
+
+        recommendations = advise_indexes([query, query], min_rows=0)
+
+        self.assertEqual(len(recommendations), 1)
+        recommendation = recommendations[0]
+        self.assertEqual(recommendation.table, "ingredient")
+        self.assertEqual(recommendation.columns, ("is_spices",))
+        self.assertEqual(recommendation.query_count, 2)
+        self.assertEqual(recommendation.total_ms, 5.0)
+        self.assertIn('fields=[\'is_spices\']', recommendation.definition)
+
+    def test_recommend_without_params(self):
+        """Test queries logged without parameters are explained too"""
+        query = get_logged_query(
+            models.Ingredient.objects.filter(is_spices=True)
+        )
+        del query["params"]
+
+        recommendations = advise_indexes([query], min_rows=0)
+
+        self.assertEqual(
+            [recommendation.columns for recommendation in recommendations],
+            [("is_spices",)]
+        )
+
+    def test_skip_indexed_and_small_tables(self):
+        """Test indexed lookups and small tables are not recommended"""
+        indexed = get_logged_query(
+            models.RecipeCart.objects.filter(user_id=1, date="2022-03-01")
+        )
+        small = get_logged_query(
+            models.Ingredient.objects.filter(is_spices=True)
+        )
+
+        self.assertEqual(advise_indexes([indexed], min_rows=0), [])
+        self.assertEqual(advise_indexes([small], min_rows=1000), [])
+
+    def test_command(self):
+        """Test the command reads the log files"""
+        query = get_logged_query(
+            models.Ingredient.objects.filter(is_spices=True)
+        )
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "perf.log")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(json.dumps({"slow_queries": [query]}) + "\n")
+            call_command(
+                "advise_indexes",
+                path,
+                min_rows=0,
+                json=True,
+                stdout=out
+            )
+
+        result = json.loads(out.getvalue())
+        self.assertEqual(result[0]["columns"], ["is_spices"])
+        self.assertIn("models.Index", result[0]["definition"])
@@ -0,0 +1,123 @@
+"""
+Test the request instrumentation middleware
+"""
+import json
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from app import settings
+from app_auth import auth_service
+from core import models
+from core.middleware import RequestMetrics, get_fingerprint
+from core.tests.test_model_recipe import create_unit
+from recipe.tests.test_views_user import setup_login
+
+
+URL_UNIT = "/api/v1/unit/"
+URL_RECIPE = "/api/v1/recipe/"
+URL_REFRESH = "/api/v1/token/refresh/"
+
+
+class RequestMetricsTests(TestCase):
+    """Test collecting the query metrics"""
+
+    def test_fingerprint(self):
+        """Test IN lists of any length share one fingerprint"""
+        self.assertEqual(
+            get_fingerprint('SELECT 1 WHERE "id" IN (%s, %s, %s)'),
+            get_fingerprint('SELECT 1 WHERE "id" IN (%s)')
+        )
+
+    def test_duplicates(self):
+        """Test counting queries and detecting duplicated queries"""
+        units = [create_unit(f"metrics_unit{i}") for i in range(3)]
+        metrics = RequestMetrics()
+
+        with connection.execute_wrapper(metrics):
+            for unit in units:
+                models.Unit.objects.get(id=unit.id)
+            models.Tag.objects.count()
+
+        self.assertEqual(metrics.query_count, 4)
+        self.assertGreater(metrics.sql_time, 0)
+        self.assertEqual(list(metrics.duplicates.values()), [3])
+        stack = list(metrics.stacks.values())[0]
+        self.assertTrue(any("test_duplicates" in frame for frame in stack))
+
+
+class QueryMetricsMiddlewareTests(TestCase):
+    """Test the Server-Timing header and the log line"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+
+    def test_server_timing(self):
+        """Test the metrics are sent as Server-Timing header"""
+        res = self.client.get(URL_UNIT)
+
+        timing = res["Server-Timing"]
+        for metric in ["db;dur=", "dup;", "app;dur=", "render;dur=", "total"]:
+            self.assertIn(metric, timing)
+
+    @patch.object(settings, "PERF_QUERY_COUNT_THRESHOLD", 1)
+    def test_log_slow_request(self):
+        """Test requests above the thresholds are logged as warning"""
+        with self.assertLogs("core.middleware", "WARNING") as logs:
+            self.client.get(URL_RECIPE)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["path"], URL_RECIPE)
+        self.assertEqual(record["view"], "recipe-list")
+        self.assertGreaterEqual(record["queries"], 1)
+        self.assertIn("duplicates", record)
+        self.assertLessEqual(len(record["slow_queries"]), 5)
+        self.assertNotIn("params", record["slow_queries"][0])
+
+    @patch.object(settings, "PERF_QUERY_COUNT_THRESHOLD", 1)
+    @patch.object(settings, "PERF_LOG_QUERY_PARAMS", True)
+    def test_log_query_params_opt_in(self):
+        """Test the query parameters are only logged on opt-in"""
+        with self.assertLogs("core.middleware", "WARNING") as logs:
+            self.client.get(URL_RECIPE)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertIn("params", record["slow_queries"][0])
+
+    @patch.object(settings, "PERF_QUERY_COUNT_THRESHOLD", 1)
+    async def test_async_queries(self):
+        """Test the queries of a sync view under ASGI are recorded"""
+        token = auth_service._create_access_refresh_token(
+            self.user.id,
+            self.user.is_staff
+        )["token"]
+        with self.assertLogs("core.middleware", "WARNING") as logs:
+            res = await self.async_client.get(
+                URL_RECIPE,
+                authorization=f"Bearer {token}"
+            )
+
+        self.assertIn("db;dur=", res["Server-Timing"])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "recipe-list")
+        self.assertGreaterEqual(record["queries"], 1)
+        self.assertIn("sql_ms", record)
+
+    def test_log_view_name(self):
+        """Test the log line names the endpoint of the request"""
+        with self.assertLogs("core.middleware", "INFO") as logs:
+            self.client.post(URL_REFRESH, {"refresh_token": "invalid"})
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "token-refresh")
+
+    @patch.object(settings, "PERF_INSTRUMENTATION", False)
+    def test_disabled(self):
+        """Test the instrumentation can be switched off"""
+        res = self.client.get(URL_UNIT)
+
+        self.assertFalse(res.has_header("Server-Timing"))
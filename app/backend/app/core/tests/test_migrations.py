@@ -0,0 +1,23 @@
+"""
+Test the migrations are in sync with the models
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class MigrationTests(TestCase):
+    """Test the schema changes ship as migrations"""
+
+    def test_no_missing_migrations(self):
+        """Test every model change has its migration"""
+        try:
+            call_command(
+                "makemigrations",
+                "--check",
+                "--dry-run",
+                stdout=StringIO()
+            )
+        except SystemExit:
+            self.fail("Model changes without migration, run makemigrations.")
@@ -0,0 +1,219 @@
+"""
+Test the token bucket rate limiting
+"""
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from app import settings
+from app_auth import auth_service
+from app_auth.authentication import JWTAuthentication, token_cache
+from core import rate_limit
+from core.benchmark import measure_rate_limit_overhead
+from core.tests.test_model_user import create_user
+
+
+URL_LOGIN = "/api/v1/token/"
+URL_ASYNC_LOGIN = "/api/v1/async/token/"
+GROUPS = {
+    "auth": {
+        "prefixes": ["/api/v1/token/", "/api/v1/async/token/"],
+        "methods": ["POST"],
+        "rate": "2/min",
+    },
+    "write": {
+        "prefixes": ["/api/v1/"],
+        "methods": ["POST", "PUT", "PATCH", "DELETE"],
+        "rate": "3/min",
+    },
+}
+# microbenchmark budget per request
+MAX_OVERHEAD_US = 20
+
+
+class TokenBucketTests(TestCase):
+    """Test the in-process and shared buckets"""
+
+    def test_parse_rate(self):
+        """Test parsing '<requests>/<period>'"""
+        self.assertEqual(rate_limit.parse_rate("30/min"), (30, 0.5))
+        self.assertEqual(rate_limit.parse_rate("10/s"), (10, 10.0))
+
+    def test_burst_and_refill(self):
+        """Test the capacity is a burst, then tokens refill at the rate"""
+        buckets = rate_limit.TokenBuckets(2, 1.0, 100)
+
+        self.assertEqual(buckets.acquire("a", 0.0), 0.0)
+        self.assertEqual(buckets.acquire("a", 0.0), 0.0)
+        self.assertAlmostEqual(buckets.acquire("a", 0.25), 0.75)
+        self.assertEqual(buckets.acquire("b", 0.25), 0.0)
+        self.assertEqual(buckets.acquire("a", 1.0), 0.0)
+
+    def test_max_keys(self):
+        """Test the buckets of idle clients are evicted"""
+        buckets = rate_limit.TokenBuckets(2, 1.0, 10)
+        for i in range(100):
+            buckets.acquire(f"ip{i}", float(i))
+
+        self.assertLessEqual(len(buckets._buckets), 10)
+
+    def test_shared_windows(self):
+        """Test the workers share the counter of the window"""
+        caches["default"].clear()
+        worker1 = rate_limit.SharedWindows(2, 1.0, "default")
+        worker2 = rate_limit.SharedWindows(2, 1.0, "default")
+
+        self.assertEqual(worker1.acquire("a", 100.5), 0.0)
+        self.assertEqual(worker2.acquire("a", 100.5), 0.0)
+        self.assertEqual(worker1.acquire("a", 101.0), 1.0)
+        self.assertEqual(worker2.acquire("a", 102.0), 0.0)
+
+
+class RateLimitMiddlewareTests(TestCase):
+    """Test throttled requests get 429 with Retry-After"""
+
+    def setUp(self):
+        self.limiter = rate_limit.RateLimiter(GROUPS)
+        for patcher in [
+            patch.object(settings, "RATE_LIMIT_ENABLED", True),
+            patch.object(rate_limit, "rate_limiter", self.limiter),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def login(self):
+        return self.client.post(
+            URL_LOGIN,
+            {"username": "notExisting", "password": "secretPW"}
+        )
+
+    def test_auth_throttled(self):
+        """Test the login of a client retrying in a loop is throttled"""
+        responses = [self.login() for _ in range(3)]
+
+        self.assertEqual(responses[0].status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(responses[1].status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(
+            responses[2].status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(responses[2]["Retry-After"], "30")
+
+    def test_key_by_ip(self):
+        """Test the buckets of other IPs are not affected"""
+        for _ in range(3):
+            self.login()
+
+        res = self.client.post(
+            URL_LOGIN,
+            {"username": "notExisting", "password": "secretPW"},
+            REMOTE_ADDR="10.0.0.2"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_key_by_user(self):
+        """Test the write bucket is per user of a verified token"""
+        tokens = []
+        for username in ["limited_user1", "limited_user2"]:
+            user = create_user(username=username)
+            tokens.append(auth_service._create_access_refresh_token(
+                user.id,
+                user.is_staff
+            )["token"])
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=tokens[0])
+        JWTAuthentication().authenticate(request)
+
+        request = RequestFactory().post(
+            "/api/v1/recipe/",
+            HTTP_AUTHORIZATION=f"Bearer {tokens[0]}"
+        )
+        self.assertRegex(rate_limit.get_client_key(request), r"^user:\d+$")
+        for _ in range(3):
+            self.assertEqual(self.limiter.check(request), 0.0)
+        self.assertGreater(self.limiter.check(request), 0)
+
+        # an unverified token is keyed by IP
+        request = RequestFactory().post(
+            "/api/v1/recipe/",
+            HTTP_AUTHORIZATION=f"Bearer {tokens[1]}"
+        )
+        self.assertEqual(rate_limit.get_client_key(request), "ip:127.0.0.1")
+        self.assertEqual(self.limiter.check(request), 0.0)
+
+    def test_reads_not_limited(self):
+        """Test requests outside of the groups are not limited"""
+        request = RequestFactory().get("/api/v1/recipe/")
+        for _ in range(10):
+            self.assertEqual(self.limiter.check(request), 0.0)
+
+    def test_shared_store(self):
+        """Test the shared store limits across the workers"""
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        workers = [
+            rate_limit.RateLimiter(
+                GROUPS,
+                "shared",
+                cache_alias=settings.RESPONSE_CACHE_ALIAS
+            )
+            for _ in range(2)
+        ]
+        request = RequestFactory().post(URL_LOGIN)
+
+        self.assertEqual(workers[0].check(request), 0.0)
+        self.assertEqual(workers[1].check(request), 0.0)
+        self.assertGreater(workers[0].check(request), 0)
+
+    async def test_async_throttled(self):
+        """Test the async login is throttled"""
+        responses = [
+            await self.async_client.post(
+                URL_ASYNC_LOGIN,
+                {"username": "notExisting", "password": "secretPW"}
+            )
+            for _ in range(3)
+        ]
+
+        self.assertEqual(responses[1].status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(
+            responses[2].status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", responses[2])
+
+    def test_overhead(self):
+        """Test a check costs less than the microbenchmark budget"""
+        token_cache.clear()
+        user = create_user(username="bench_user")
+        token = auth_service._create_access_refresh_token(
+            user.id,
+            user.is_staff
+        )["token"]
+        JWTAuthentication().authenticate(
+            RequestFactory().get("/", HTTP_AUTHORIZATION=token)
+        )
+        limiter = rate_limit.RateLimiter(
+            {group: values | {"rate": "1000000/s"}
+             for group, values in GROUPS.items()},
+            max_keys=100000
+        )
+        factory = RequestFactory()
+        requests = [
+            factory.post(URL_LOGIN, REMOTE_ADDR=f"10.0.{i // 256}.{i % 256}")
+            for i in range(1000)
+        ] + [
+            factory.patch(
+                "/api/v1/recipe/1/",
+                HTTP_AUTHORIZATION=f"Bearer {token}"
+            ),
+            factory.get("/api/v1/recipe/"),
+        ]
+
+        overhead_us = measure_rate_limit_overhead(limiter, requests, 20000)
+
+        self.assertLess(overhead_us, MAX_OVERHEAD_US)
@@ -0,0 +1,90 @@
+"""
+Test the denormalized recipe rating aggregates
+"""
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core import models
+from core.tests.test_model_user import create_user
+from core.tests.test_model_recipe import create_recipe, create_recipe_rating
+
+
+def get_aggregates(recipe: models.Recipe) -> tuple:
+    recipe.refresh_from_db()
+    return recipe.rating_count, recipe.rating_sum, recipe.rating_avg
+
+
+class RecipeRatingAggregateTests(TestCase):
+    """Test maintaining rating_count and rating_avg"""
+
+    def setUp(self):
+        self.user1 = create_user("rating_user1")
+        self.user2 = create_user("rating_user2")
+        self.recipe = create_recipe("rated_recipe", self.user1)
+
+    def test_create_rating(self):
+        """Test creating ratings increments the aggregates"""
+        create_recipe_rating(self.user1, self.recipe, 4.5)
+        create_recipe_rating(self.user2, self.recipe, 3)
+
+        self.assertEqual(
+            get_aggregates(self.recipe),
+            (2, Decimal("7.5"), Decimal("3.75"))
+        )
+
+    def test_update_rating(self):
+        """Test updating a rating applies the difference"""
+        rating = create_recipe_rating(self.user1, self.recipe, 4.5)
+        rating.rating = Decimal("2.0")
+        rating.save()
+
+        self.assertEqual(
+            get_aggregates(self.recipe),
+            (1, Decimal("2.0"), Decimal("2.00"))
+        )
+
+    def test_move_rating(self):
+        """Test moving a rating to another recipe"""
+        recipe2 = create_recipe("rated_recipe2", self.user1)
+        rating = create_recipe_rating(self.user1, self.recipe, 4)
+        rating.recipe = recipe2
+        rating.save()
+
+        self.assertEqual(get_aggregates(self.recipe)[0], 0)
+        self.assertEqual(get_aggregates(recipe2)[2], Decimal("4.00"))
+
+    def test_delete_rating(self):
+        """Test deleting ratings decrements the aggregates"""
+        rating = create_recipe_rating(self.user1, self.recipe, 4.5)
+        create_recipe_rating(self.user2, self.recipe, 3.5)
+        rating.delete()
+        self.assertEqual(
+            get_aggregates(self.recipe),
+            (1, Decimal("3.5"), Decimal("3.50"))
+        )
+
+        models.RecipeRating.objects.all().delete()
+        self.assertEqual(
+            get_aggregates(self.recipe),
+            (0, Decimal("0"), Decimal("0"))
+        )
+
+    def test_rebuild_command(self):
+        """Test rebuilding the aggregates from scratch"""
+        create_recipe_rating(self.user1, self.recipe, 5)
+        create_recipe_rating(self.user2, self.recipe, 4)
+        models.Recipe.objects.update(
+            rating_count=0,
+            rating_sum=0,
+            rating_avg=0
+        )
+
+        call_command("rebuild_recipe_ratings", stdout=StringIO())
+
+        self.assertEqual(
+            get_aggregates(self.recipe),
+            (2, Decimal("9"), Decimal("4.50"))
+        )
@@ -0,0 +1,20 @@
+"""
+Test the startup warm-up
+"""
+from django.test import SimpleTestCase
+
+from app.warmup import warm_up, warm_up_serializers, warm_up_url_conf
+
+
+class WarmUpTests(SimpleTestCase):
+    """Test warming up the application"""
+
+    def test_warm_up(self):
+        """Test the URL conf and the serializers are built"""
+        self.assertGreater(warm_up_url_conf(), 0)
+        self.assertGreater(warm_up_serializers(), 0)
+
+        with self.assertLogs("app.warmup", "INFO") as logs:
+            warm_up()
+
+        self.assertIn("Warmed up", logs.output[0])
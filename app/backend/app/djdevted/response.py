@@ -59,6 +59,16 @@ def error_403_forbidden(
     )
 
 
+def error_404_not_found(
+    exp: Union[Exception, str]
+) -> Response:
+    """Returns an HTTP-404-NOT-FOUND Response with passed data."""
+    return Response(
+        {"error": str(exp)},
+        status=status.HTTP_404_NOT_FOUND
+    )
+
+
 def error_500_internal_server_error(
     exp: Union[Exception, str, dict]
 ) -> Response:
@@ -1,7 +1,13 @@
 """
 Module for test API-Endpoints
 """
-from typing import Callable, Union, TypeVar
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Union, TypeVar
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.response import Response
@@ -39,6 +45,63 @@ def get_payload_data(
     return serializer.data
 
 
+class QueryBudget:
+    """Measured queries and latency of a budget block"""
+
+    def __init__(self) -> None:
+        self.queries: list[dict] = []
+        self.duration_ms = 0.0
+
+    @property
+    def query_count(self) -> int:
+        return len(self.queries)
+
+
+@contextmanager
+def assert_query_budget(
+    test_case: SimpleTestCase,
+    max_queries: int,
+    max_ms: Union[None, float] = None
+) -> Iterator[QueryBudget]:
+    """
+    Fails the test if the block executes more than max_queries queries
+    or takes longer than max_ms milliseconds
+    """
+    budget = QueryBudget()
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as context:
+        yield budget
+    budget.duration_ms = (time.perf_counter() - start) * 1000
+    budget.queries = context.captured_queries
+
+    sql = "\n".join(query["sql"] for query in budget.queries)
+    test_case.assertLessEqual(
+        budget.query_count,
+        max_queries,
+        f"{budget.query_count} queries > budget {max_queries}:\n{sql}"
+    )
+    if max_ms is not None:
+        test_case.assertLessEqual(
+            budget.duration_ms,
+            max_ms,
+            f"{budget.duration_ms:.1f} ms > budget {max_ms} ms"
+        )
+
+
+def check_query_budget(
+    test_case: SimpleTestCase,
+    client: APIClient,
+    endpoint: str,
+    max_queries: int,
+    max_ms: Union[None, float] = None
+) -> Response:
+    """GETs the endpoint within the query and latency budget"""
+    with assert_query_budget(test_case, max_queries, max_ms):
+        res = client.get(endpoint)
+    test_case.assertEqual(res.status_code, status.HTTP_200_OK)
+    return res
+
+
 class HttpResponseObj:
     """Compare two HTTP Responses"""
     HttpResponseObjClass = TypeVar(
@@ -0,0 +1,37 @@
+"""
+gunicorn configuration of the production profile
+WSGI:  gunicorn -c gunicorn.conf.py app.wsgi
+ASGI:  GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+       gunicorn -c gunicorn.conf.py app.asgi
+The app is loaded (and warmed up, see app/warmup.py) once in the
+master before the workers are forked.
+"""
+import multiprocessing
+import os
+
+
+os.environ.setdefault("DJANGO_ENV", "production")
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+# (2 x CPU) + 1 for blocking workers, one event loop per CPU for ASGI
+is_async = "uvicorn" in worker_class
+cpu_count = multiprocessing.cpu_count()
+workers = int(os.environ.get(
+    "WEB_CONCURRENCY",
+    cpu_count if is_async else cpu_count * 2 + 1
+))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+preload_app = True
+# restart the workers now and then against slow memory growth
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG")
+errorlog = "-"
+
+if is_async:
+    # sync ORM calls of async views run in changing threads, each
+    # holding its own connection: pool with e.g. pgbouncer instead
+    os.environ.setdefault("DB_CONN_MAX_AGE", "0")
@@ -0,0 +1,270 @@
+"""
+Module for the versioned read-through response cache
+A namespace (e.g. a model) has a version counter in the shared cache,
+writes bump the version and all entries of older versions become stale.
+A counter starts at the current time (ns), a counter evicted from the
+cache restarts above every version used before, never at an old one.
+Writes bump after their commit, else a read between the bump and the
+commit would cache the old rows under the new version.
+Entries are held in the process memory and in the shared cache backend.
+The a* methods are the variants for the async views, the shared backend
+(Redis in production) is not called on the event loop.
+"""
+import threading
+import time
+from typing import Any, Callable, Union
+
+from django.core.cache import caches
+from django.db import transaction
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework import status
+
+from djdevted.request import IRequest
+
+from app import settings
+
+
+LOCAL_MAX_ENTRIES = 1000
+
+
+class CachedResponse:
+    """Serialized data with the pre-rendered json bytes"""
+
+    def __init__(self, data: Any, content: bytes, headers: dict) -> None:
+        self.data = data
+        self.content = content
+        self.headers = headers
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CachedResponse":
+        content = JSONRenderer().render(response.data)
+        headers = {
+            key: value for key, value in response.items()
+            if key == "Link"
+        }
+        return cls(response.data, content, headers)
+
+    def to_response(self) -> "PrerenderedResponse":
+        return PrerenderedResponse(
+            self.data,
+            self.content,
+            headers=self.headers
+        )
+
+
+class PrerenderedResponse(Response):
+    """Response, which skips rendering for plain json requests"""
+
+    def __init__(self, data: Any, content: bytes, **kwargs) -> None:
+        super().__init__(data, **kwargs)
+        self.prerendered_content = content
+
+    @property
+    def rendered_content(self):
+        renderer = getattr(self, "accepted_renderer", None)
+        media_type = getattr(self, "accepted_media_type", "")
+        if type(renderer) is not JSONRenderer or "indent" in media_type:
+            return super().rendered_content
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        self["Content-Type"] = content_type
+        return self.prerendered_content
+
+
+class VersionedCache:
+    """Two tier cache (process memory, shared backend) with versions"""
+
+    def __init__(self, alias: str, timeout: int) -> None:
+        self.alias = alias
+        self.timeout = timeout
+        self._local: dict[str, tuple[int, dict]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def get_version(self, namespace: str) -> int:
+        """Returns the current version of the namespace"""
+        return self.shared.get_or_set(
+            self._version_key(namespace),
+            time.time_ns,
+            timeout=None
+        )
+
+    async def aget_version(self, namespace: str) -> int:
+        """Returns the current version of the namespace"""
+        return await self.shared.aget_or_set(
+            self._version_key(namespace),
+            time.time_ns,
+            timeout=None
+        )
+
+    def bump_version(self, namespace: str) -> None:
+        """Invalidates all entries of the namespace"""
+        key = self._version_key(namespace)
+        try:
+            self.shared.incr(key)
+        except ValueError:
+            self.shared.set(key, time.time_ns(), timeout=None)
+
+    def bump_version_on_commit(self, namespace: str) -> None:
+        """
+        Invalidates all entries of the namespace after the commit,
+        within a transaction also now (for the reads of the writer)
+        """
+        if transaction.get_connection().in_atomic_block:
+            self.bump_version(namespace)
+        transaction.on_commit(lambda: self.bump_version(namespace))
+
+    def get(self, namespace: str, version: int, key: str) -> Any:
+        """Returns the cached value or None"""
+        value = self._get_local(namespace, version, key)
+        if value is not None:
+            return value
+
+        value = self.shared.get(self._entry_key(namespace, version, key))
+        if value is not None:
+            self._set_local(namespace, version, key, value)
+        return value
+
+    async def aget(self, namespace: str, version: int, key: str) -> Any:
+        """Returns the cached value or None"""
+        value = self._get_local(namespace, version, key)
+        if value is not None:
+            return value
+
+        value = await self.shared.aget(
+            self._entry_key(namespace, version, key)
+        )
+        if value is not None:
+            self._set_local(namespace, version, key, value)
+        return value
+
+    def set(self, namespace: str, version: int, key: str, value) -> None:
+        """Caches the value for the version of the namespace"""
+        self._set_local(namespace, version, key, value)
+        self.shared.set(
+            self._entry_key(namespace, version, key),
+            value,
+            timeout=self.timeout
+        )
+
+    async def aset(
+        self,
+        namespace: str,
+        version: int,
+        key: str,
+        value
+    ) -> None:
+        """Caches the value for the version of the namespace"""
+        self._set_local(namespace, version, key, value)
+        await self.shared.aset(
+            self._entry_key(namespace, version, key),
+            value,
+            timeout=self.timeout
+        )
+
+    def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        default: Callable[[], Any]
+    ) -> Any:
+        """Returns the cached value or caches the value of default()"""
+        version = self.get_version(namespace)
+        value = self.get(namespace, version, key)
+        if value is None:
+            value = default()
+            self.set(namespace, version, key, value)
+        return value
+
+    def clear_local(self) -> None:
+        """Removes all entries of the process memory"""
+        with self._lock:
+            self._local.clear()
+
+    def _get_local(self, namespace: str, version: int, key: str) -> Any:
+        with self._lock:
+            local_version, entries = self._local.get(namespace, (0, {}))
+            if local_version == version:
+                return entries.get(key)
+            return None
+
+    def _set_local(self, namespace: str, version: int, key: str, value):
+        with self._lock:
+            local_version, entries = self._local.get(namespace, (0, {}))
+            if local_version != version or \
+                    len(entries) >= LOCAL_MAX_ENTRIES:
+                entries = {}
+            entries[key] = value
+            self._local[namespace] = (version, entries)
+
+    @staticmethod
+    def _version_key(namespace: str) -> str:
+        return f"version:{namespace}"
+
+    @staticmethod
+    def _entry_key(namespace: str, version: int, key: str) -> str:
+        return f"entry:{namespace}:{version}:{key}"
+
+
+versioned_cache = VersionedCache(
+    settings.RESPONSE_CACHE_ALIAS,
+    settings.RESPONSE_CACHE_TIMEOUT
+)
+
+
+def get_model_namespace(model) -> str:
+    """Returns the cache namespace of a model"""
+    return model._meta.label_lower
+
+
+class ReferenceCacheMixin:
+    """
+    Serves list and retrieve of small, read-mostly tables
+    from the versioned cache, invalidated by model signals
+    """
+
+    def list(self, request: IRequest, *args, **kwargs) -> Response:
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: IRequest, *args, **kwargs) -> Response:
+        return self.cached_response(
+            super().retrieve,
+            request,
+            *args,
+            **kwargs
+        )
+
+    def cached_response(
+        self,
+        view_func: Callable,
+        request: IRequest,
+        *args,
+        **kwargs
+    ) -> Response:
+        """Returns the cached response or caches the successful response"""
+        namespace = get_model_namespace(self.queryset.model)
+        version = versioned_cache.get_version(namespace)
+        key = f"{self.action}:{request.get_full_path()}"
+
+        cached: Union[None, CachedResponse] = versioned_cache.get(
+            namespace,
+            version,
+            key
+        )
+        if cached is not None:
+            return cached.to_response()
+
+        response = view_func(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        cached = CachedResponse.from_response(response)
+        versioned_cache.set(namespace, version, key, cached)
+        return cached.to_response()
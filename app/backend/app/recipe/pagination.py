@@ -0,0 +1,59 @@
+"""
+Module for keyset (cursor) pagination of the list endpoints
+"""
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from app import settings
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination with a stable ordering on the primary key.
+    Each page is fetched with 'WHERE id > <cursor> LIMIT <size>',
+    so the cost of a page does not depend on the table size.
+    The body stays a plain list, the opaque cursors of the
+    next and previous page are passed in the 'Link' header.
+    Opt-in: only requests with ?cursor= or ?page_size= are paginated,
+    clients not following the 'Link' header get the full list.
+    """
+    ordering = "id"
+    cursor_query_param = "cursor"
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    is_paginated = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.is_paginated = self.is_requested(request)
+        if not self.is_paginated:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def is_requested(self, request) -> bool:
+        """Returns whether the client asked for a page"""
+        params = request.query_params
+        return self.cursor_query_param in params or \
+            self.page_size_query_param in params
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(data, headers=self.get_link_header())
+
+    def get_link_header(self) -> dict:
+        """Returns the 'Link' header of the current page"""
+        if not self.is_paginated:
+            return {}
+        links = []
+        next_link = self.get_next_link()
+        previous_link = self.get_previous_link()
+        if next_link:
+            links.append(f'<{next_link}>; rel="next"')
+        if previous_link:
+            links.append(f'<{previous_link}>; rel="prev"')
+
+        if not links:
+            return {}
+        return {"Link": ", ".join(links)}
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return schema
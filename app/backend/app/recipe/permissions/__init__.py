@@ -5,7 +5,16 @@ from .general import (
 )
 from .recipe import (
     IsRecipeOwnerOrIsStaff,
+    IsWatchlistOwnerOrIsStaff,
 )
 from .cart import (
     IsCartOwnerOrIsStaff
-)
\ No newline at end of file
+)
+from .ownership import (
+    OWNER_PATHS,
+    OwnerPath,
+    IsParentOwnerOrIsStaff,
+    check_parent_owners,
+    get_owner_path,
+    resolve_owner_id,
+)
@@ -0,0 +1,140 @@
+"""
+Resolves the owner of child rows (e.g. a recipe ingredient)
+with a single values_list query per request
+"""
+from typing import Any, Callable, NamedTuple, Type, Union
+
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.db.models import Model
+
+from djdevted import response as res
+from djdevted.exceptions import FieldRequiredError
+from djdevted.request import IRequest
+
+from core import models
+
+
+class OwnerPath(NamedTuple):
+    """Path from the rows of a route to the owning user id"""
+    model: Type[Model]
+    parent_field: str
+    parent_model: Type[Model]
+
+    @property
+    def owner_lookup(self) -> str:
+        """Lookup from a row of the route to the owner id"""
+        return f"{self.parent_field}__user_id"
+
+
+# route prefix -> owner path
+OWNER_PATHS: dict[str, OwnerPath] = {
+    "recipe-ingredient": OwnerPath(
+        models.RecipeIngredient, "recipe", models.Recipe
+    ),
+    "recipe-tag": OwnerPath(
+        models.RecipeTag, "recipe", models.Recipe
+    ),
+    "recipe-watchlist": OwnerPath(
+        models.RecipeWatchlist, "watchlist", models.Watchlist
+    ),
+    "recipe-cart-ingredient": OwnerPath(
+        models.RecipeCartIngredient, "shopping_cart_recipe", models.RecipeCart
+    ),
+}
+
+
+def IsParentOwnerOrIsStaff(err_msg: str) -> Callable[[Callable], Callable]:
+    """
+    Permission decorator factory
+    Checks whether the user owns the parent row or is staff
+    Staff users are passed without any query
+    """
+    def decorator(func: Callable) -> Callable:
+        def wrapper(view: Any, request: IRequest, *args, **kwargs):
+            if request.user.is_staff:
+                return func(view, request, *args, **kwargs)
+            try:
+                owner_id = resolve_owner_id(request, kwargs.get("pk"))
+                if owner_id == request.user.id:
+                    return func(view, request, *args, **kwargs)
+
+                return res.error_403_forbidden(err_msg)
+            except (ObjectDoesNotExist, FieldRequiredError, ValueError) as exp:
+                return res.error_400_bad_request(exp)
+            except Exception as exp:
+                return res.error_500_internal_server_error(exp)
+        return wrapper
+    return decorator
+
+
+def resolve_owner_id(
+    request: IRequest,
+    pk: Union[None, int, str] = None
+) -> Union[None, int]:
+    """
+    Returns the owner user id of the requested row,
+    on create of the posted parent row
+    Raises FieldRequiredError
+    Raises ObjectDoesNotExist
+    Raises ValueError
+    Raises NotImplementedError
+    """
+    owner_path = get_owner_path(request)
+    if request.method == "POST":
+        parent_id = request.data.get(owner_path.parent_field)
+        if not parent_id:
+            err_msg = f"The field '{owner_path.parent_field}' is required."
+            raise FieldRequiredError(err_msg)
+        return get_parent_owner_id(owner_path, int(parent_id))
+
+    return owner_path.model.objects.values_list(
+        owner_path.owner_lookup,
+        flat=True
+    ).get(id=pk)
+
+
+def get_parent_owner_id(owner_path: OwnerPath, parent_id: int):
+    """
+    Returns the owner user id of a parent row
+    Raises ObjectDoesNotExist
+    """
+    return owner_path.parent_model.objects.values_list(
+        "user_id",
+        flat=True
+    ).get(id=parent_id)
+
+
+def check_parent_owners(
+    owner_path: OwnerPath,
+    parent_ids: set,
+    user_id: int
+) -> None:
+    """
+    Checks with one query whether the user owns all parent rows
+    Raises ObjectDoesNotExist
+    Raises PermissionDenied
+    """
+    owner_ids = dict(owner_path.parent_model.objects.filter(
+        id__in=parent_ids
+    ).values_list("id", "user_id"))
+
+    missing_ids = parent_ids - owner_ids.keys()
+    if missing_ids:
+        parent_name = owner_path.parent_model.__name__
+        err_msg = f"{parent_name} {sorted(missing_ids)} does not exist."
+        raise ObjectDoesNotExist(err_msg)
+    if any(owner_id != user_id for owner_id in owner_ids.values()):
+        raise PermissionDenied(
+            f"Only the owner can modify the {owner_path.parent_field} rows."
+        )
+
+
+def get_owner_path(request: IRequest) -> OwnerPath:
+    """
+    Returns the owner path registered for the route of the request
+    Raises NotImplementedError
+    """
+    for segment in request.path.strip("/").split("/"):
+        if segment in OWNER_PATHS:
+            return OWNER_PATHS[segment]
+    raise NotImplementedError(f"No owner path for '{request.path}'.")
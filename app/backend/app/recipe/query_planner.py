@@ -0,0 +1,115 @@
+"""
+Module for planning the select_related/prefetch_related chain
+of a queryset from the nested fields of a serializer
+"""
+from functools import lru_cache
+from typing import Type
+
+from django.db.models import Model, QuerySet
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor,
+    ReverseOneToOneDescriptor,
+    ReverseManyToOneDescriptor,
+    ManyToManyDescriptor,
+)
+
+from rest_framework.relations import ManyRelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+class QueryPlan:
+    """Related lookups needed to serialize a queryset"""
+
+    def __init__(self) -> None:
+        self.select_related: list[str] = []
+        self.prefetch_related: list[str] = []
+
+    def __str__(self) -> str:
+        return f"select: {self.select_related} | " + \
+               f"prefetch: {self.prefetch_related}"
+
+
+def plan_queryset(
+    queryset: QuerySet,
+    serializer_class: Type[BaseSerializer]
+) -> QuerySet:
+    """
+    Returns the queryset joined with every relation
+    the serializer renders as nested object
+    """
+    plan = get_query_plan(serializer_class)
+    if plan.select_related:
+        queryset = queryset.select_related(*plan.select_related)
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*plan.prefetch_related)
+    return queryset
+
+
+@lru_cache(maxsize=None)
+def get_query_plan(serializer_class: Type[BaseSerializer]) -> QueryPlan:
+    """
+    Inspects the (nested) serializer fields once per serializer class
+    To-one relations are joined, to-many relations are prefetched
+    """
+    plan = QueryPlan()
+    model = _get_model(serializer_class)
+    if model is not None:
+        _plan_fields(serializer_class(), model, "", False, plan)
+    return plan
+
+
+def _plan_fields(
+    serializer: BaseSerializer,
+    model: Type[Model],
+    prefix: str,
+    is_prefetched: bool,
+    plan: QueryPlan
+) -> None:
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*" or "." in field.source:
+            continue
+
+        descriptor = getattr(model, field.source, None)
+        path = f"{prefix}{field.source}"
+
+        if isinstance(field, ManyRelatedField):
+            if _is_to_many(descriptor):
+                plan.prefetch_related.append(path)
+            continue
+
+        if not isinstance(field, BaseSerializer):
+            continue
+
+        nested = field.child if isinstance(field, ListSerializer) else field
+        nested_model = _get_model(type(nested))
+        if nested_model is None:
+            continue
+
+        if _is_to_one(descriptor):
+            lookups = plan.prefetch_related if is_prefetched \
+                else plan.select_related
+            lookups.append(path)
+            _plan_fields(nested, nested_model, f"{path}__",
+                         is_prefetched, plan)
+        elif _is_to_many(descriptor):
+            plan.prefetch_related.append(path)
+            _plan_fields(nested, nested_model, f"{path}__", True, plan)
+
+
+def _is_to_one(descriptor) -> bool:
+    return isinstance(
+        descriptor,
+        (ForwardManyToOneDescriptor, ReverseOneToOneDescriptor)
+    )
+
+
+def _is_to_many(descriptor) -> bool:
+    return isinstance(
+        descriptor,
+        (ReverseManyToOneDescriptor, ManyToManyDescriptor)
+    )
+
+
+def _get_model(serializer_class: Type[BaseSerializer]):
+    meta = getattr(serializer_class, "Meta", None)
+    return getattr(meta, "model", None)
@@ -9,6 +9,8 @@ from .recipe import (
     IngredientDetailSerializer,
     IngredientSerializer,
     RecipeDataSerializer,
+    RecipeImageSerializer,
+    RecipeUserStateSerializer,
     RecipeDetailSerializer,
     RecipeFavoriteSerializer,
     RecipeIngredientDetailSerializer,
@@ -17,6 +19,7 @@ from .recipe import (
     RecipeRatingSerializer,
     RecipeTagDetailsSerializer,
     RecipeWatchlistSerializer,
+    UserWatchlistSerializer,
     WatchlistSerializer
 )
 
@@ -35,6 +38,12 @@ from .food_shop import (
 
 from .cart import (
     DayTimeSerializer,
+    RecipeCartDetailSerializer,
+    RecipeCartIngredientDetailSerializer,
     RecipeCartIngredientSerializer,
-    RecipeCartSerializer
+    RecipeCartSerializer,
+    ShoppingListQuerySerializer,
+    ShoppingListSerializer,
+    StoreWalkSerializer,
+    UserCartSerializer,
 )
\ No newline at end of file
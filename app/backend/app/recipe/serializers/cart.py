@@ -1,7 +1,18 @@
 """
 Cart model serializers
 """
-from rest_framework.serializers import ModelSerializer
+from datetime import date, timedelta
+
+from rest_framework.serializers import (
+    BooleanField,
+    CharField,
+    DateField,
+    DecimalField,
+    IntegerField,
+    ModelSerializer,
+    Serializer,
+    ValidationError,
+)
 
 from core import models
 from recipe import serializers
@@ -37,7 +48,7 @@ class RecipeCartSerializer(ModelSerializer):
 class RecipeCartDetailSerializer(RecipeCartSerializer):
     """Serialize recipe cart model"""
     user = serializers.UserGetSerializer(many=False)
-    day_time = DayTimeSerializer
+    day_time = DayTimeSerializer(many=False)
     food_shop = serializers.FoodShopSerializer(many=False)
 
 
@@ -58,5 +69,95 @@ class RecipeCartIngredientSerializer(ModelSerializer):
 
 class RecipeCartIngredientDetailSerializer(RecipeCartIngredientSerializer):
     """Serialize recipe cart ingredient model"""
-    shopping_cart_recipe = RecipeCartSerializer
-    ingredient = serializers.IngredientSerializer
+    shopping_cart_recipe = RecipeCartSerializer(many=False)
+    ingredient = serializers.IngredientDetailSerializer(many=False)
+
+
+class UserCartIngredientSerializer(ModelSerializer):
+    """Serialize the ingredient rows of a user cart"""
+    ingredient = serializers.IngredientDetailSerializer(many=False)
+
+    class Meta:
+        model = models.RecipeCartIngredient
+        fields = ["id", "ingredient", "buy_unit_quantity", "is_done"]
+
+
+class UserCartSerializer(RecipeCartSerializer):
+    """Serialize recipe cart model with day time, shop and ingredients"""
+    day_time = DayTimeSerializer(many=False)
+    food_shop = serializers.FoodShopSerializer(many=False)
+    ingredients = UserCartIngredientSerializer(
+        source="recipecartingredient_set",
+        many=True
+    )
+
+    class Meta(RecipeCartSerializer.Meta):
+        fields = RecipeCartSerializer.Meta.fields + ["ingredients"]
+
+
+class ShoppingListQuerySerializer(Serializer):
+    """Validate the shopping list query parameters"""
+    date_from = DateField(required=False)
+    date_to = DateField(required=False)
+    food_shop = IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs: dict) -> dict:
+        date_from = attrs.get("date_from", date.today())
+        attrs["date_from"] = date_from
+        attrs.setdefault("date_to", date_from + timedelta(days=6))
+        if attrs["date_to"] < date_from:
+            raise ValidationError("'date_to' is before 'date_from'.")
+        return attrs
+
+
+class ShoppingListItemSerializer(Serializer):
+    """Serialize an aggregated shopping list ingredient"""
+    ingredient = IntegerField(source="ingredient_id")
+    ingredient_display_name = CharField(
+        source="ingredient__ingredient_display_name"
+    )
+    quantity_per_unit = DecimalField(
+        source="ingredient__quantity_per_unit",
+        max_digits=9,
+        decimal_places=2
+    )
+    unit_name = CharField(source="ingredient__unit__unit_name", default=None)
+    buy_unit_quantity = IntegerField(source="quantity")
+    open_quantity = IntegerField()
+    is_done = BooleanField()
+    unit_price = DecimalField(max_digits=7, decimal_places=2)
+    total_price = DecimalField(max_digits=12, decimal_places=2)
+    open_price = DecimalField(max_digits=12, decimal_places=2)
+
+
+class ShoppingListSerializer(Serializer):
+    """Serialize the aggregated shopping list"""
+    date_from = DateField()
+    date_to = DateField()
+    food_shop = IntegerField(allow_null=True)
+    items = ShoppingListItemSerializer(many=True)
+    total_price = DecimalField(max_digits=12, decimal_places=2)
+    open_price = DecimalField(max_digits=12, decimal_places=2)
+
+
+class StoreWalkAreaPartSerializer(Serializer):
+    """Serialize an area part of the store walk"""
+    area_part_id = IntegerField()
+    area_part_name = CharField()
+    area_part_order_number = IntegerField()
+    items = ShoppingListItemSerializer(many=True)
+
+
+class StoreWalkAreaSerializer(Serializer):
+    """Serialize an area of the store walk"""
+    area_id = IntegerField()
+    area_name = CharField()
+    area_order_number = IntegerField()
+    parts = StoreWalkAreaPartSerializer(many=True)
+
+
+class StoreWalkSerializer(ShoppingListSerializer):
+    """Serialize the shopping list in walking order of the food shop"""
+    items = None
+    areas = StoreWalkAreaSerializer(many=True)
+    unassigned = ShoppingListItemSerializer(many=True)
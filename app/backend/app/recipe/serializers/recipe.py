@@ -1,7 +1,16 @@
 """
 Recipe model serializers
 """
-from rest_framework.serializers import ModelSerializer
+from decimal import Decimal
+
+from rest_framework.serializers import (
+    BooleanField,
+    CharField,
+    DecimalField,
+    IntegerField,
+    ModelSerializer,
+    Serializer,
+)
 
 from core import models
 from recipe.serializers import UserGetSerializer
@@ -57,12 +66,20 @@ class IngredientDetailSerializer(IngredientSerializer):
 
 class RecipeSerializer(ModelSerializer):
     """Serialize recipe model"""
+    rating_avg = DecimalField(
+        max_digits=3,
+        decimal_places=2,
+        read_only=True,
+        default=Decimal(0)
+    )
+    rating_count = IntegerField(read_only=True, default=0)
 
     class Meta:
         model = models.Recipe
         fields = [
             "id", "recipe_name", "user", "person_count",
-            "prep_description", "cooking_duration_min"
+            "prep_description", "cooking_duration_min",
+            "rating_avg", "rating_count"
         ]
         read_only_fields = ["id"]
         extra_kwargs = {
@@ -138,8 +155,9 @@ class RecipeTagSerializer(ModelSerializer):
         read_only_fields = ["id"]
 
 
-class RecipeTagDetailsSerializer(ModelSerializer):
+class RecipeTagDetailsSerializer(RecipeTagSerializer):
     """Serialize recipe tag model with details"""
+    recipe = RecipeDetailSerializer(many=False)
     tag = TagSerializer(many=False)
 
 
@@ -163,24 +181,70 @@ class RecipeWatchlistSerializer(ModelSerializer):
         fields = ["id", "watchlist", "recipe"]
 
 
-"""
-TEST:
-Composite pk Serializer -> inherit from and
-super().__init__(key1="", key2="")
--> set data
-class RecipeDataSerializer(CompositeKeySerializer):
-    def __init__(self):
-        super().__init__(key1="", key2="", ...)
-"""
+class UserWatchlistSerializer(WatchlistSerializer):
+    """Serialize watchlist model with its recipe rows"""
+    recipes = RecipeWatchlistSerializer(
+        source="recipewatchlist_set",
+        many=True
+    )
+
+    class Meta(WatchlistSerializer.Meta):
+        fields = WatchlistSerializer.Meta.fields + ["recipes"]
+
+
+class RecipeImageSerializer(ModelSerializer):
+    """Serialize recipe image model"""
+
+    class Meta:
+        model = models.RecipeImage
+        fields = ["id", "recipe", "image_path"]
+        read_only_fields = ["id"]
 
 
-class RecipeDataSerializer:
-    """TEST: recipe with ingredients"""
+class RecipeDataIngredientSerializer(ModelSerializer):
+    """Serialize the ingredient rows of the recipe document"""
+    ingredient = IngredientDetailSerializer(many=False)
+
+    class Meta:
+        model = models.RecipeIngredient
+        fields = ["id", "ingredient", "unit_quantity"]
+
+
+class RecipeDataTagSerializer(ModelSerializer):
+    """Serialize the tag rows of the recipe document"""
+    tag_name = CharField(source="tag.tag_name")
+
+    class Meta:
+        model = models.RecipeTag
+        fields = ["id", "tag", "tag_name"]
+
+
+class RecipeDataSerializer(RecipeDetailSerializer):
+    """
+    Serialize recipe model with ingredients, tags and images
+    (shared part of the full recipe document)
+    """
+    ingredients = RecipeDataIngredientSerializer(
+        source="recipeingredient_set",
+        many=True
+    )
+    tags = RecipeDataTagSerializer(source="recipetag_set", many=True)
+    images = RecipeImageSerializer(source="recipeimage_set", many=True)
+
+    class Meta(RecipeDetailSerializer.Meta):
+        fields = RecipeDetailSerializer.Meta.fields + [
+            "ingredients", "tags", "images"
+        ]
 
-    def __init__(self, recipe_serializer: RecipeSerializer) -> None:
-        pass
 
-    @property
-    def data(self):
-        """TEST: serialize recipe with ingredients"""
-        pass
+class RecipeUserStateSerializer(Serializer):
+    """Serialize the live rating and the flags of the caller"""
+    rating_avg = DecimalField(max_digits=3, decimal_places=2)
+    rating_count = IntegerField()
+    user_rating = DecimalField(
+        max_digits=2,
+        decimal_places=1,
+        allow_null=True
+    )
+    is_favorite = BooleanField()
+    is_on_watchlist = BooleanField()
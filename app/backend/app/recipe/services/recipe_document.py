@@ -0,0 +1,190 @@
+"""
+Service for the full recipe document
+(recipe, ingredients with units, tags, images, rating and caller flags)
+The shared part is loaded with a fixed number of queries and cached per
+recipe until the recipe or one of its rows changes. The rating aggregate
+and the flags of the caller are read live with one query.
+The a* functions are the async ORM variants for the async views.
+"""
+from typing import Union
+
+from django.db.models import Exists, OuterRef, Prefetch, QuerySet, Subquery
+
+from app import settings
+from core import models
+from recipe import serializers
+from recipe.cache import versioned_cache
+
+
+DOCUMENT_NAMESPACE = "recipe-document"
+
+# rows of a recipe -> invalidate the document of the recipe
+RECIPE_ROW_MODELS = [
+    models.RecipeIngredient,
+    models.RecipeTag,
+    models.RecipeImage,
+]
+# rows shared by many recipes -> invalidate all documents
+SHARED_ROW_MODELS = [
+    models.Ingredient,
+    models.Unit,
+    models.Tag,
+]
+# user fields nested into the documents of the recipes of the user
+DOCUMENT_USER_FIELDS = frozenset(serializers.UserGetSerializer.Meta.fields)
+
+
+def get_user_recipe_ids(user_ids: set) -> list:
+    """Returns the ids of the recipes of the users"""
+    return list(models.Recipe.objects.filter(
+        user_id__in=user_ids
+    ).values_list("id", flat=True))
+
+
+def get_full_recipe(recipe_id: int, user_id: int) -> Union[None, dict]:
+    """Returns the full recipe document for the user or None"""
+    user_state = load_user_state(recipe_id, user_id)
+    if user_state is None:
+        return None
+
+    document = get_recipe_document(recipe_id)
+    state = serializers.RecipeUserStateSerializer(user_state).data
+    return {**document, **state}
+
+
+async def aget_full_recipe(
+    recipe_id: int,
+    user_id: int
+) -> Union[None, dict]:
+    """Returns the full recipe document for the user or None"""
+    user_state = await get_user_state_queryset(recipe_id, user_id).afirst()
+    if user_state is None:
+        return None
+
+    document = await aget_recipe_document(recipe_id)
+    state = serializers.RecipeUserStateSerializer(user_state).data
+    return {**document, **state}
+
+
+def get_recipe_document(recipe_id: int) -> dict:
+    """Returns the (cached) shared part of the recipe document"""
+    if not settings.RECIPE_DOCUMENT_CACHE:
+        return load_recipe_document(recipe_id)
+
+    version, key = get_document_cache_key(recipe_id)
+    document = versioned_cache.get(DOCUMENT_NAMESPACE, version, key)
+    if document is None:
+        document = load_recipe_document(recipe_id)
+        versioned_cache.set(DOCUMENT_NAMESPACE, version, key, document)
+    return document
+
+
+async def aget_recipe_document(recipe_id: int) -> dict:
+    """Returns the (cached) shared part of the recipe document"""
+    if not settings.RECIPE_DOCUMENT_CACHE:
+        return await aload_recipe_document(recipe_id)
+
+    version, key = await aget_document_cache_key(recipe_id)
+    document = await versioned_cache.aget(DOCUMENT_NAMESPACE, version, key)
+    if document is None:
+        document = await aload_recipe_document(recipe_id)
+        await versioned_cache.aset(DOCUMENT_NAMESPACE, version, key, document)
+    return document
+
+
+def get_document_cache_key(recipe_id: int) -> tuple[int, str]:
+    """Returns the namespace version and the key of the document"""
+    version = versioned_cache.get_version(DOCUMENT_NAMESPACE)
+    recipe_version = versioned_cache.get_version(
+        get_document_namespace(recipe_id)
+    )
+    return version, f"{recipe_id}:{recipe_version}"
+
+
+async def aget_document_cache_key(recipe_id: int) -> tuple[int, str]:
+    """Returns the namespace version and the key of the document"""
+    version = await versioned_cache.aget_version(DOCUMENT_NAMESPACE)
+    recipe_version = await versioned_cache.aget_version(
+        get_document_namespace(recipe_id)
+    )
+    return version, f"{recipe_id}:{recipe_version}"
+
+
+def get_document_namespace(recipe_id: int) -> str:
+    """Returns the version namespace of one recipe document"""
+    return f"{DOCUMENT_NAMESPACE}:{recipe_id}"
+
+
+def load_recipe_document(recipe_id: int) -> dict:
+    """
+    Loads the shared part of the recipe document with 4 queries
+    Raises Recipe.DoesNotExist
+    """
+    recipe = get_recipe_document_queryset().get(id=recipe_id)
+    return dict(serializers.RecipeDataSerializer(recipe).data)
+
+
+async def aload_recipe_document(recipe_id: int) -> dict:
+    """
+    Loads the shared part of the recipe document with 4 queries
+    Raises Recipe.DoesNotExist
+    """
+    recipe = await get_recipe_document_queryset().aget(id=recipe_id)
+    return dict(serializers.RecipeDataSerializer(recipe).data)
+
+
+def get_recipe_document_queryset() -> QuerySet:
+    """Recipes joined with every row of the document"""
+    return models.Recipe.objects.select_related("user").prefetch_related(
+        Prefetch(
+            "recipeingredient_set",
+            queryset=models.RecipeIngredient.objects.select_related(
+                "ingredient__unit"
+            ).order_by("id")
+        ),
+        Prefetch(
+            "recipetag_set",
+            queryset=models.RecipeTag.objects.select_related(
+                "tag"
+            ).order_by("id")
+        ),
+        Prefetch(
+            "recipeimage_set",
+            queryset=models.RecipeImage.objects.order_by("id")
+        ),
+    )
+
+
+def load_user_state(recipe_id: int, user_id: int) -> Union[None, dict]:
+    """
+    Loads the rating aggregate and the flags of the user with one query
+    Returns None, if the recipe does not exist
+    """
+    return get_user_state_queryset(recipe_id, user_id).first()
+
+
+def get_user_state_queryset(recipe_id: int, user_id: int) -> QuerySet:
+    """The rating aggregate and the flags of the user as values()"""
+    recipe = OuterRef("id")
+    return models.Recipe.objects.filter(id=recipe_id).annotate(
+        user_rating=Subquery(
+            models.RecipeRating.objects.filter(
+                recipe_id=recipe,
+                user_id=user_id
+            ).values("rating")[:1]
+        ),
+        is_favorite=Exists(models.RecipeFavorite.objects.filter(
+            recipe_id=recipe,
+            user_id=user_id
+        )),
+        is_on_watchlist=Exists(models.RecipeWatchlist.objects.filter(
+            recipe_id=recipe,
+            watchlist__user_id=user_id
+        )),
+    ).values(
+        "rating_avg",
+        "rating_count",
+        "user_rating",
+        "is_favorite",
+        "is_on_watchlist",
+    )
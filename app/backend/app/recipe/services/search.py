@@ -0,0 +1,233 @@
+"""
+Service for the ranked full-text and trigram search
+Postgres: tsvector + pg_trgm, backed by the GIN indexes of the core
+migration 0006_search_indexes
+Other databases (e.g. SQLite test runs): cached pure-python trigram index
+"""
+import re
+from collections import Counter, defaultdict
+from typing import Iterable, NamedTuple, Type
+
+from django.db import connections
+from django.db.models import F, Model, Q, QuerySet
+
+from core import models
+from recipe.cache import versioned_cache, get_model_namespace
+
+
+MIN_SIMILARITY = 0.3
+SEARCH_CONFIG_NAME = "simple"
+
+
+class SearchConfig(NamedTuple):
+    """Searchable fields of a model (ordered by weight)"""
+    vector_fields: tuple
+    trigram_field: str
+    tag_search: bool = False
+
+
+SEARCH_CONFIGS: dict[Type[Model], SearchConfig] = {
+    models.Ingredient: SearchConfig(
+        ("ingredient_name", "ingredient_display_name", "search_description"),
+        "ingredient_display_name"
+    ),
+    models.Recipe: SearchConfig(
+        ("recipe_name", "prep_description"),
+        "recipe_name",
+        tag_search=True
+    ),
+    models.FoodShop: SearchConfig(
+        ("shop_name", "city", "address", "shop_comment"),
+        "shop_name"
+    ),
+}
+
+# models invalidating the fallback index of a searched model
+FALLBACK_DEPENDENCIES: dict[Type[Model], list] = {
+    models.Ingredient: [models.Ingredient],
+    models.Recipe: [models.Recipe, models.RecipeTag, models.Tag],
+    models.FoodShop: [models.FoodShop],
+}
+
+
+def search(queryset: QuerySet, term: str, limit: int) -> list:
+    """
+    Returns the best matching objects of the queryset, best first
+    Raises ValueError
+    """
+    term = term.strip()
+    if not term:
+        raise ValueError("The query parameter 'search' is required.")
+
+    config = SEARCH_CONFIGS[queryset.model]
+    if connections[queryset.db].vendor == "postgresql":
+        return list(_search_postgres(queryset, config, term)[:limit])
+    return _search_fallback(queryset, term, limit)
+
+
+def get_search_namespace(model: Type[Model]) -> str:
+    """Returns the cache namespace of the fallback index"""
+    return f"search:{get_model_namespace(model)}"
+
+
+# ---------- postgres ---------- #
+
+def get_search_vector(config: SearchConfig):
+    """Weighted tsvector expression (shared by query and index)"""
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field, weight in zip(config.vector_fields, "ABCD"):
+        field_vector = SearchVector(
+            field,
+            weight=weight,
+            config=SEARCH_CONFIG_NAME
+        )
+        vector = field_vector if vector is None else vector + field_vector
+    return vector
+
+
+def get_search_indexes(model: Type[Model]) -> list:
+    """GIN indexes of the tsvector and trigram search"""
+    from django.contrib.postgres.indexes import GinIndex
+
+    config = SEARCH_CONFIGS[model]
+    table = model._meta.db_table
+    return [
+        GinIndex(get_search_vector(config), name=f"{table}_search_idx"),
+        GinIndex(
+            fields=[config.trigram_field],
+            opclasses=["gin_trgm_ops"],
+            name=f"{table}_trgm_idx"
+        ),
+    ]
+
+
+def get_tag_search_index():
+    """GIN trigram index of the tags matched by the recipe search"""
+    from django.contrib.postgres.indexes import GinIndex
+
+    return GinIndex(
+        fields=["tag_name"],
+        opclasses=["gin_trgm_ops"],
+        name="tag_trgm_idx"
+    )
+
+
+def _search_postgres(
+    queryset: QuerySet,
+    config: SearchConfig,
+    term: str
+) -> QuerySet:
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+        TrigramSimilarity,
+    )
+
+    query = SearchQuery(
+        term,
+        config=SEARCH_CONFIG_NAME,
+        search_type="websearch"
+    )
+    # only conditions of the GIN indexes (a bitmap OR of index scans),
+    # the word similarity matches a term within longer names
+    trigram_field = config.trigram_field
+    condition = Q(search_vector=query) | \
+        Q(**{f"{trigram_field}__trigram_similar": term}) | \
+        Q(**{f"{trigram_field}__trigram_word_similar": term})
+    if config.tag_search:
+        # few tags match, their recipes are looked up by primary key
+        condition |= Q(pk__in=list(models.RecipeTag.objects.filter(
+            tag__tag_name__trigram_word_similar=term
+        ).values_list("recipe_id", flat=True).distinct()))
+
+    queryset = queryset.annotate(
+        search_vector=get_search_vector(config),
+        rank=SearchRank(F("search_vector"), query) +
+        TrigramSimilarity(trigram_field, term),
+    )
+    return queryset.filter(condition).order_by("-rank", "pk")
+
+
+# ---------- fallback ---------- #
+
+def normalize(text: str) -> str:
+    return " ".join(re.findall(r"\w+", (text or "").lower()))
+
+
+def trigrams(text: str) -> set:
+    """Trigrams of the words, padded like pg_trgm"""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """In-memory inverted trigram index over (pk, text) documents"""
+
+    def __init__(self, documents: Iterable[tuple]) -> None:
+        self.texts: dict = {}
+        self.postings: dict = defaultdict(set)
+        for pk, text in documents:
+            text = normalize(text)
+            self.texts[pk] = text
+            for gram in trigrams(text):
+                self.postings[gram].add(pk)
+
+    def search(self, term: str, limit: int) -> list:
+        """Returns the pks of the best matching documents"""
+        term = normalize(term)
+        grams = trigrams(term)
+        if not grams:
+            return []
+
+        counts: Counter = Counter()
+        for gram in grams:
+            counts.update(self.postings.get(gram, ()))
+
+        scored = []
+        for pk, count in counts.items():
+            similarity = count / len(grams)
+            is_substring = term in self.texts[pk]
+            if similarity >= MIN_SIMILARITY or is_substring:
+                scored.append((-(similarity + is_substring), pk))
+        scored.sort()
+        return [pk for _, pk in scored[:limit]]
+
+
+def get_fallback_index(model: Type[Model]) -> TrigramIndex:
+    """Returns the cached fallback index of the model"""
+    return versioned_cache.get_or_set(
+        get_search_namespace(model),
+        "index",
+        lambda: build_fallback_index(model)
+    )
+
+
+def build_fallback_index(model: Type[Model]) -> TrigramIndex:
+    config = SEARCH_CONFIGS[model]
+    texts: dict = defaultdict(list)
+    rows = model.objects.values_list("pk", *config.vector_fields)
+    for pk, *values in rows:
+        texts[pk] += [value for value in values if value]
+
+    if config.tag_search:
+        tags = models.RecipeTag.objects.values_list(
+            "recipe_id",
+            "tag__tag_name"
+        )
+        for recipe_id, tag_name in tags:
+            texts[recipe_id].append(tag_name)
+
+    return TrigramIndex(
+        (pk, " ".join(values)) for pk, values in texts.items()
+    )
+
+
+def _search_fallback(queryset: QuerySet, term: str, limit: int) -> list:
+    pks = get_fallback_index(queryset.model).search(term, limit)
+    objects = queryset.in_bulk(pks)
+    return [objects[pk] for pk in pks if pk in objects]
@@ -0,0 +1,108 @@
+"""
+Service for the aggregated shopping list of the user recipe carts
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Union
+
+from django.db.models import (
+    DecimalField,
+    IntegerField,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce
+
+from core import models
+
+
+PRICE_FIELD = DecimalField(max_digits=7, decimal_places=2)
+
+
+def get_shopping_list(
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    food_shop_id: Union[None, int] = None
+) -> dict:
+    """
+    Aggregates the cart ingredients of the user in the date range
+    One row per ingredient, priced by the food shop if given
+    """
+    items = list(get_shopping_list_items(
+        user_id,
+        date_from,
+        date_to,
+        food_shop_id
+    ))
+    for item in items:
+        item["is_done"] = item["open_quantity"] == 0
+        item["total_price"] = item["unit_price"] * item["quantity"]
+        item["open_price"] = item["unit_price"] * item["open_quantity"]
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "food_shop": food_shop_id,
+        "items": items,
+        "total_price": sum((i["total_price"] for i in items), Decimal(0)),
+        "open_price": sum((i["open_price"] for i in items), Decimal(0)),
+    }
+
+
+def get_shopping_list_items(
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    food_shop_id: Union[None, int] = None
+) -> QuerySet:
+    """
+    Returns the grouped cart ingredients query
+    (one 'GROUP BY ingredient' query)
+    """
+    return models.RecipeCartIngredient.objects.filter(
+        shopping_cart_recipe__user_id=user_id,
+        shopping_cart_recipe__date__range=(date_from, date_to),
+    ).values(
+        "ingredient_id",
+        "ingredient__ingredient_display_name",
+        "ingredient__quantity_per_unit",
+        "ingredient__unit__unit_name",
+    ).annotate(
+        quantity=Sum("buy_unit_quantity"),
+        open_quantity=Coalesce(
+            Sum("buy_unit_quantity", filter=Q(is_done=False)),
+            0,
+            output_field=IntegerField()
+        ),
+        unit_price=_get_unit_price(food_shop_id),
+    ).order_by(
+        "ingredient__ingredient_display_name",
+        "ingredient_id"
+    )
+
+
+def _get_unit_price(food_shop_id: Union[None, int]):
+    """Price of the food shop, falls back to the default price"""
+    if food_shop_id is None:
+        return Coalesce(
+            "ingredient__default_price",
+            Decimal(0),
+            output_field=PRICE_FIELD
+        )
+
+    shop_price = models.FoodShopAreaPartIngredient.objects.filter(
+        ingredient_id=OuterRef("ingredient_id"),
+        area_part__area__food_shop_id=food_shop_id,
+        ingredient_price__isnull=False,
+    ).order_by("ingredient_price").values("ingredient_price")[:1]
+
+    return Coalesce(
+        Subquery(shop_price),
+        "ingredient__default_price",
+        Decimal(0),
+        output_field=PRICE_FIELD
+    )
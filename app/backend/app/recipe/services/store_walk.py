@@ -0,0 +1,134 @@
+"""
+Service for sorting a shopping list by the walking order of a food shop
+The layout of a shop (ingredient -> area/area part position) is loaded
+with one joined query and cached until an area, area part or area part
+ingredient changes.
+"""
+from datetime import date
+from typing import NamedTuple, Union
+
+from core import models
+from recipe.cache import versioned_cache
+from recipe.services import shopping_list
+
+
+LAYOUT_NAMESPACE = "store-walk-layout"
+
+
+class LayoutPosition(NamedTuple):
+    """Position of an ingredient in the walking order of a shop"""
+    area_order_number: int
+    area_part_order_number: int
+    area_id: int
+    area_name: str
+    area_part_id: int
+    area_part_name: str
+
+
+def get_store_walk(
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    food_shop_id: Union[None, int] = None
+) -> dict:
+    """
+    Returns the shopping list of the user grouped and sorted
+    by the areas and area parts of the food shop
+    Uses the preferred food shop of the user, if no shop is given
+    Raises ValueError
+    """
+    if food_shop_id is None:
+        food_shop_id = get_preferred_food_shop_id(user_id)
+    if food_shop_id is None:
+        raise ValueError("No food shop given and no preferred food shop.")
+
+    result = shopping_list.get_shopping_list(
+        user_id,
+        date_from,
+        date_to,
+        food_shop_id
+    )
+    areas, unassigned = sort_by_layout(
+        result.pop("items"),
+        get_shop_layout(food_shop_id)
+    )
+    return result | {"areas": areas, "unassigned": unassigned}
+
+
+def sort_by_layout(items: list, layout: dict) -> tuple[list, list]:
+    """
+    Groups the items by area and area part in walking order
+    Items without a position in the shop are returned as unassigned
+    """
+    placed = []
+    unassigned = []
+    for item in items:
+        position = layout.get(item["ingredient_id"])
+        if position is None:
+            unassigned.append(item)
+        else:
+            placed.append((position, item))
+    placed.sort(key=lambda entry: entry[0][:2])
+
+    areas: list[dict] = []
+    for position, item in placed:
+        if not areas or areas[-1]["area_id"] != position.area_id:
+            areas.append({
+                "area_id": position.area_id,
+                "area_name": position.area_name,
+                "area_order_number": position.area_order_number,
+                "parts": [],
+            })
+        parts = areas[-1]["parts"]
+        if not parts or parts[-1]["area_part_id"] != position.area_part_id:
+            parts.append({
+                "area_part_id": position.area_part_id,
+                "area_part_name": position.area_part_name,
+                "area_part_order_number": position.area_part_order_number,
+                "items": [],
+            })
+        parts[-1]["items"].append(item)
+
+    return areas, unassigned
+
+
+def get_shop_layout(food_shop_id: int) -> dict:
+    """Returns the cached layout of the food shop"""
+    return versioned_cache.get_or_set(
+        LAYOUT_NAMESPACE,
+        str(food_shop_id),
+        lambda: load_shop_layout(food_shop_id)
+    )
+
+
+def load_shop_layout(food_shop_id: int) -> dict:
+    """
+    Loads the position of every ingredient of the food shop
+    If an ingredient is placed twice, the first position wins
+    """
+    rows = models.FoodShopAreaPartIngredient.objects.filter(
+        area_part__area__food_shop_id=food_shop_id
+    ).order_by(
+        "area_part__area__area_order_number",
+        "area_part__area_part_order_number",
+    ).values_list(
+        "ingredient_id",
+        "area_part__area__area_order_number",
+        "area_part__area_part_order_number",
+        "area_part__area_id",
+        "area_part__area__area_name",
+        "area_part_id",
+        "area_part__area_part_name",
+    )
+
+    layout: dict[int, LayoutPosition] = {}
+    for ingredient_id, *position in rows:
+        layout.setdefault(ingredient_id, LayoutPosition(*position))
+    return layout
+
+
+def get_preferred_food_shop_id(user_id: int) -> Union[None, int]:
+    """Returns the preferred food shop id of the user or None"""
+    return models.PreferredUserFoodShop.objects.filter(
+        user_id=user_id
+    ).values_list("food_shop_id", flat=True).first()
@@ -0,0 +1,231 @@
+"""
+Service for the /user/me/* aggregate routes
+Every payload is loaded with user scoped, joined querysets and cached
+per user under the user data version, bumped on writes to rows owned by
+the user and on writes to rows nested into the payloads of the user
+(e.g. a recipe of a favorite or the food shop of a cart).
+"""
+from datetime import date
+from typing import Any, Callable, Iterable, NamedTuple, Type
+
+from django.db.models import Count, Model, Prefetch, Q
+
+from core import models
+from recipe import serializers
+from recipe.cache import versioned_cache
+from recipe.query_planner import plan_queryset
+
+
+USER_DATA_NAMESPACE = "user-data"
+
+# model -> lookup from a row to the owning user id
+USER_OWNED_MODELS: dict[Type[Model], str] = {
+    models.User: "id",
+    models.Watchlist: "user_id",
+    models.RecipeFavorite: "user_id",
+    models.PreferredUserFoodShop: "user_id",
+    models.RecipeCart: "user_id",
+    models.RecipeWatchlist: "watchlist__user_id",
+    models.RecipeCartIngredient: "shopping_cart_recipe__user_id",
+}
+
+
+class PayloadDependency(NamedTuple):
+    """Rows of a user model showing a written row in the payloads"""
+    model: Type[Model]
+    # lookup from a row of the model to the user id
+    user_lookup: str
+    # lookup of the written rows, value from the attribute of a written row
+    lookup: str
+    attribute: str
+
+
+# rows nested into the payloads -> the users showing them
+PAYLOAD_DEPENDENCIES: dict[Type[Model], list[PayloadDependency]] = {
+    models.Recipe: [
+        PayloadDependency(
+            models.RecipeFavorite,
+            "user_id",
+            "recipe_id__in",
+            "id"
+        ),
+    ],
+    # the recipe author
+    models.User: [
+        PayloadDependency(
+            models.RecipeFavorite,
+            "user_id",
+            "recipe__user_id__in",
+            "id"
+        ),
+    ],
+    # the rating aggregate of the recipe
+    models.RecipeRating: [
+        PayloadDependency(
+            models.RecipeFavorite,
+            "user_id",
+            "recipe_id__in",
+            "recipe_id"
+        ),
+    ],
+    models.Ingredient: [
+        PayloadDependency(
+            models.RecipeCartIngredient,
+            "shopping_cart_recipe__user_id",
+            "ingredient_id__in",
+            "id"
+        ),
+    ],
+    models.Unit: [
+        PayloadDependency(
+            models.RecipeCartIngredient,
+            "shopping_cart_recipe__user_id",
+            "ingredient__unit_id__in",
+            "id"
+        ),
+    ],
+    models.FoodShop: [
+        PayloadDependency(
+            models.PreferredUserFoodShop,
+            "user_id",
+            "food_shop_id__in",
+            "id"
+        ),
+        PayloadDependency(
+            models.RecipeCart,
+            "user_id",
+            "food_shop_id__in",
+            "id"
+        ),
+    ],
+    models.DayTime: [
+        PayloadDependency(
+            models.RecipeCart,
+            "user_id",
+            "day_time_id__in",
+            "id"
+        ),
+    ],
+}
+# user fields nested into the payloads
+PAYLOAD_USER_FIELDS = frozenset(serializers.UserGetSerializer.Meta.fields)
+
+
+def get_cached(user_id: int, key: str, load: Callable[[], Any]) -> Any:
+    """Returns the cached payload of the user or caches load()"""
+    return versioned_cache.get_or_set(get_user_namespace(user_id), key, load)
+
+
+def get_user_namespace(user_id: int) -> str:
+    """Returns the version namespace of the user data"""
+    return f"{USER_DATA_NAMESPACE}:{user_id}"
+
+
+def get_owner_ids(model: Type[Model], rows: Iterable[Model]) -> set:
+    """
+    Returns the owning user ids of written rows
+    Rows owned through a parent are resolved with one query
+    """
+    lookup = USER_OWNED_MODELS[model]
+    if "__" not in lookup:
+        return {getattr(row, lookup) for row in rows}
+
+    parent_field = lookup.split("__")[0]
+    parent_model = model._meta.get_field(parent_field).related_model
+    parent_ids = {getattr(row, f"{parent_field}_id") for row in rows}
+    return set(parent_model.objects.filter(
+        id__in=parent_ids
+    ).values_list("user_id", flat=True))
+
+
+def get_dependent_user_ids(
+    model: Type[Model],
+    rows: Iterable[Model]
+) -> set:
+    """Returns the ids of the users with payloads showing the rows"""
+    rows = list(rows)
+    user_ids: set = set()
+    for dependency in PAYLOAD_DEPENDENCIES[model]:
+        user_ids |= set(dependency.model.objects.filter(**{
+            dependency.lookup: {
+                getattr(row, dependency.attribute) for row in rows
+            }
+        }).values_list(dependency.user_lookup, flat=True))
+    return user_ids
+
+
+def load_me(user_id: int) -> dict:
+    """
+    Returns the user
+    Raises User.DoesNotExist
+    """
+    user = models.User.objects.get(id=user_id)
+    return serializers.UserGetSerializer(user).data
+
+
+def load_watchlists(user_id: int) -> list:
+    """Returns the watchlists of the user with their recipes"""
+    queryset = models.Watchlist.objects.filter(
+        user_id=user_id
+    ).prefetch_related(
+        Prefetch(
+            "recipewatchlist_set",
+            queryset=models.RecipeWatchlist.objects.order_by("id")
+        )
+    ).order_by("id")
+    return serializers.UserWatchlistSerializer(queryset, many=True).data
+
+
+def load_favorite_recipes(user_id: int) -> list:
+    """Returns the favorite recipes of the user"""
+    serializer_class = serializers.RecipeFavoriteDetailSerializer
+    queryset = plan_queryset(
+        models.RecipeFavorite.objects.filter(user_id=user_id).order_by("id"),
+        serializer_class
+    )
+    return serializer_class(queryset, many=True).data
+
+
+def load_favorite_food_shop(user_id: int) -> dict:
+    """
+    Returns the preferred food shop of the user or an empty dict
+    (cached as well, None would be a cache miss)
+    """
+    favorite = models.PreferredUserFoodShop.objects.filter(
+        user_id=user_id
+    ).select_related("food_shop").first()
+    if favorite is None or favorite.food_shop is None:
+        return {}
+    return serializers.FoodShopSerializer(favorite.food_shop).data
+
+
+def load_cart(user_id: int, date_from: date, date_to: date) -> list:
+    """Returns the carts of the user in the date range with ingredients"""
+    queryset = models.RecipeCart.objects.filter(
+        user_id=user_id,
+        date__gte=date_from,
+        date__lte=date_to,
+    ).select_related("day_time", "food_shop").prefetch_related(
+        Prefetch(
+            "recipecartingredient_set",
+            queryset=models.RecipeCartIngredient.objects.select_related(
+                "ingredient__unit"
+            ).order_by("id")
+        )
+    ).order_by("date", "id")
+    return serializers.UserCartSerializer(queryset, many=True).data
+
+
+def load_cart_count(user_id: int, date_from: date, date_to: date) -> dict:
+    """Returns the number of carts and open cart ingredients (one query)"""
+    return models.RecipeCart.objects.filter(
+        user_id=user_id,
+        date__gte=date_from,
+        date__lte=date_to,
+    ).aggregate(
+        count=Count("id", distinct=True),
+        open_ingredient_count=Count(
+            "recipecartingredient",
+            filter=Q(recipecartingredient__is_done=False)
+        ),
+    )
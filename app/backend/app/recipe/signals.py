@@ -0,0 +1,183 @@
+"""
+Signal receivers invalidating the cached responses
+The versions are bumped after the commit of the write (see recipe.cache)
+"""
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import Signal
+
+from core import models
+from recipe.cache import versioned_cache, get_model_namespace
+from recipe.services.recipe_document import (
+    DOCUMENT_NAMESPACE,
+    DOCUMENT_USER_FIELDS,
+    RECIPE_ROW_MODELS,
+    SHARED_ROW_MODELS,
+    get_document_namespace,
+    get_user_recipe_ids,
+)
+from recipe.services.search import (
+    FALLBACK_DEPENDENCIES,
+    get_search_namespace,
+)
+from recipe.services.store_walk import LAYOUT_NAMESPACE
+from recipe.services import user_data
+
+
+# sent once by bulk writes (bulk_create/bulk_update skip post_save)
+# with the written rows as 'objects'
+bulk_saved = Signal()
+
+REFERENCE_MODELS = [
+    models.Unit,
+    models.Tag,
+    models.DayTime,
+    models.FoodShop,
+]
+
+SHOP_LAYOUT_MODELS = [
+    models.FoodShopArea,
+    models.FoodShopAreaPart,
+    models.FoodShopAreaPartIngredient,
+]
+
+
+def bump_model_version(sender, **kwargs) -> None:
+    """Invalidates the cached responses of the model"""
+    versioned_cache.bump_version_on_commit(get_model_namespace(sender))
+
+
+def bump_shop_layout_version(sender, **kwargs) -> None:
+    """Invalidates the cached food shop layouts"""
+    versioned_cache.bump_version_on_commit(LAYOUT_NAMESPACE)
+
+
+def bump_recipe_document_version(
+    sender,
+    instance=None,
+    objects=(),
+    **kwargs
+) -> None:
+    """Invalidates the documents of the written recipes"""
+    rows = objects if instance is None else [instance]
+    recipe_ids = {
+        row.id if sender is models.Recipe else row.recipe_id
+        for row in rows
+    }
+    for recipe_id in recipe_ids:
+        versioned_cache.bump_version_on_commit(
+            get_document_namespace(recipe_id)
+        )
+
+
+def bump_user_recipe_documents_version(
+    sender,
+    instance=None,
+    objects=(),
+    update_fields=None,
+    created=False,
+    **kwargs
+) -> None:
+    """
+    Invalidates the documents of the recipes of the written users
+    Saves of other fields (e.g. the password rehash of a login) and
+    new users (no recipes) are skipped without a query
+    """
+    if created or update_fields is not None and \
+            not DOCUMENT_USER_FIELDS.intersection(update_fields):
+        return
+    rows = objects if instance is None else [instance]
+    for recipe_id in get_user_recipe_ids({row.id for row in rows}):
+        versioned_cache.bump_version_on_commit(
+            get_document_namespace(recipe_id)
+        )
+
+
+def bump_all_recipe_documents_version(sender, **kwargs) -> None:
+    """Invalidates the documents of all recipes"""
+    versioned_cache.bump_version_on_commit(DOCUMENT_NAMESPACE)
+
+
+def bump_user_data_version(
+    sender,
+    instance=None,
+    objects=(),
+    **kwargs
+) -> None:
+    """Invalidates the cached data of the owning users"""
+    rows = objects if instance is None else [instance]
+    for user_id in user_data.get_owner_ids(sender, rows):
+        versioned_cache.bump_version_on_commit(
+            user_data.get_user_namespace(user_id)
+        )
+
+
+def bump_dependent_user_data_version(
+    sender,
+    instance=None,
+    objects=(),
+    update_fields=None,
+    created=False,
+    **kwargs
+) -> None:
+    """
+    Invalidates the cached data of the users with payloads showing
+    the written rows (e.g. a recipe of a favorite or a cart food shop)
+    """
+    if sender is models.User and (
+        created or update_fields is not None and
+        not user_data.PAYLOAD_USER_FIELDS.intersection(update_fields)
+    ):
+        return
+    rows = objects if instance is None else [instance]
+    for user_id in user_data.get_dependent_user_ids(sender, rows):
+        versioned_cache.bump_version_on_commit(
+            user_data.get_user_namespace(user_id)
+        )
+
+
+def search_index_receiver(searched_model):
+    """Returns a receiver invalidating the fallback search index"""
+    def bump_search_version(sender, **kwargs) -> None:
+        versioned_cache.bump_version_on_commit(
+            get_search_namespace(searched_model)
+        )
+    return bump_search_version
+
+
+def connect_receiver(receiver, model) -> None:
+    """Connects the receiver to every write signal of the model"""
+    for signal in [post_save, post_delete, bulk_saved]:
+        signal.connect(receiver, sender=model, weak=False)
+
+
+def connect_signals() -> None:
+    """Connects the cache invalidation receivers"""
+    for model in REFERENCE_MODELS:
+        connect_receiver(bump_model_version, model)
+    for model in SHOP_LAYOUT_MODELS:
+        connect_receiver(bump_shop_layout_version, model)
+    for model in [models.Recipe, *RECIPE_ROW_MODELS]:
+        connect_receiver(bump_recipe_document_version, model)
+    for model in SHARED_ROW_MODELS:
+        connect_receiver(bump_all_recipe_documents_version, model)
+    # before delete, the recipes of a deleted user are set to NULL
+    for signal in [post_save, pre_delete, bulk_saved]:
+        signal.connect(
+            bump_user_recipe_documents_version,
+            sender=models.User,
+            weak=False
+        )
+    for model in user_data.USER_OWNED_MODELS:
+        connect_receiver(bump_user_data_version, model)
+    for model in user_data.PAYLOAD_DEPENDENCIES:
+        # before delete, the cascades remove or set NULL the showing rows
+        for signal in [post_save, pre_delete, bulk_saved]:
+            signal.connect(
+                bump_dependent_user_data_version,
+                sender=model,
+                weak=False
+            )
+    for searched_model, dependencies in FALLBACK_DEPENDENCIES.items():
+        receiver = search_index_receiver(searched_model)
+        for model in dependencies:
+            connect_receiver(receiver, model)
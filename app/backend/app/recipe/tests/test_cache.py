@@ -0,0 +1,158 @@
+"""
+Test the versioned response cache of the reference tables
+"""
+import json
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from djdevted.test import id_url
+
+from core import models
+from core.tests.test_model_recipe import create_tag
+from core.tests.test_model_food_shop import create_food_shop
+from recipe.cache import VersionedCache, versioned_cache
+from recipe.tests.test_views_user import setup_login
+
+
+URL_TAG = "/api/v1/tag/"
+URL_FOOD_SHOP = "/api/v1/food-shop/"
+
+
+class VersionedCacheTests(TestCase):
+    """Test the versioned two tier cache"""
+
+    def setUp(self):
+        self.cache = VersionedCache("default", 60)
+
+    def test_get_or_set(self):
+        """Test the default is computed once per version"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "value"
+
+        value1 = self.cache.get_or_set("test_ns", "key", compute)
+        value2 = self.cache.get_or_set("test_ns", "key", compute)
+
+        self.assertEqual(value1, "value")
+        self.assertEqual(value2, "value")
+        self.assertEqual(len(calls), 1)
+
+    def test_bump_version(self):
+        """Test bumping the version invalidates the entries"""
+        version = self.cache.get_version("test_bump_ns")
+        self.cache.set("test_bump_ns", version, "key", "value")
+        self.cache.bump_version("test_bump_ns")
+        new_version = self.cache.get_version("test_bump_ns")
+
+        self.assertEqual(new_version, version + 1)
+        self.assertIsNone(self.cache.get("test_bump_ns", new_version, "key"))
+
+    def test_evicted_version(self):
+        """Test an evicted counter does not revive the old entries"""
+        version = self.cache.get_version("test_evict_ns")
+        self.cache.set("test_evict_ns", version, "key", "value")
+        self.cache.shared.delete("version:test_evict_ns")
+        self.cache.clear_local()
+
+        new_version = self.cache.get_version("test_evict_ns")
+
+        self.assertGreater(new_version, version)
+        self.assertIsNone(self.cache.get("test_evict_ns", new_version, "key"))
+
+    def test_shared_tier(self):
+        """Test entries of other processes are read from the shared tier"""
+        version = self.cache.get_version("test_shared_ns")
+        self.cache.set("test_shared_ns", version, "key", "value")
+        self.cache.clear_local()
+
+        self.assertEqual(
+            self.cache.get("test_shared_ns", version, "key"),
+            "value"
+        )
+
+    def test_bump_after_commit(self):
+        """Test a read before the commit is invalidated by the commit"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.cache.bump_version_on_commit("test_commit_ns")
+        # a read before the commit caches the old rows
+        version = self.cache.get_version("test_commit_ns")
+        self.cache.set("test_commit_ns", version, "key", "old")
+
+        for callback in callbacks:
+            callback()
+
+        new_version = self.cache.get_version("test_commit_ns")
+        self.assertGreater(new_version, version)
+        self.assertIsNone(self.cache.get("test_commit_ns", new_version, "key"))
+
+    async def test_async_methods(self):
+        """Test the async methods share the entries of the sync methods"""
+        version = await self.cache.aget_version("test_async_ns")
+        await self.cache.aset("test_async_ns", version, "key", "value")
+        self.cache.clear_local()
+
+        self.assertEqual(self.cache.get_version("test_async_ns"), version)
+        self.assertEqual(
+            await self.cache.aget("test_async_ns", version, "key"),
+            "value"
+        )
+
+
+class PrivateReferenceCacheApiTests(TestCase):
+    """Test list and retrieve are served from the cache"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.tag = create_tag("cached_tag")
+        versioned_cache.clear_local()
+
+    def test_list_without_queries(self):
+        """Test the second list is served without database queries"""
+        res1 = self.client.get(URL_TAG)
+        with self.assertNumQueries(0):
+            res2 = self.client.get(URL_TAG)
+
+        self.assertEqual(res2.status_code, status.HTTP_200_OK)
+        self.assertEqual(res1.data, res2.data)
+        self.assertEqual(json.loads(res2.content), res1.data)
+
+    def test_invalidate_on_save(self):
+        """Test saving a row invalidates the cached list"""
+        _ = self.client.get(URL_TAG)
+        create_tag("cached_tag2")
+
+        res = self.client.get(URL_TAG)
+
+        self.assertEqual(len(res.data), 2)
+
+    def test_invalidate_after_commit(self):
+        """Test a write invalidates the cached list after its commit"""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            create_tag("cached_tag2")
+
+        self.assertGreaterEqual(len(callbacks), 1)
+
+    def test_invalidate_on_delete(self):
+        """Test deleting a row invalidates the cached object"""
+        url = id_url(URL_FOOD_SHOP, create_food_shop("cached_shop").id)
+        res1 = self.client.get(url)
+        models.FoodShop.objects.all().delete()
+
+        res2 = self.client.get(url)
+
+        self.assertEqual(res1.status_code, status.HTTP_200_OK)
+        self.assertEqual(res2.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_prerendered_content(self):
+        """Test the cached json bytes are sent unchanged"""
+        res1 = self.client.get(id_url(URL_TAG, self.tag.id))
+        res2 = self.client.get(id_url(URL_TAG, self.tag.id))
+
+        self.assertEqual(res1.content, res2.content)
+        self.assertEqual(res2["Content-Type"], "application/json")
@@ -0,0 +1,111 @@
+"""
+Test cursor pagination of the list endpoints
+"""
+import re
+
+from django.test import TestCase
+
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core import models
+from core.tests.test_model_recipe import create_tag
+from recipe.pagination import IdCursorPagination
+from recipe.tests.test_views_user import setup_login
+
+
+URL_TAG = "/api/v1/tag/"
+
+
+def get_next_link(res) -> str:
+    """Returns the next page url of the 'Link' header or None"""
+    match = re.search(r'<([^>]+)>; rel="next"', res.get("Link", ""))
+    return match.group(1) if match else None
+
+
+class PrivateCursorPaginationTests(TestCase):
+    """Test cursor pagination on the list endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.tags = [create_tag(f"page_tag{i}") for i in range(5)]
+
+    def test_list_without_page_size(self):
+        """Test small tables fit into one page without link header"""
+        res = self.client.get(URL_TAG)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), len(self.tags))
+        self.assertNotIn("Link", res)
+
+    def test_list_not_truncated(self):
+        """Test a list without cursor or page size is not paginated"""
+        paginator = IdCursorPagination()
+        paginator.page_size = 2
+        request = self.client.get(URL_TAG).wsgi_request
+
+        page = paginator.paginate_queryset(
+            models.Tag.objects.all(),
+            Request(request)
+        )
+
+        self.assertIsNone(page)
+        self.assertEqual(paginator.get_link_header(), {})
+
+    def test_cursor_uses_default_page_size(self):
+        """Test a cursor without page size pages by the default size"""
+        paginator = IdCursorPagination()
+        paginator.page_size = 2
+        request = self.client.get(f"{URL_TAG}?cursor=").wsgi_request
+
+        page = paginator.paginate_queryset(
+            models.Tag.objects.all(),
+            Request(request)
+        )
+
+        self.assertEqual(len(page), 2)
+        self.assertIn('rel="next"', paginator.get_link_header()["Link"])
+
+    def test_walk_pages(self):
+        """Test following the next cursors returns every row once"""
+        ids = []
+        url = f"{URL_TAG}?page_size=2"
+        page_count = 0
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data), 2)
+            ids += [tag["id"] for tag in res.data]
+            url = get_next_link(res)
+            page_count += 1
+
+        self.assertEqual(page_count, 3)
+        self.assertEqual(ids, sorted(tag.id for tag in self.tags))
+
+    def test_stable_cursor_on_insert(self):
+        """Test new rows do not shift an already issued cursor"""
+        res1 = self.client.get(f"{URL_TAG}?page_size=2")
+        create_tag("page_tag_new")
+        res2 = self.client.get(get_next_link(res1))
+
+        self.assertEqual(
+            [tag["id"] for tag in res2.data],
+            [self.tags[2].id, self.tags[3].id]
+        )
+
+    def test_page_size_cap(self):
+        """Test the requested page size is capped"""
+        paginator = IdCursorPagination()
+        paginator.max_page_size = 3
+        paginator.page_size = 1
+        request = self.client.get(f"{URL_TAG}?page_size=100").wsgi_request
+
+        self.assertEqual(paginator.get_page_size(Request(request)), 3)
+
+    def test_fail_invalid_cursor(self):
+        """Test an invalid cursor is rejected"""
+        res = self.client.get(f"{URL_TAG}?cursor=invalid")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,126 @@
+"""
+Test the owner resolving of the child row permissions
+"""
+from types import SimpleNamespace
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from djdevted.exceptions import FieldRequiredError
+from djdevted.test import id_url
+
+from core.tests.test_model_user import create_user
+from core.tests.test_model_recipe import (
+    create_unit,
+    create_ingredient,
+    create_recipe,
+    create_recipe_ingredient,
+)
+from core.tests.test_model_cart import (
+    create_recipe_cart,
+    create_recipe_cart_ingredient,
+)
+from recipe.permissions import resolve_owner_id
+from recipe.tests.test_views_user import setup_login
+
+
+URL_RECIPE_ING = "/api/v1/recipe-ingredient/"
+URL_CART_ING = "/api/v1/recipe-cart-ingredient/"
+
+
+def fake_request(method: str, path: str, data: dict = None):
+    return SimpleNamespace(method=method, path=path, data=data or {})
+
+
+class ResolveOwnerIdTests(TestCase):
+    """Test resolving the owner of child rows"""
+
+    def setUp(self):
+        self.user = create_user("owner_user")
+        self.recipe = create_recipe("owner_recipe", self.user)
+        self.ingredient = create_ingredient(
+            "owner_ing", "owner_ing", create_unit("owner_unit")
+        )
+        self.recipe_ing = create_recipe_ingredient(
+            self.recipe,
+            self.ingredient
+        )
+        self.cart = create_recipe_cart(self.user, None, None)
+        self.cart_ing = create_recipe_cart_ingredient(
+            self.cart,
+            self.ingredient
+        )
+
+    def test_resolve_child_row_single_query(self):
+        """Test the owner of an existing row is one query"""
+        request = fake_request("PATCH", id_url(URL_RECIPE_ING, 1))
+        with self.assertNumQueries(1):
+            owner_id = resolve_owner_id(request, self.recipe_ing.id)
+
+        self.assertEqual(owner_id, self.user.id)
+
+    def test_resolve_posted_parent_single_query(self):
+        """Test the owner of the posted parent is one query"""
+        request = fake_request(
+            "POST",
+            URL_CART_ING,
+            {"shopping_cart_recipe": self.cart.id}
+        )
+        with self.assertNumQueries(1):
+            owner_id = resolve_owner_id(request)
+
+        self.assertEqual(owner_id, self.user.id)
+
+    def test_resolve_cart_child_row(self):
+        """Test the owner of a cart ingredient"""
+        request = fake_request("DELETE", id_url(URL_CART_ING, 1))
+        owner_id = resolve_owner_id(request, self.cart_ing.id)
+
+        self.assertEqual(owner_id, self.user.id)
+
+    def test_fail_resolve(self):
+        """Test failing on missing parent and unknown rows"""
+        with self.assertRaises(FieldRequiredError):
+            resolve_owner_id(fake_request("POST", URL_RECIPE_ING))
+        with self.assertRaises(ObjectDoesNotExist):
+            resolve_owner_id(fake_request("DELETE", URL_RECIPE_ING), 1000)
+        with self.assertRaises(NotImplementedError):
+            resolve_owner_id(fake_request("DELETE", "/api/v1/unit/1/"), 1)
+
+
+class PrivateOwnershipQueryTests(TestCase):
+    """Test the permission queries of the write endpoints"""
+
+    def setUp(self):
+        self.staff_client = APIClient()
+        self.staff_user = setup_login(self.staff_client, is_staff=True)
+        self.user = create_user("ownership_user")
+        self.recipe = create_recipe("ownership_recipe", self.user)
+        self.recipe_ing = create_recipe_ingredient(
+            self.recipe,
+            create_ingredient("own_ing", "own_ing", create_unit("own_unit"))
+        )
+
+    def test_staff_without_owner_query(self):
+        """Test staff tokens skip the owner lookup"""
+        url = id_url(URL_RECIPE_ING, self.recipe_ing.id)
+        with self.assertNumQueries(1):
+            res = self.staff_client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        # get_object + delete, no ownership query
+        with self.assertNumQueries(2):
+            res = self.staff_client.delete(url)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_fail_not_owner(self):
+        """Test other users can not modify the recipe rows"""
+        client = APIClient()
+        _ = setup_login(client, username="not_the_owner")
+
+        res = client.delete(id_url(URL_RECIPE_ING, self.recipe_ing.id))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
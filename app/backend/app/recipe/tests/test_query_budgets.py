@@ -0,0 +1,285 @@
+"""
+Query budget regression tests
+Every list/detail endpoint is requested with 10, 100 and 1000 rows,
+the query count has to stay within the budget and be equal for every
+row count (no N+1 queries).
+"""
+from typing import Callable
+
+from django.db.models import Model
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from djdevted.test import assert_query_budget
+
+from core import models
+from core.tests.test_model_recipe import (
+    create_unit,
+    create_tag,
+    create_recipe,
+)
+from core.tests.test_model_food_shop import (
+    create_food_shop,
+    create_food_shop_area,
+    create_food_shop_area_part,
+)
+from core.tests.test_model_cart import create_day_time, create_recipe_cart
+from recipe.cache import versioned_cache
+from recipe.tests.test_views_user import setup_login
+
+
+# row count -> latency budget in ms
+# generous, the budget should only catch pathological slowdowns
+LATENCY_BUDGETS_MS = {10: 1000, 100: 2000, 1000: 10000}
+DATE_RANGE = "date_from=2022-03-01&date_to=2022-03-07"
+
+
+class QueryBudgetTests(TestCase):
+    """Test the query count does not grow with the number of rows"""
+
+    def setUp(self):
+        versioned_cache.clear_local()
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.unit = create_unit("budget_unit")
+        self.recipe = create_recipe("budget_recipe", self.user)
+        self.food_shop = create_food_shop("budget_shop")
+        self.day_time = create_day_time()
+        self.cart = create_recipe_cart(
+            self.user,
+            self.food_shop,
+            self.day_time
+        )
+
+    def assert_constant_queries(
+        self,
+        url: str,
+        new_rows: Callable[[int, int], list[Model]],
+        max_queries: int,
+        get_rows: Callable[[dict], list] = lambda data: data
+    ) -> None:
+        """
+        Grows the rows with new_rows(start, stop) to every row count
+        and checks the endpoint stays within the query budget
+        """
+        query_counts = []
+        row_count_before = 0
+        for row_count, max_ms in LATENCY_BUDGETS_MS.items():
+            rows = new_rows(row_count_before, row_count)
+            type(rows[0]).objects.bulk_create(rows)
+            row_count_before = row_count
+            # bulk_create skips the signals, measure the uncached request
+            versioned_cache.clear_local()
+            versioned_cache.shared.clear()
+
+            with assert_query_budget(self, max_queries, max_ms) as budget:
+                res = self.client.get(url)
+
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(len(get_rows(res.data)), row_count)
+            query_counts.append(budget.query_count)
+
+        self.assertEqual(
+            len(set(query_counts)),
+            1,
+            f"query count grows with the rows: {query_counts}"
+        )
+
+    def new_ingredients(self, start: int, stop: int) -> list[Model]:
+        return [
+            models.Ingredient(
+                ingredient_name=f"budget_ing{i}",
+                ingredient_display_name=f"Budget ing {i}",
+                unit=self.unit,
+                default_price=1,
+                quantity_per_unit=1,
+            )
+            for i in range(start, stop)
+        ]
+
+    def new_recipes(self, start: int, stop: int) -> list[Model]:
+        return [
+            models.Recipe(
+                recipe_name=f"budget_recipe{i}",
+                person_count=2,
+                prep_description="Budget",
+                cooking_duration_min=10,
+                user=self.user,
+            )
+            for i in range(start, stop)
+        ]
+
+    def create_ingredients(self, start: int, stop: int) -> list[Model]:
+        return models.Ingredient.objects.bulk_create(
+            self.new_ingredients(start, stop)
+        )
+
+    def create_recipes(self, start: int, stop: int) -> list[Model]:
+        return models.Recipe.objects.bulk_create(
+            self.new_recipes(start, stop)
+        )
+
+    def test_ingredient_list(self):
+        """Test listing ingredients"""
+        self.assert_constant_queries(
+            "/api/v1/ingredient/?page_size=1000",
+            self.new_ingredients,
+            max_queries=1
+        )
+
+    def test_recipe_list(self):
+        """Test listing recipes with details"""
+        models.Recipe.objects.all().delete()
+        self.assert_constant_queries(
+            "/api/v1/recipe/?detail=1&page_size=1000",
+            self.new_recipes,
+            max_queries=1
+        )
+
+    def test_recipe_favorite_list(self):
+        """Test listing the favorites of the user with details"""
+        self.assert_constant_queries(
+            "/api/v1/recipe-favorite/?detail=1&page_size=1000",
+            lambda start, stop: [
+                models.RecipeFavorite(user=self.user, recipe=recipe)
+                for recipe in self.create_recipes(start, stop)
+            ],
+            max_queries=1
+        )
+
+    def test_recipe_rating_list(self):
+        """Test listing the ratings of the user with details"""
+        self.assert_constant_queries(
+            "/api/v1/recipe-rating/?detail=1&page_size=1000",
+            lambda start, stop: [
+                models.RecipeRating(user=self.user, recipe=recipe, rating=4)
+                for recipe in self.create_recipes(start, stop)
+            ],
+            max_queries=1
+        )
+
+    def test_recipe_ingredient_list(self):
+        """Test listing recipe ingredients with details"""
+        self.assert_constant_queries(
+            "/api/v1/recipe-ingredient/?detail=1&page_size=1000",
+            lambda start, stop: [
+                models.RecipeIngredient(
+                    recipe=self.recipe,
+                    ingredient=ingredient,
+                    unit_quantity=1,
+                )
+                for ingredient in self.create_ingredients(start, stop)
+            ],
+            max_queries=1
+        )
+
+    def test_recipe_tag_list(self):
+        """Test listing recipe tags with details"""
+        tag = create_tag("budget_tag")
+        self.assert_constant_queries(
+            "/api/v1/recipe-tag/?detail=1&page_size=1000",
+            lambda start, stop: [
+                models.RecipeTag(recipe=recipe, tag=tag)
+                for recipe in self.create_recipes(start, stop)
+            ],
+            max_queries=1
+        )
+
+    def test_recipe_cart_list(self):
+        """Test listing the carts of the user with details"""
+        models.RecipeCart.objects.all().delete()
+        self.assert_constant_queries(
+            "/api/v1/recipe-cart/?detail=1&page_size=1000",
+            lambda start, stop: [
+                models.RecipeCart(
+                    user=self.user,
+                    date="2022-03-01",
+                    day_time=self.day_time,
+                    recipe_name=f"budget_cart{i}",
+                    food_shop=self.food_shop,
+                )
+                for i in range(start, stop)
+            ],
+            max_queries=1
+        )
+
+    def test_recipe_cart_ingredient_list(self):
+        """Test listing cart ingredients with details"""
+        self.assert_constant_queries(
+            "/api/v1/recipe-cart-ingredient/?detail=1&page_size=1000",
+            lambda start, stop: [
+                models.RecipeCartIngredient(
+                    shopping_cart_recipe=self.cart,
+                    ingredient=ingredient,
+                    buy_unit_quantity=1,
+                )
+                for ingredient in self.create_ingredients(start, stop)
+            ],
+            max_queries=1
+        )
+
+    def test_food_shop_area_part_ingredient_list(self):
+        """Test listing the ingredients of the food shop areas"""
+        area = create_food_shop_area(self.food_shop, "budget_area")
+        area_part = create_food_shop_area_part(area)
+        self.assert_constant_queries(
+            "/api/v1/food-shop-area-part-ingredient/?detail=1&page_size=1000",
+            lambda start, stop: [
+                models.FoodShopAreaPartIngredient(
+                    area_part=area_part,
+                    ingredient=ingredient,
+                    ingredient_price=1,
+                )
+                for ingredient in self.create_ingredients(start, stop)
+            ],
+            max_queries=1
+        )
+
+    def test_recipe_full(self):
+        """Test the full recipe document"""
+        self.assert_constant_queries(
+            f"/api/v1/recipe/{self.recipe.id}/full/",
+            lambda start, stop: [
+                models.RecipeIngredient(
+                    recipe=self.recipe,
+                    ingredient=ingredient,
+                    unit_quantity=1,
+                )
+                for ingredient in self.create_ingredients(start, stop)
+            ],
+            max_queries=5,
+            get_rows=lambda data: data["ingredients"]
+        )
+
+    def test_user_me_cart(self):
+        """Test the carts of the user with their ingredients"""
+        self.assert_constant_queries(
+            f"/api/v1/user/me/cart/?{DATE_RANGE}",
+            lambda start, stop: [
+                models.RecipeCartIngredient(
+                    shopping_cart_recipe=self.cart,
+                    ingredient=ingredient,
+                    buy_unit_quantity=1,
+                )
+                for ingredient in self.create_ingredients(start, stop)
+            ],
+            max_queries=2,
+            get_rows=lambda data: data[0]["ingredients"]
+        )
+
+    def test_shopping_list(self):
+        """Test the aggregated shopping list"""
+        self.assert_constant_queries(
+            f"/api/v1/recipe-cart/shopping-list/?{DATE_RANGE}",
+            lambda start, stop: [
+                models.RecipeCartIngredient(
+                    shopping_cart_recipe=self.cart,
+                    ingredient=ingredient,
+                    buy_unit_quantity=1,
+                )
+                for ingredient in self.create_ingredients(start, stop)
+            ],
+            max_queries=1,
+            get_rows=lambda data: data["items"]
+        )
@@ -0,0 +1,115 @@
+"""
+Test the select_related/prefetch_related planning of serializers
+"""
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.tests.test_model_food_shop import (
+    create_food_shop,
+    create_food_shop_area,
+    create_food_shop_area_part,
+    create_food_shop_area_part_ingredient,
+    create_ingredient,
+    create_unit,
+)
+from recipe import serializers
+from recipe.query_planner import get_query_plan
+from recipe.tests.test_views_user import setup_login
+
+
+URL_FOOD_SHOP_API = "/api/v1/food-shop-area-part-ingredient/"
+
+
+class QueryPlannerTests(TestCase):
+    """Test planning the related lookups of serializers"""
+
+    def test_plan_flat_serializer(self):
+        """Test serializer without nested fields needs no joins"""
+        plan = get_query_plan(serializers.IngredientSerializer)
+
+        self.assertEqual(plan.select_related, [])
+        self.assertEqual(plan.prefetch_related, [])
+
+    def test_plan_nested_serializer(self):
+        """Test nested serializers are joined recursively"""
+        plan = get_query_plan(
+            serializers.FoodShopAreaPartIngredientDetailSerializer
+        )
+
+        self.assertEqual(plan.select_related, [
+            "ingredient",
+            "ingredient__unit",
+            "area_part",
+            "area_part__area",
+            "area_part__area__food_shop",
+        ])
+        self.assertEqual(plan.prefetch_related, [])
+
+    def test_plan_cart_detail_serializer(self):
+        """Test all nested fields of the cart detail are joined"""
+        plan = get_query_plan(serializers.RecipeCartDetailSerializer)
+
+        self.assertEqual(
+            sorted(plan.select_related),
+            ["day_time", "food_shop", "user"]
+        )
+
+
+class PrivateDetailListQueryTests(TestCase):
+    """Test full joined lists need a constant number of queries"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.area = create_food_shop_area(
+            create_food_shop("planner_shop"),
+            "planner_area"
+        )
+
+    def _create_rows(self, start: int, stop: int) -> None:
+        for i in range(start, stop):
+            area_part = create_food_shop_area_part(
+                self.area,
+                f"planner_part{i}",
+                i + 1
+            )
+            ingredient = create_ingredient(
+                f"planner_ing{i}",
+                f"planner_ing{i}",
+                create_unit(f"unit{i}")
+            )
+            create_food_shop_area_part_ingredient(area_part, ingredient)
+
+    def test_detail_list_constant_queries(self):
+        """Test the query count does not grow with the rows"""
+        url = f"{URL_FOOD_SHOP_API}?detail=1"
+
+        self._create_rows(0, 2)
+        with self.assertNumQueries(1):
+            res1 = self.client.get(url)
+
+        self._create_rows(2, 10)
+        with self.assertNumQueries(1):
+            res2 = self.client.get(url)
+
+        self.assertEqual(res1.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res2.data), 10)
+        self.assertEqual(
+            res2.data[0]["area_part"]["area"]["food_shop"]["shop_name"],
+            "planner_shop"
+        )
+        self.assertEqual(
+            res2.data[0]["ingredient"]["unit"]["unit_name"],
+            "unit0"
+        )
+
+    def test_flat_list_without_detail(self):
+        """Test the flat list returns the related ids"""
+        self._create_rows(0, 1)
+
+        res = self.client.get(URL_FOOD_SHOP_API)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(res.data[0]["ingredient"], int)
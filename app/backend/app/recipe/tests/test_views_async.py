@@ -0,0 +1,166 @@
+"""
+Test the async read endpoints
+"""
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from app_auth import auth_service
+from core.tests.test_model_user import create_user
+from core.tests.test_model_recipe import (
+    create_unit,
+    create_ingredient,
+    create_recipe,
+    create_recipe_ingredient,
+)
+from core.tests.test_model_food_shop import create_food_shop
+from recipe.cache import versioned_cache
+from recipe.tests.test_views_user import setup_login
+
+
+URL_ASYNC = "/api/v1/async"
+URL_ASYNC_RECIPE = f"{URL_ASYNC}/recipe/"
+URL_ASYNC_INGREDIENT = f"{URL_ASYNC}/ingredient/"
+URL_ASYNC_FOOD_SHOP = f"{URL_ASYNC}/food-shop/"
+
+
+class AsyncReadApiTests(TestCase):
+    """Test the async views return the payloads of the sync views"""
+
+    def setUp(self):
+        versioned_cache.clear_local()
+        self.sync_client = APIClient()
+        self.user = setup_login(self.sync_client)
+        token = auth_service._create_access_refresh_token(
+            self.user.id,
+            self.user.is_staff
+        )["token"]
+        self.auth = {"authorization": f"Bearer {token}"}
+
+        unit = create_unit("async_unit")
+        self.ingredients = [
+            create_ingredient(f"async_ing{i}", f"Async {i}", unit)
+            for i in range(3)
+        ]
+        self.recipe = create_recipe("async_recipe", self.user)
+        self.other_recipe = create_recipe(
+            "async_other_recipe",
+            create_user("async_other")
+        )
+        for ingredient in self.ingredients:
+            create_recipe_ingredient(self.recipe, ingredient, 2)
+        self.food_shop = create_food_shop("async_shop")
+
+    async def get(self, url: str, **extra):
+        return await self.async_client.get(url, **self.auth, **extra)
+
+    async def get_sync(self, url: str):
+        return await sync_to_async(self.sync_client.get)(url)
+
+    async def test_auth_required(self):
+        """Test auth is required for the async routes"""
+        for url in [URL_ASYNC_RECIPE, URL_ASYNC_INGREDIENT]:
+            res = await self.async_client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_refresh_token_rejected(self):
+        """Test a refresh token does not authenticate the async routes"""
+        refresh_token = auth_service._create_access_refresh_token(
+            self.user.id,
+            self.user.is_staff
+        )["refresh_token"]
+
+        res = await self.async_client.get(
+            URL_ASYNC_RECIPE,
+            authorization=f"Bearer {refresh_token}"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_list_equals_sync(self):
+        """Test the async lists equal the sync lists"""
+        for path in [
+            "/recipe/?detail=1",
+            "/ingredient/",
+            "/food-shop/",
+        ]:
+            res = await self.get(f"{URL_ASYNC}{path}")
+            res_sync = await self.get_sync(f"/api/v1{path}")
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.json(), res_sync.json())
+
+    async def test_list_pages(self):
+        """Test the cursor pagination of the async list"""
+        res = await self.get(f"{URL_ASYNC_INGREDIENT}?page_size=2")
+
+        self.assertEqual(len(res.json()), 2)
+        self.assertIn('rel="next"', res["Link"])
+
+    async def test_retrieve(self):
+        """Test retrieving own recipes and ingredients"""
+        res = await self.get(f"{URL_ASYNC_RECIPE}{self.recipe.id}/")
+        res_ingredient = await self.get(
+            f"{URL_ASYNC_INGREDIENT}{self.ingredients[0].id}/"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["recipe_name"], "async_recipe")
+        self.assertEqual(res_ingredient.json()["id"], self.ingredients[0].id)
+
+    async def test_retrieve_other_users_recipe(self):
+        """Test the owner permission of the sync view holds"""
+        res = await self.get(f"{URL_ASYNC_RECIPE}{self.other_recipe.id}/")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_retrieve_not_found(self):
+        """Test retrieving missing rows"""
+        res = await self.get(f"{URL_ASYNC_INGREDIENT}999999/")
+        res_full = await self.get(f"{URL_ASYNC_RECIPE}999999/full/")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res_full.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_full_recipe_equals_sync(self):
+        """Test the async recipe document equals the sync document"""
+        url = f"/recipe/{self.recipe.id}/full/"
+        res = await self.get(f"{URL_ASYNC}{url}")
+        res_sync = await self.get_sync(f"/api/v1{url}")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), res_sync.json())
+        self.assertEqual(len(res.json()["ingredients"]), 3)
+
+    async def test_cache_not_blocking(self):
+        """Test the cached routes use the async cache methods"""
+        urls = [
+            URL_ASYNC_FOOD_SHOP,
+            f"{URL_ASYNC_RECIPE}{self.recipe.id}/full/",
+        ]
+        sync_methods = [
+            patch.object(versioned_cache, name, side_effect=AssertionError)
+            for name in ["get_version", "get", "set"]
+        ]
+        for method in sync_methods:
+            method.start()
+            self.addCleanup(method.stop)
+
+        for _ in range(2):
+            for url in urls:
+                res = await self.get(url)
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    async def test_server_timing(self):
+        """Test async requests report the queries of the async ORM"""
+        res = await self.get(URL_ASYNC_INGREDIENT)
+
+        self.assertIn("total;dur=", res["Server-Timing"])
+        self.assertIn('desc="1 queries"', res["Server-Timing"])
@@ -0,0 +1,285 @@
+"""
+Test the bulk create and update endpoints
+"""
+from django.core.exceptions import PermissionDenied
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core import models
+from core.tests.test_model_user import create_user
+from core.tests.test_model_recipe import (
+    create_unit,
+    create_tag,
+    create_ingredient,
+    create_recipe,
+    create_recipe_ingredient,
+)
+from core.tests.test_model_food_shop import create_food_shop
+from core.tests.test_model_cart import (
+    create_recipe_cart,
+    create_recipe_cart_ingredient,
+)
+from recipe.permissions import OWNER_PATHS, check_parent_owners
+from recipe.tests.test_views_user import setup_login
+
+
+URL_RECIPE_INGREDIENT_BULK = "/api/v1/recipe-ingredient/bulk/"
+URL_RECIPE_TAG_BULK = "/api/v1/recipe-tag/bulk/"
+URL_CART_INGREDIENT_BULK = "/api/v1/recipe-cart-ingredient/bulk/"
+
+
+class PrivateRecipeIngredientBulkApiTests(TestCase):
+    """Test bulk writing recipe ingredients"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.other_user = create_user("bulk_other")
+        self.recipe = create_recipe("bulk_recipe", self.user)
+        self.other_recipe = create_recipe("bulk_other", self.other_user)
+        unit = create_unit("bulk_unit")
+        self.ingredients = [
+            create_ingredient(f"bulk_ing{i}", f"Bulk ing {i}", unit)
+            for i in range(5)
+        ]
+
+    def get_rows(self, recipe: models.Recipe) -> list:
+        return [
+            {
+                "recipe": recipe.id,
+                "ingredient": ingredient.id,
+                "unit_quantity": 100
+            }
+            for ingredient in self.ingredients
+        ]
+
+    def test_bulk_create(self):
+        """Test creating all rows with one request"""
+        res = self.client.post(
+            URL_RECIPE_INGREDIENT_BULK,
+            self.get_rows(self.recipe),
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 5)
+        self.assertTrue(all(row["id"] for row in res.data))
+        self.assertEqual(
+            models.RecipeIngredient.objects.filter(recipe=self.recipe).count(),
+            5
+        )
+
+    def test_check_parent_owners(self):
+        """Test the owners of all parents are checked with one query"""
+        owner_path = OWNER_PATHS["recipe-ingredient"]
+        with self.assertNumQueries(1):
+            check_parent_owners(owner_path, {self.recipe.id}, self.user.id)
+        with self.assertNumQueries(1), self.assertRaises(PermissionDenied):
+            check_parent_owners(
+                owner_path,
+                {self.recipe.id, self.other_recipe.id},
+                self.user.id
+            )
+
+    def test_bulk_create_forbidden(self):
+        """Test failing to create rows on a foreign recipe"""
+        rows = self.get_rows(self.recipe)
+        rows[-1]["recipe"] = self.other_recipe.id
+
+        res = self.client.post(URL_RECIPE_INGREDIENT_BULK, rows, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(models.RecipeIngredient.objects.exists())
+
+    def test_bulk_create_staff(self):
+        """Test staff users may create rows on foreign recipes"""
+        client = APIClient()
+        setup_login(client, is_staff=True, username="bulk_staff")
+
+        res = client.post(
+            URL_RECIPE_INGREDIENT_BULK,
+            self.get_rows(self.other_recipe),
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_invalid(self):
+        """Test the batch is rejected as a whole"""
+        rows = self.get_rows(self.recipe)
+        rows[2]["unit_quantity"] = -1
+        res_invalid = self.client.post(
+            URL_RECIPE_INGREDIENT_BULK,
+            rows,
+            format="json"
+        )
+        res_duplicate = self.client.post(
+            URL_RECIPE_INGREDIENT_BULK,
+            [rows[0], rows[0]],
+            format="json"
+        )
+        res_empty = self.client.post(
+            URL_RECIPE_INGREDIENT_BULK,
+            [],
+            format="json"
+        )
+
+        self.assertEqual(res_invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res_duplicate.status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(res_empty.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(models.RecipeIngredient.objects.exists())
+
+    def test_bulk_update(self):
+        """Test updating all rows with one request"""
+        rows = [
+            create_recipe_ingredient(self.recipe, ingredient)
+            for ingredient in self.ingredients[:3]
+        ]
+
+        res = self.client.patch(
+            URL_RECIPE_INGREDIENT_BULK,
+            [{"id": row.id, "unit_quantity": 50} for row in rows],
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(models.RecipeIngredient.objects.values_list(
+                "unit_quantity",
+                flat=True
+            )),
+            {50}
+        )
+
+    def test_bulk_update_forbidden(self):
+        """Test failing to update foreign rows or unknown ids"""
+        row = create_recipe_ingredient(self.other_recipe, self.ingredients[0])
+
+        res_foreign = self.client.patch(
+            URL_RECIPE_INGREDIENT_BULK,
+            [{"id": row.id, "unit_quantity": 50}],
+            format="json"
+        )
+        res_unknown = self.client.patch(
+            URL_RECIPE_INGREDIENT_BULK,
+            [{"id": row.id + 100, "unit_quantity": 50}],
+            format="json"
+        )
+        res_no_id = self.client.patch(
+            URL_RECIPE_INGREDIENT_BULK,
+            [{"unit_quantity": 50}],
+            format="json"
+        )
+
+        self.assertEqual(res_foreign.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(res_unknown.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res_no_id.status_code, status.HTTP_400_BAD_REQUEST)
+        row.refresh_from_db()
+        self.assertNotEqual(row.unit_quantity, 50)
+
+    def test_bulk_update_move_to_foreign_recipe(self):
+        """Test failing to move own rows to a foreign recipe"""
+        row = create_recipe_ingredient(self.recipe, self.ingredients[0])
+
+        res = self.client.patch(
+            URL_RECIPE_INGREDIENT_BULK,
+            [{"id": row.id, "recipe": self.other_recipe.id}],
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PrivateRecipeTagBulkApiTests(TestCase):
+    """Test bulk writing recipe tags"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.recipe = create_recipe("bulk_tag_recipe", self.user)
+        self.tags = [create_tag(f"bulk_tag{i}") for i in range(3)]
+
+    def test_bulk_create(self):
+        """Test creating recipe tags with one request"""
+        res = self.client.post(
+            URL_RECIPE_TAG_BULK,
+            [{"recipe": self.recipe.id, "tag": tag.id} for tag in self.tags],
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(models.RecipeTag.objects.count(), 3)
+
+    def test_bulk_update_not_allowed(self):
+        """Test recipe tags can not be updated"""
+        res = self.client.patch(
+            URL_RECIPE_TAG_BULK,
+            [{"id": 1, "tag": self.tags[0].id}],
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class PrivateCartIngredientBulkApiTests(TestCase):
+    """Test bulk writing recipe cart ingredients"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        unit = create_unit("bulk_cart_unit")
+        self.cart = create_recipe_cart(
+            self.user,
+            create_food_shop("bulk_shop"),
+            None
+        )
+        self.ingredients = [
+            create_ingredient(f"bulk_cart{i}", f"Bulk cart {i}", unit)
+            for i in range(3)
+        ]
+
+    def test_bulk_check_off(self):
+        """Test checking off all cart ingredients with one request"""
+        rows = [
+            create_recipe_cart_ingredient(self.cart, ingredient)
+            for ingredient in self.ingredients
+        ]
+
+        res = self.client.patch(
+            URL_CART_INGREDIENT_BULK,
+            [{"id": row.id, "is_done": True} for row in rows],
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(models.RecipeCartIngredient.objects.filter(
+            is_done=False
+        ).exists())
+
+    def test_bulk_create_forbidden(self):
+        """Test failing to fill the cart of another user"""
+        other_cart = create_recipe_cart(
+            create_user("bulk_cart_other"),
+            self.cart.food_shop,
+            None
+        )
+
+        res = self.client.post(
+            URL_CART_INGREDIENT_BULK,
+            [
+                {
+                    "shopping_cart_recipe": other_cart.id,
+                    "ingredient": ingredient.id,
+                    "buy_unit_quantity": 1,
+                }
+                for ingredient in self.ingredients
+            ],
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
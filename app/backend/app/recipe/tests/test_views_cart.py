@@ -23,6 +23,7 @@ from core.tests.test_model_cart import (
     create_recipe_cart_ingredient,
 )
 from core.tests.test_model_food_shop import create_food_shop
+from core.tests.test_model_user import create_user
 from recipe import serializers
 from recipe.tests.test_views_user import setup_login
 
@@ -200,6 +201,19 @@ class PrivateRecipeCartApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, payload_data)
 
+    def test_list_only_own(self):
+        """Test get all models, not the carts of other users"""
+        create_recipe_cart(
+            create_user("cart_other_user"),
+            self.foodshop,
+            self.daytime,
+        )
+
+        res = self.client.get(URL_RECIPE_CART)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in res.data], [self.cart.id])
+
     def test_create(self):
         """Test creating model"""
         payload = {
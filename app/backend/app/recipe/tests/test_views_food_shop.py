@@ -751,7 +751,24 @@ class PrivateFoodShopUserFavoriteApiTests(TestCase):
         pass
 
     def test_list(self):
-        """Test get all models"""
+        """Test get all models, only the own rows"""
+        payload = [self.fav_u_shop]
+        create_preferred_user_food_shop(self.user2, self.foodshop)
+        payload_data = get_payload_data(
+            serializers.PreferredUserFoodShopSerializer,
+            payload,
+            True
+        )
+
+        res = self.client.get(URL_FAV_FOOD_SHOP)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, payload_data)
+
+    def test_list_staff(self):
+        """Test get all models, staff users get the rows of all users"""
+        staff_client = APIClient()
+        _ = setup_login(staff_client, is_staff=True, username="staff_user")
         payload = [
             self.fav_u_shop,
             create_preferred_user_food_shop(
@@ -765,7 +782,7 @@ class PrivateFoodShopUserFavoriteApiTests(TestCase):
             True
         )
 
-        res = self.client.get(URL_FAV_FOOD_SHOP)
+        res = staff_client.get(URL_FAV_FOOD_SHOP)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, payload_data)
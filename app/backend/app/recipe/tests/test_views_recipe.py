@@ -595,26 +595,27 @@ class PrivateRecipeApiTests(TestCase):
         self.assertEqual(res.data, self.serializer.data)
 
     def test_retrieve_details(self):
-        """Test get model by id"""
-        # RecipeDataSerializer
-        # {
-        #     id,
-        #     recipe_name,
-        #     user: {},
-        #     person_count,
-        #     prep_description,
-        #     cooking_duration_min,
-        #     ingredients: [
-        #         {...}
-        #     ],
-        #     tags: [
-        #         {...}
-        #     ],
-        #     image: {...}
-        # }
-        # usernames = [user.username for user in User.objects.all()]
-        # ^ eg is normal and queryset is iterable
-        pass
+        """Test get the full recipe document"""
+        ingredient = create_ingredient(
+            "ingredient_name1",
+            "ingredient_name1",
+            create_unit("unit1")
+        )
+        create_recipe_ingredient(self.recipe, ingredient)
+        create_recipe_tag(self.recipe, create_tag("tag1"))
+        create_recipe_image(self.recipe)
+
+        res = self.client.get(f"{id_url(URL_RECIPE, self.recipe.id)}full/")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["recipe_name"], self.recipe.recipe_name)
+        self.assertEqual(res.data["user"]["id"], self.user.id)
+        self.assertEqual(
+            res.data["ingredients"][0]["ingredient"]["unit"]["unit_name"],
+            "unit1"
+        )
+        self.assertEqual(res.data["tags"][0]["tag_name"], "tag1")
+        self.assertEqual(len(res.data["images"]), 1)
 
     def test_list(self):
         """Test get all models"""
@@ -849,8 +850,25 @@ class PrivateRecipeFavoriteApiTests(TestCase):
         self.assertEqual(res.data, payload_data)
 
     def test_list_details(self):
-        """Test get all models, only owner or staff"""
-        pass
+        """Test get all models with details in one joined query"""
+        payload = [
+            create_recipe_favorite(
+                self.user1,
+                create_recipe(f"recipe_fav_detail{i}", self.user2)
+            )
+            for i in range(10)
+        ]
+        payload_data = get_payload_data(
+            serializers.RecipeFavoriteDetailSerializer,
+            payload,
+            True
+        )
+
+        with self.assertNumQueries(1):
+            res = self.client.get(f"{URL_RECIPE_FAV}?detail=1")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, payload_data)
 
     def test_create(self):
         """Test creating model"""
@@ -1523,7 +1541,7 @@ class PrivateRecipeWatchlistApiTests(TestCase):
         only watchlist owner or staff
         """
         payload = {
-            "watchlist": self.wlist2.id,
+            "watchlist": self.wlist1.id,
             "recipe": self.recipe2.id,
         }
         payload_data = get_payload_data(
@@ -1573,3 +1591,59 @@ class PrivateRecipeWatchlistApiTests(TestCase):
         delete_res = denied_client.delete(recipe_wlist_id_url)
 
         self.assertEqual(delete_res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_create_other_users_recipe(self):
+        """Test adding recipes of other users to the own watchlist"""
+        other_recipe = create_recipe(
+            "recipe_rw_other",
+            create_user("wlist_recipe_author")
+        )
+
+        res = self.client.post(
+            URL_RECIPE_WLIST,
+            {"watchlist": self.wlist1.id, "recipe": other_recipe.id}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_fail_other_users_watchlist(self):
+        """Test the recipe author can not modify other users watchlists"""
+        res = self.client.post(
+            URL_RECIPE_WLIST,
+            {"watchlist": self.wlist2.id, "recipe": self.recipe1.id}
+        )
+        other_recipe_wlist = create_recipe_watchlist(self.wlist2, self.recipe1)
+        delete_res = self.client.delete(
+            id_url(URL_RECIPE_WLIST, other_recipe_wlist.id)
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(delete_res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PrivateRecipeTopRatedApiTests(TestCase):
+    """Test the top rated recipes endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.rater = create_user("top_rater")
+
+    def test_top_rated(self):
+        """Test recipes are ordered by the rating average"""
+        low = create_recipe("low_rated_recipe", self.user)
+        high = create_recipe("high_rated_recipe", self.user)
+        unrated = create_recipe("unrated_recipe", self.user)
+        create_recipe_rating(self.rater, low, 2)
+        create_recipe_rating(self.rater, high, 5)
+
+        res = self.client.get(f"{URL_RECIPE}top-rated/?limit=2")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [recipe["id"] for recipe in res.data],
+            [high.id, low.id]
+        )
+        self.assertEqual(res.data[0]["rating_avg"], "5.00")
+        self.assertEqual(res.data[0]["rating_count"], 1)
+        self.assertNotIn(unrated.id, [recipe["id"] for recipe in res.data])
@@ -0,0 +1,138 @@
+"""
+Test the full recipe document endpoint
+"""
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from djdevted.test import check_is_auth_required, id_url
+
+from core import models
+from core.tests.test_model_user import create_user
+from core.tests.test_model_recipe import (
+    create_unit,
+    create_tag,
+    create_ingredient,
+    create_recipe,
+    create_recipe_favorite,
+    create_recipe_ingredient,
+    create_recipe_rating,
+    create_recipe_tag,
+    create_watchlist,
+    create_recipe_watchlist,
+)
+from recipe.cache import versioned_cache
+from recipe.services import recipe_document
+from recipe.tests.test_views_user import setup_login
+
+
+URL_RECIPE = "/api/v1/recipe/"
+
+
+def full_url(recipe_id: int) -> str:
+    return f"{id_url(URL_RECIPE, recipe_id)}full/"
+
+
+class PublicRecipeDocumentApiTests(TestCase):
+    """Test unauthenticated requests"""
+
+    def test_auth_required(self):
+        """Test auth is required for the full recipe"""
+        self.assertTrue(check_is_auth_required(APIClient(), full_url(1)))
+
+
+class PrivateRecipeDocumentApiTests(TestCase):
+    """Test the full recipe document"""
+
+    def setUp(self):
+        versioned_cache.clear_local()
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.recipe = create_recipe("document_recipe", self.user)
+        unit = create_unit("document_unit")
+        for i in range(3):
+            ingredient = create_ingredient(f"doc_ing{i}", f"Doc {i}", unit)
+            create_recipe_ingredient(self.recipe, ingredient)
+            create_recipe_tag(self.recipe, create_tag(f"doc_tag{i}"))
+
+    def test_caller_flags(self):
+        """Test the rating and the flags of the caller"""
+        other_user = create_user("document_other")
+        create_recipe_rating(other_user, self.recipe, 3)
+        create_recipe_rating(self.user, self.recipe, 5)
+        create_recipe_favorite(self.user, self.recipe)
+
+        res = self.client.get(full_url(self.recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["rating_avg"], "4.00")
+        self.assertEqual(res.data["rating_count"], 2)
+        self.assertEqual(res.data["user_rating"], "5.0")
+        self.assertTrue(res.data["is_favorite"])
+        self.assertFalse(res.data["is_on_watchlist"])
+
+        create_recipe_watchlist(create_watchlist(self.user), self.recipe)
+        res = self.client.get(full_url(self.recipe.id))
+        self.assertTrue(res.data["is_on_watchlist"])
+
+    def test_query_count(self):
+        """Test the document is loaded with a fixed number of queries"""
+        with self.assertNumQueries(5):
+            document = recipe_document.get_full_recipe(
+                self.recipe.id,
+                self.user.id
+            )
+        with self.assertNumQueries(1):
+            cached = recipe_document.get_full_recipe(
+                self.recipe.id,
+                self.user.id
+            )
+
+        self.assertEqual(len(document["ingredients"]), 3)
+        self.assertEqual(len(document["tags"]), 3)
+        self.assertEqual(document, cached)
+
+    def test_invalidated_by_child_rows(self):
+        """Test the cached document is invalidated by its rows"""
+        self.client.get(full_url(self.recipe.id))
+        models.RecipeTag.objects.filter(recipe=self.recipe).first().delete()
+        self.client.get(full_url(self.recipe.id))
+        ingredient = models.Ingredient.objects.get(ingredient_name="doc_ing0")
+        ingredient.ingredient_display_name = "Renamed"
+        ingredient.save()
+
+        res = self.client.get(full_url(self.recipe.id))
+
+        self.assertEqual(len(res.data["tags"]), 2)
+        ingredient_data = res.data["ingredients"][0]["ingredient"]
+        self.assertEqual(ingredient_data["ingredient_display_name"], "Renamed")
+
+    def test_invalidated_by_own_author(self):
+        """Test a user save invalidates only the documents of the user"""
+        other_recipe = create_recipe("document_other", create_user("doc_o"))
+        recipe_document.get_recipe_document(self.recipe.id)
+        recipe_document.get_recipe_document(other_recipe.id)
+        self.user.username = "renamed_author"
+        self.user.save()
+
+        with self.assertNumQueries(0):
+            recipe_document.get_recipe_document(other_recipe.id)
+        document = recipe_document.get_recipe_document(self.recipe.id)
+
+        self.assertEqual(document["user"]["username"], "renamed_author")
+
+    def test_password_save_keeps_documents(self):
+        """Test a password rehash does not invalidate the documents"""
+        recipe_document.get_recipe_document(self.recipe.id)
+        self.user.set_password("newSecretPW")
+        self.user.save(update_fields=["password"])
+
+        with self.assertNumQueries(0):
+            recipe_document.get_recipe_document(self.recipe.id)
+
+    def test_not_found(self):
+        """Test the full document of an unknown recipe"""
+        res = self.client.get(full_url(self.recipe.id + 100))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,206 @@
+"""
+Test the ranked ingredient, recipe and food shop search
+"""
+from unittest.mock import MagicMock, patch
+
+from django.db import connections
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from djdevted.test import check_is_auth_required
+
+from core import models
+from core.tests.test_model_recipe import (
+    create_unit,
+    create_tag,
+    create_ingredient,
+    create_recipe,
+    create_recipe_tag,
+)
+from core.tests.test_model_food_shop import create_food_shop
+from recipe.cache import versioned_cache
+from recipe.services import search
+from recipe.tests.test_views_user import setup_login
+
+
+URL_INGREDIENT_SEARCH = "/api/v1/ingredient/search/"
+URL_RECIPE_SEARCH = "/api/v1/recipe/search/"
+URL_FOOD_SHOP_SEARCH = "/api/v1/food-shop/search/"
+
+
+class TrigramIndexTests(TestCase):
+    """Test the pure python fallback index"""
+
+    def test_trigrams(self):
+        """Test the words are padded like pg_trgm"""
+        self.assertEqual(
+            search.trigrams("ab"),
+            {"  a", " ab", "ab "}
+        )
+
+    def test_ranking(self):
+        """Test substring and similar matches, best first"""
+        index = search.TrigramIndex([
+            (1, "Tomato soup"),
+            (2, "Tomatoes"),
+            (3, "Potato"),
+            (4, "Cucumber"),
+        ])
+
+        self.assertEqual(index.search("tomato", 10), [1, 2])
+        self.assertEqual(index.search("tomato", 1), [1])
+        self.assertEqual(index.search("potatoes", 10), [3, 2])
+        self.assertEqual(index.search("!", 10), [])
+
+
+class PostgresSearchTests(TestCase):
+    """Test the postgres search without a postgres server"""
+
+    def get_connection(self) -> DatabaseWrapper:
+        return DatabaseWrapper(
+            connections["default"].settings_dict | {"NAME": "postgres"}
+        )
+
+    def test_index_migration(self):
+        """Test the migration creates the missing search indexes"""
+        connection = self.get_connection()
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        migration = loader.get_migration("core", "0006_search_indexes")
+        state = loader.project_state(("core", "0005_revoked_token"))
+        operations = migration.operations[1].database_operations
+
+        get_constraints = patch.object(
+            connection.introspection,
+            "get_constraints",
+            return_value={"tag_trgm_idx": {}}
+        )
+        schema_editor = connection.schema_editor(
+            collect_sql=True,
+            atomic=False
+        )
+        with patch.object(connection, "cursor", MagicMock()), \
+                get_constraints, schema_editor as editor:
+            for operation in operations:
+                operation.database_forwards("core", editor, state, state)
+
+        sql = "\n".join(editor.collected_sql)
+        for model in search.SEARCH_CONFIGS:
+            for index in search.get_search_indexes(model):
+                self.assertIn(f'CREATE INDEX "{index.name}"', sql)
+        self.assertIn("to_tsvector('simple'", sql)
+        self.assertIn("gin_trgm_ops", sql)
+        # created by the former post_migrate hook
+        self.assertNotIn("tag_trgm_idx", sql)
+
+    def test_only_indexed_conditions(self):
+        """Test the search filters only on the GIN indexed expressions"""
+        connection = self.get_connection()
+        queryset = search._search_postgres(
+            models.Ingredient.objects.all(),
+            search.SEARCH_CONFIGS[models.Ingredient],
+            "tomato"
+        )
+
+        sql, _ = queryset.query.get_compiler(connection=connection).as_sql()
+        where = sql[sql.index(" WHERE "):]
+        self.assertIn("@@", where)
+        self.assertIn('"ingredient_display_name" %%', where)
+        self.assertNotIn("LIKE", where)
+        self.assertNotIn("UPPER", where)
+
+
+class PublicSearchApiTests(TestCase):
+    """Test unauthenticated search requests"""
+
+    def test_auth_required(self):
+        """Test auth is required for the search endpoints"""
+        client = APIClient()
+        for url in [
+            URL_INGREDIENT_SEARCH,
+            URL_RECIPE_SEARCH,
+            URL_FOOD_SHOP_SEARCH
+        ]:
+            self.assertTrue(check_is_auth_required(client, url))
+
+
+class PrivateSearchApiTests(TestCase):
+    """Test authenticated search requests"""
+
+    def setUp(self):
+        versioned_cache.clear_local()
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        unit = create_unit("search_unit")
+        self.tomato = create_ingredient("tomato", "Tomato", unit)
+        self.potato = create_ingredient("potato", "Potato", unit)
+        create_ingredient("cucumber", "Cucumber", unit)
+
+        self.soup = create_recipe("Tomato soup", self.user)
+        self.salad = create_recipe("Greek salad", self.user)
+        create_recipe_tag(self.salad, create_tag("vegetarian"))
+
+    def test_search_ingredient(self):
+        """Test searching ingredients with a typo"""
+        res = self.client.get(f"{URL_INGREDIENT_SEARCH}?search=tomatto")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["id"], self.tomato.id)
+        self.assertNotIn(
+            "cucumber",
+            [row["ingredient_name"] for row in res.data]
+        )
+
+    def test_search_limit(self):
+        """Test limiting the search results"""
+        res = self.client.get(f"{URL_INGREDIENT_SEARCH}?search=ato&limit=1")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def test_search_recipe_by_tag(self):
+        """Test searching recipes by name and tag"""
+        res_name = self.client.get(f"{URL_RECIPE_SEARCH}?search=soup")
+        res_tag = self.client.get(f"{URL_RECIPE_SEARCH}?search=vegetarian")
+
+        self.assertEqual([row["id"] for row in res_name.data], [self.soup.id])
+        self.assertEqual([row["id"] for row in res_tag.data], [self.salad.id])
+
+    def test_search_food_shop(self):
+        """Test searching food shops"""
+        shop = create_food_shop("Fresh Market")
+        create_food_shop("Corner Bakery")
+
+        res = self.client.get(f"{URL_FOOD_SHOP_SEARCH}?search=market")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in res.data], [shop.id])
+
+    def test_search_detail(self):
+        """Test searching with the detail serializer"""
+        res = self.client.get(f"{URL_RECIPE_SEARCH}?search=soup&detail=1")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["user"]["id"], self.user.id)
+
+    def test_index_invalidated(self):
+        """Test the cached index is rebuilt after changes"""
+        self.client.get(f"{URL_RECIPE_SEARCH}?search=pasta")
+        recipe = create_recipe("Pasta", self.user)
+
+        res = self.client.get(f"{URL_RECIPE_SEARCH}?search=pasta")
+
+        self.assertEqual([row["id"] for row in res.data], [recipe.id])
+
+    def test_fail_search(self):
+        """Test failing without search term or with invalid limit"""
+        res_empty = self.client.get(URL_INGREDIENT_SEARCH)
+        res_limit = self.client.get(
+            f"{URL_INGREDIENT_SEARCH}?search=tomato&limit=x"
+        )
+
+        self.assertEqual(res_empty.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res_limit.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,130 @@
+"""
+Test the aggregated shopping list endpoint
+"""
+from decimal import Decimal
+
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from djdevted.test import check_is_auth_required
+
+from core.tests.test_model_user import create_user
+from core.tests.test_model_recipe import create_ingredient, create_unit
+from core.tests.test_model_food_shop import (
+    create_food_shop,
+    create_food_shop_area,
+    create_food_shop_area_part,
+    create_food_shop_area_part_ingredient,
+)
+from core.tests.test_model_cart import (
+    create_recipe_cart,
+    create_recipe_cart_ingredient,
+)
+from recipe.tests.test_views_user import setup_login
+
+
+URL_SHOPPING_LIST = "/api/v1/recipe-cart/shopping-list/"
+URL_WEEK = f"{URL_SHOPPING_LIST}?date_from=2022-03-01&date_to=2022-03-07"
+
+
+class PublicShoppingListAuthRequired(TestCase):
+    """Test endpoint requires an authorization token"""
+
+    def test_auth_required(self):
+        """Test auth required for the shopping list"""
+        self.assertTrue(
+            check_is_auth_required(APIClient(), URL_SHOPPING_LIST)
+        )
+
+
+class PrivateShoppingListApiTests(TestCase):
+    """Test aggregating the cart ingredients"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.food_shop = create_food_shop("shopping_shop")
+        unit = create_unit("piece")
+        self.tomato = create_ingredient(
+            "tomato", "Tomato", unit, default_price=1.00
+        )
+        self.onion = create_ingredient(
+            "onion", "Onion", unit, default_price=0.50
+        )
+        cart1 = create_recipe_cart(
+            self.user, self.food_shop, None, date="2022-03-01"
+        )
+        cart2 = create_recipe_cart(
+            self.user, self.food_shop, None, date="2022-03-03"
+        )
+        create_recipe_cart_ingredient(cart1, self.tomato, 2)
+        create_recipe_cart_ingredient(cart2, self.tomato, 3, is_done=True)
+        create_recipe_cart_ingredient(cart1, self.onion, 1, is_done=True)
+
+    def test_aggregate_per_ingredient(self):
+        """Test quantities are summed per ingredient in one query"""
+        with self.assertNumQueries(1):
+            res = self.client.get(URL_WEEK)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        items = {item["ingredient"]: item for item in res.data["items"]}
+        self.assertEqual(len(items), 2)
+
+        tomato = items[self.tomato.id]
+        self.assertEqual(tomato["buy_unit_quantity"], 5)
+        self.assertEqual(tomato["open_quantity"], 2)
+        self.assertFalse(tomato["is_done"])
+        self.assertEqual(Decimal(tomato["total_price"]), Decimal("5.00"))
+
+        onion = items[self.onion.id]
+        self.assertTrue(onion["is_done"])
+        self.assertEqual(Decimal(res.data["total_price"]), Decimal("5.50"))
+        self.assertEqual(Decimal(res.data["open_price"]), Decimal("2.00"))
+
+    def test_date_range(self):
+        """Test only carts in the date range are aggregated"""
+        url = f"{URL_SHOPPING_LIST}?date_from=2022-03-02&date_to=2022-03-07"
+        res = self.client.get(url)
+
+        self.assertEqual(len(res.data["items"]), 1)
+        self.assertEqual(res.data["items"][0]["buy_unit_quantity"], 3)
+
+    def test_food_shop_prices(self):
+        """Test the food shop price replaces the default price"""
+        area_part = create_food_shop_area_part(
+            create_food_shop_area(self.food_shop, "vegetables")
+        )
+        create_food_shop_area_part_ingredient(area_part, self.tomato, 0.80)
+
+        res = self.client.get(f"{URL_WEEK}&food_shop={self.food_shop.id}")
+
+        items = {item["ingredient"]: item for item in res.data["items"]}
+        self.assertEqual(
+            Decimal(items[self.tomato.id]["unit_price"]),
+            Decimal("0.80")
+        )
+        self.assertEqual(
+            Decimal(items[self.onion.id]["unit_price"]),
+            Decimal("0.50")
+        )
+
+    def test_only_own_carts(self):
+        """Test carts of other users are not aggregated"""
+        other_client = APIClient()
+        _ = setup_login(other_client, username="other_shopper")
+
+        res = other_client.get(URL_WEEK)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["items"], [])
+
+    def test_fail_invalid_dates(self):
+        """Test invalid date ranges are rejected"""
+        url = f"{URL_SHOPPING_LIST}?date_from=2022-03-07&date_to=2022-03-01"
+        res1 = self.client.get(url)
+        res2 = self.client.get(f"{URL_SHOPPING_LIST}?date_from=invalid")
+
+        self.assertEqual(res1.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res2.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,111 @@
+"""
+Test the store walk ordering of the shopping list
+"""
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.tests.test_model_recipe import create_ingredient, create_unit
+from core.tests.test_model_food_shop import (
+    create_food_shop,
+    create_food_shop_area,
+    create_food_shop_area_part,
+    create_food_shop_area_part_ingredient,
+    create_preferred_user_food_shop,
+)
+from core.tests.test_model_cart import (
+    create_recipe_cart,
+    create_recipe_cart_ingredient,
+)
+from recipe.cache import versioned_cache
+from recipe.services import store_walk
+from recipe.tests.test_views_user import setup_login
+
+
+URL_STORE_WALK = "/api/v1/recipe-cart/store-walk/"
+URL_WEEK = f"{URL_STORE_WALK}?date_from=2022-03-01&date_to=2022-03-07"
+
+
+class PrivateStoreWalkApiTests(TestCase):
+    """Test sorting the shopping list by the shop layout"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.food_shop = create_food_shop("walk_shop")
+        unit = create_unit("walk_unit")
+
+        # area order: entrance (1) -> fridge (2)
+        fridge = create_food_shop_area(self.food_shop, "fridge", 2)
+        entrance = create_food_shop_area(self.food_shop, "entrance", 1)
+        self.milk_part = create_food_shop_area_part(fridge, "milk", 1)
+        fruit_part = create_food_shop_area_part(entrance, "fruit", 2)
+        veggie_part = create_food_shop_area_part(entrance, "veggies", 1)
+
+        self.milk = create_ingredient("milk", "Milk", unit)
+        self.apple = create_ingredient("apple", "Apple", unit)
+        self.carrot = create_ingredient("carrot", "Carrot", unit)
+        self.salt = create_ingredient("salt", "Salt", unit)
+        create_food_shop_area_part_ingredient(self.milk_part, self.milk)
+        create_food_shop_area_part_ingredient(fruit_part, self.apple)
+        create_food_shop_area_part_ingredient(veggie_part, self.carrot)
+
+        cart = create_recipe_cart(self.user, self.food_shop, None)
+        for ingredient in [self.milk, self.apple, self.carrot, self.salt]:
+            create_recipe_cart_ingredient(cart, ingredient)
+
+    def test_walking_order(self):
+        """Test the items are sorted by area and area part order"""
+        res = self.client.get(f"{URL_WEEK}&food_shop={self.food_shop.id}")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [area["area_name"] for area in res.data["areas"]],
+            ["entrance", "fridge"]
+        )
+        self.assertEqual(
+            [
+                part["items"][0]["ingredient"]
+                for area in res.data["areas"]
+                for part in area["parts"]
+            ],
+            [self.carrot.id, self.apple.id, self.milk.id]
+        )
+        self.assertEqual(
+            [item["ingredient"] for item in res.data["unassigned"]],
+            [self.salt.id]
+        )
+
+    def test_preferred_food_shop(self):
+        """Test the preferred food shop of the user is the default"""
+        create_preferred_user_food_shop(self.user, self.food_shop)
+
+        res = self.client.get(URL_WEEK)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["food_shop"], self.food_shop.id)
+        self.assertEqual(len(res.data["areas"]), 2)
+
+    def test_fail_without_food_shop(self):
+        """Test failing without given and preferred food shop"""
+        res = self.client.get(URL_WEEK)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_layout_cached(self):
+        """Test the layout is loaded once and invalidated on changes"""
+        versioned_cache.clear_local()
+        layout = store_walk.get_shop_layout(self.food_shop.id)
+        with self.assertNumQueries(0):
+            cached_layout = store_walk.get_shop_layout(self.food_shop.id)
+
+        create_food_shop_area_part_ingredient(
+            self.milk_part,
+            self.salt
+        )
+        new_layout = store_walk.get_shop_layout(self.food_shop.id)
+
+        self.assertEqual(layout, cached_layout)
+        self.assertNotIn(self.salt.id, layout)
+        self.assertIn(self.salt.id, new_layout)
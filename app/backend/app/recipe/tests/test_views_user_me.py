@@ -0,0 +1,250 @@
+"""
+Test the /user/me/* aggregate routes
+"""
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from djdevted.test import check_is_auth_required
+
+from core.tests.test_model_user import create_user
+from core.tests.test_model_recipe import (
+    create_unit,
+    create_ingredient,
+    create_recipe,
+    create_recipe_favorite,
+    create_recipe_rating,
+    create_watchlist,
+    create_recipe_watchlist,
+)
+from core.tests.test_model_food_shop import (
+    create_food_shop,
+    create_preferred_user_food_shop,
+)
+from core.tests.test_model_cart import (
+    create_day_time,
+    create_recipe_cart,
+    create_recipe_cart_ingredient,
+)
+from recipe.cache import versioned_cache
+from recipe.tests.test_views_user import setup_login
+
+
+URL_ME = "/api/v1/user/me/"
+URL_ME_WATCHLISTS = f"{URL_ME}watchlists/"
+URL_ME_FAVORITE_RECIPES = f"{URL_ME}favorite-recipes/"
+URL_ME_FAVORITE_FOOD_SHOP = f"{URL_ME}favorite-foodshop/"
+URL_ME_CART = f"{URL_ME}cart/?date_from=2022-03-01&date_to=2022-03-07"
+URL_ME_CART_COUNT = \
+    f"{URL_ME}cart/count/?date_from=2022-03-01&date_to=2022-03-07"
+
+
+class PublicUserMeApiTests(TestCase):
+    """Test unauthenticated requests"""
+
+    def test_auth_required(self):
+        """Test auth is required for the user routes"""
+        client = APIClient()
+        for url in [
+            URL_ME,
+            URL_ME_WATCHLISTS,
+            URL_ME_FAVORITE_RECIPES,
+            URL_ME_FAVORITE_FOOD_SHOP,
+            URL_ME_CART,
+            URL_ME_CART_COUNT,
+        ]:
+            self.assertTrue(check_is_auth_required(client, url))
+
+
+class PrivateUserMeApiTests(TestCase):
+    """Test the data of the authenticated user"""
+
+    def setUp(self):
+        versioned_cache.clear_local()
+        self.client = APIClient()
+        self.user = setup_login(self.client)
+        self.other_user = create_user("me_other")
+        self.recipe = create_recipe("me_recipe", self.user)
+        self.food_shop = create_food_shop("me_shop")
+        unit = create_unit("me_unit")
+        self.ingredients = [
+            create_ingredient(f"me_ing{i}", f"Me ing {i}", unit)
+            for i in range(2)
+        ]
+
+    def test_me(self):
+        """Test getting the authenticated user"""
+        res = self.client.get(URL_ME)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["id"], self.user.id)
+        self.assertEqual(res.data["username"], self.user.username)
+
+    def test_watchlists(self):
+        """Test only the watchlists of the user are listed"""
+        watchlist = create_watchlist(self.user, "me_watchlist")
+        create_recipe_watchlist(watchlist, self.recipe)
+        create_watchlist(self.other_user, "other_watchlist")
+
+        res = self.client.get(URL_ME_WATCHLISTS)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in res.data], [watchlist.id])
+        self.assertEqual(res.data[0]["recipes"][0]["recipe"], self.recipe.id)
+
+    def test_favorite_recipes(self):
+        """Test only the favorites of the user are listed"""
+        favorite = create_recipe_favorite(self.user, self.recipe)
+        create_recipe_favorite(self.other_user, self.recipe)
+
+        res = self.client.get(URL_ME_FAVORITE_RECIPES)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in res.data], [favorite.id])
+        self.assertEqual(
+            res.data[0]["recipe"]["recipe_name"],
+            self.recipe.recipe_name
+        )
+
+    def test_favorite_food_shop(self):
+        """Test getting the preferred food shop"""
+        res_none = self.client.get(URL_ME_FAVORITE_FOOD_SHOP)
+        create_preferred_user_food_shop(self.user, self.food_shop)
+        res = self.client.get(URL_ME_FAVORITE_FOOD_SHOP)
+
+        self.assertEqual(res_none.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["id"], self.food_shop.id)
+
+    def test_cart(self):
+        """Test the carts of the user in the range with ingredients"""
+        cart = create_recipe_cart(
+            self.user,
+            self.food_shop,
+            create_day_time()
+        )
+        create_recipe_cart(self.user, self.food_shop, None, date="2022-04-01")
+        create_recipe_cart(self.other_user, self.food_shop, None)
+        for ingredient in self.ingredients:
+            create_recipe_cart_ingredient(cart, ingredient)
+
+        res = self.client.get(URL_ME_CART)
+        res_count = self.client.get(URL_ME_CART_COUNT)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in res.data], [cart.id])
+        self.assertEqual(len(res.data[0]["ingredients"]), 2)
+        self.assertEqual(res.data[0]["food_shop"]["id"], self.food_shop.id)
+        self.assertEqual(
+            res_count.data,
+            {"count": 1, "open_ingredient_count": 2}
+        )
+
+    def test_cached_until_write(self):
+        """Test the cached data is reused until the user writes"""
+        cart = create_recipe_cart(self.user, self.food_shop, None)
+        row = create_recipe_cart_ingredient(cart, self.ingredients[0])
+        self.client.get(URL_ME_CART_COUNT)
+
+        with self.assertNumQueries(0):
+            res_cached = self.client.get(URL_ME_CART_COUNT)
+        create_recipe_cart(self.other_user, self.food_shop, None)
+        with self.assertNumQueries(0):
+            self.client.get(URL_ME_CART_COUNT)
+        row.is_done = True
+        row.save()
+        res = self.client.get(URL_ME_CART_COUNT)
+
+        self.assertEqual(res_cached.data["open_ingredient_count"], 1)
+        self.assertEqual(res.data["open_ingredient_count"], 0)
+
+    def test_no_food_shop_cached(self):
+        """Test a missing preferred food shop is cached as well"""
+        self.client.get(URL_ME_FAVORITE_FOOD_SHOP)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(URL_ME_FAVORITE_FOOD_SHOP)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalidated_for_affected_users(self):
+        """Test ratings and user saves bump only the affected users"""
+        create_recipe_favorite(self.user, self.recipe)
+        third_client = APIClient()
+        setup_login(third_client, username="me_third")
+        self.client.get(URL_ME_FAVORITE_RECIPES)
+        third_client.get(URL_ME)
+
+        create_recipe_rating(self.other_user, self.recipe, 4)
+        self.other_user.username = "me_other_renamed"
+        self.other_user.save()
+        with self.assertNumQueries(0):
+            third_client.get(URL_ME)
+        res = self.client.get(URL_ME_FAVORITE_RECIPES)
+        self.assertEqual(res.data[0]["recipe"]["rating_count"], 1)
+
+        self.user.username = "me_author_renamed"
+        self.user.save()
+        res = self.client.get(URL_ME_FAVORITE_RECIPES)
+        self.assertEqual(
+            res.data[0]["recipe"]["user"]["username"],
+            "me_author_renamed"
+        )
+
+    def test_invalidated_for_shown_rows(self):
+        """Test only writes to rows shown to the user bump the user"""
+        other_recipe = create_recipe("me_other_recipe", self.other_user)
+        other_shop = create_food_shop("me_other_shop")
+        create_recipe_favorite(self.user, self.recipe)
+        cart = create_recipe_cart(
+            self.user,
+            self.food_shop,
+            create_day_time()
+        )
+        create_recipe_cart_ingredient(cart, self.ingredients[0])
+        self.client.get(URL_ME_FAVORITE_RECIPES)
+        self.client.get(URL_ME_CART)
+
+        other_recipe.recipe_name = "me_other_renamed"
+        other_recipe.save()
+        self.ingredients[1].ingredient_name = "me_ing_renamed"
+        self.ingredients[1].save()
+        other_shop.shop_name = "me_other_shop_renamed"
+        other_shop.save()
+        with self.assertNumQueries(0):
+            self.client.get(URL_ME_FAVORITE_RECIPES)
+            self.client.get(URL_ME_CART)
+
+        self.recipe.recipe_name = "me_recipe_renamed"
+        self.recipe.save()
+        res = self.client.get(URL_ME_FAVORITE_RECIPES)
+        self.assertEqual(
+            res.data[0]["recipe"]["recipe_name"],
+            "me_recipe_renamed"
+        )
+        self.ingredients[0].ingredient_name = "me_ing_shown"
+        self.ingredients[0].save()
+        res = self.client.get(URL_ME_CART)
+        self.assertEqual(
+            res.data[0]["ingredients"][0]["ingredient"]["ingredient_name"],
+            "me_ing_shown"
+        )
+        self.food_shop.shop_name = "me_shop_renamed"
+        self.food_shop.save()
+        res = self.client.get(URL_ME_CART)
+        self.assertEqual(res.data[0]["food_shop"]["shop_name"],
+                         "me_shop_renamed")
+        cart.day_time.day_time_name = "nachmittag"
+        cart.day_time.save()
+        res = self.client.get(URL_ME_CART)
+        self.assertEqual(res.data[0]["day_time"]["day_time_name"],
+                         "nachmittag")
+
+    def test_invalid_date_range(self):
+        """Test failing with an invalid cart date range"""
+        res = self.client.get(
+            f"{URL_ME}cart/?date_from=2022-03-07&date_to=2022-03-01"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
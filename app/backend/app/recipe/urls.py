@@ -24,9 +24,22 @@ router.register("food-shop-favorite", views.FoodShopUserFavorite)
 router.register("day-time", views.DayTimeViewSet)
 router.register("recipe-cart", views.RecipeCartViewSet)
 router.register("recipe-cart-ingredient", views.RecipeCartIngredientViewSet)
+router.register("user/me", views.UserMeViewSet, basename="user-me")
+
+# async read paths (served without a thread per request under ASGI)
+async_urlpatterns = [
+    path("recipe/", views.AsyncRecipeView.as_view()),
+    path("recipe/<int:pk>/", views.AsyncRecipeView.as_view()),
+    path("recipe/<int:pk>/full/", views.AsyncRecipeDocumentView.as_view()),
+    path("ingredient/", views.AsyncIngredientView.as_view()),
+    path("ingredient/<int:pk>/", views.AsyncIngredientView.as_view()),
+    path("food-shop/", views.AsyncFoodShopView.as_view()),
+    path("food-shop/<int:pk>/", views.AsyncFoodShopView.as_view()),
+]
 
 # .../<int:id>/... # decorator: get_id -> if id=None -> Request.user_id
 
 urlpatterns = [
-    path("", include(router.urls))
+    path("", include(router.urls)),
+    path("async/", include(async_urlpatterns)),
 ]
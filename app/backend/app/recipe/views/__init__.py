@@ -29,3 +29,12 @@ from .cart import (
     RecipeCartViewSet,
     RecipeCartIngredientViewSet,
 )
+from .user import (
+    UserMeViewSet,
+)
+from .async_read import (
+    AsyncRecipeView,
+    AsyncIngredientView,
+    AsyncFoodShopView,
+    AsyncRecipeDocumentView,
+)
@@ -0,0 +1,204 @@
+"""
+Async read endpoints for the ASGI server (app/asgi.py)
+Plain Django async views on the async ORM: while a query runs or a
+slow client reads the response, the worker serves other requests.
+The payloads equal the sync viewsets (same serializers, query plans,
+permissions and cursor pagination).
+"""
+from typing import Union
+
+from asgiref.sync import sync_to_async
+
+from django.http import HttpRequest, HttpResponse
+from django.views import View
+
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from app_auth.authentication import JWTAuthentication
+from core import models
+from recipe import serializers
+from recipe.cache import versioned_cache, get_model_namespace
+from recipe.pagination import IdCursorPagination
+from recipe.permissions import IsOwnerOrIsStaff
+from recipe.query_planner import plan_queryset
+from recipe.services import recipe_document
+from recipe.views.general import DETAIL_QUERY_PARAM, DETAIL_QUERY_VALUES
+
+
+NOT_AUTHENTICATED = "Authentication credentials were not provided."
+PERMISSION_DENIED = "You do not have permission to perform this action."
+
+
+def json_response(
+    data: Union[dict, list],
+    status: int = 200,
+    headers: Union[None, dict] = None
+) -> HttpResponse:
+    """Renders the data like the JSONRenderer of the sync views"""
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status,
+        headers=headers,
+        content_type="application/json"
+    )
+
+
+class AsyncReadView(View):
+    """
+    Async list (?detail=1, ?cursor=, ?page_size=) and retrieve
+    GET <route>/ and GET <route>/<pk>/
+    """
+    http_method_names = ["get"]
+    queryset = None
+    serializer_class = None
+    detail_serializer_class = None
+    permission_classes = [IsAuthenticated]
+    # serve from the versioned cache of the model (see ReferenceCacheMixin)
+    reference_cache = False
+
+    async def get(self, request: HttpRequest, pk: Union[None, int] = None):
+        drf_request = Request(
+            request,
+            authenticators=[JWTAuthentication()]
+        )
+        try:
+            if not self.has_permission(drf_request):
+                return self.permission_denied(drf_request)
+        except AuthenticationFailed as exp:
+            return json_response(
+                {"detail": exp.detail},
+                status=401,
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        if not self.reference_cache:
+            return await self.read(drf_request, pk)
+
+        namespace = get_model_namespace(self.queryset.model)
+        version = await versioned_cache.aget_version(namespace)
+        key = f"async:{request.get_full_path()}"
+        cached = await versioned_cache.aget(namespace, version, key)
+        if cached is not None:
+            content, headers = cached
+            return HttpResponse(
+                content,
+                headers=headers,
+                content_type="application/json"
+            )
+
+        response = await self.read(drf_request, pk)
+        if response.status_code == 200:
+            headers = {"Link": response["Link"]} \
+                if response.has_header("Link") else {}
+            await versioned_cache.aset(
+                namespace,
+                version,
+                key,
+                (response.content, headers)
+            )
+        return response
+
+    async def read(self, request: Request, pk: Union[None, int]):
+        if pk is None:
+            return await self.list(request)
+        return await self.retrieve(request, pk)
+
+    async def list(self, request: Request) -> HttpResponse:
+        paginator = IdCursorPagination()
+        queryset = self.get_queryset(request)
+        page = await sync_to_async(paginator.paginate_queryset)(
+            queryset,
+            request
+        )
+        if page is None:
+            page = await sync_to_async(list)(queryset)
+        serializer = self.get_serializer_class(request)(page, many=True)
+        return json_response(
+            serializer.data,
+            headers=paginator.get_link_header()
+        )
+
+    async def retrieve(self, request: Request, pk: int) -> HttpResponse:
+        model = self.queryset.model
+        try:
+            obj = await self.get_queryset(request).aget(pk=pk)
+        except model.DoesNotExist:
+            return json_response({"detail": "Not found."}, status=404)
+
+        if not self.has_object_permission(request, obj):
+            return self.permission_denied(request)
+        return json_response(self.get_serializer_class(request)(obj).data)
+
+    def get_serializer_class(self, request: Request):
+        detail = request.query_params.get(DETAIL_QUERY_PARAM, "")
+        if self.detail_serializer_class and \
+                detail.lower() in DETAIL_QUERY_VALUES:
+            return self.detail_serializer_class
+        return self.serializer_class
+
+    def get_queryset(self, request: Request):
+        return plan_queryset(
+            self.queryset.all(),
+            self.get_serializer_class(request)
+        )
+
+    def has_permission(self, request: Request) -> bool:
+        return all(
+            permission().has_permission(request, self)
+            for permission in self.permission_classes
+        )
+
+    def has_object_permission(self, request: Request, obj) -> bool:
+        return all(
+            permission().has_object_permission(request, self, obj)
+            for permission in self.permission_classes
+        )
+
+    @staticmethod
+    def permission_denied(request: Request) -> HttpResponse:
+        message = PERMISSION_DENIED if request.user.is_authenticated \
+            else NOT_AUTHENTICATED
+        return json_response({"detail": message}, status=403)
+
+
+class AsyncRecipeView(AsyncReadView):
+    """Async reads of Recipe"""
+    # the owner is needed by IsOwnerOrIsStaff
+    queryset = models.Recipe.objects.select_related("user")
+    serializer_class = serializers.RecipeSerializer
+    detail_serializer_class = serializers.RecipeDetailSerializer
+    permission_classes = [IsAuthenticated, IsOwnerOrIsStaff]
+
+
+class AsyncIngredientView(AsyncReadView):
+    """Async reads of Ingredient"""
+    queryset = models.Ingredient.objects.all()
+    serializer_class = serializers.IngredientDetailSerializer
+
+
+class AsyncFoodShopView(AsyncReadView):
+    """Async reads of FoodShop"""
+    queryset = models.FoodShop.objects.all()
+    serializer_class = serializers.FoodShopSerializer
+    reference_cache = True
+
+
+class AsyncRecipeDocumentView(AsyncReadView):
+    """
+    Async full recipe document
+    GET recipe/<pk>/full/
+    """
+
+    async def read(self, request: Request, pk: Union[None, int]):
+        document = await recipe_document.aget_full_recipe(
+            pk,
+            request.user.id
+        )
+        if document is None:
+            return json_response(
+                {"error": f"Recipe {pk} not found."},
+                status=404
+            )
+        return json_response(document)
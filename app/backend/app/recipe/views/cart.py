@@ -2,10 +2,16 @@
 Views for cart.
 DayTime, RecipeCart, RecipeCartIngredient
 """
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
+from djdevted.request import IRequest
+from djdevted import response as res
+
 from core import models
 from recipe import serializers
+from recipe.cache import ReferenceCacheMixin
+from recipe.services import shopping_list, store_walk
 from recipe.permissions import (
     OnDeleteIsStaff,
     IsOwnerOrIsStaff,
@@ -13,27 +19,75 @@ from recipe.permissions import (
 )
 from .general import (
     CRDModelViewSet,
-    BaseAuthModelViewSet
+    BaseAuthModelViewSet,
+    BulkWriteMixin,
+    OwnerScopedMixin,
 )
 
 
-class DayTimeViewSet(CRDModelViewSet):
+class DayTimeViewSet(ReferenceCacheMixin, CRDModelViewSet):
     """Endpoints for DayTime"""
     serializer_class = serializers.DayTimeSerializer
     queryset = models.DayTime.objects.all()
     permission_classes = [IsAuthenticated, OnDeleteIsStaff]
 
 
-class RecipeCartViewSet(BaseAuthModelViewSet):
+class RecipeCartViewSet(OwnerScopedMixin, BaseAuthModelViewSet):
     """Endpoints for RecipeCart"""
     serializer_class = serializers.RecipeCartSerializer
+    detail_serializer_class = serializers.RecipeCartDetailSerializer
     queryset = models.RecipeCart.objects.all()
     permission_classes = [IsAuthenticated, IsOwnerOrIsStaff]
 
+    @action(methods=["GET"], detail=False, url_path="shopping-list")
+    def shopping_list(self, request: IRequest):
+        """
+        Aggregated ingredients of the user carts in a date range
+        ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD&food_shop=<id>
+        """
+        query = serializers.ShoppingListQuerySerializer(
+            data=request.query_params
+        )
+        if not query.is_valid():
+            return res.error_400_bad_request(query.errors)
+
+        result = shopping_list.get_shopping_list(
+            request.user.id,
+            query.validated_data["date_from"],
+            query.validated_data["date_to"],
+            query.validated_data.get("food_shop")
+        )
+        return res.success(serializers.ShoppingListSerializer(result).data)
+
+    @action(methods=["GET"], detail=False, url_path="store-walk")
+    def store_walk(self, request: IRequest):
+        """
+        Shopping list sorted by the walking order of the food shop
+        (default: the preferred food shop of the user)
+        ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD&food_shop=<id>
+        """
+        query = serializers.ShoppingListQuerySerializer(
+            data=request.query_params
+        )
+        if not query.is_valid():
+            return res.error_400_bad_request(query.errors)
+
+        try:
+            result = store_walk.get_store_walk(
+                request.user.id,
+                query.validated_data["date_from"],
+                query.validated_data["date_to"],
+                query.validated_data.get("food_shop")
+            )
+        except ValueError as exp:
+            return res.error_400_bad_request(exp)
+        return res.success(serializers.StoreWalkSerializer(result).data)
+
 
-class RecipeCartIngredientViewSet(BaseAuthModelViewSet):
+class RecipeCartIngredientViewSet(BulkWriteMixin, BaseAuthModelViewSet):
     """Endpoints for RecipeCartIngredient"""
     serializer_class = serializers.RecipeCartIngredientSerializer
+    detail_serializer_class = serializers.RecipeCartIngredientDetailSerializer
     queryset = models.RecipeCartIngredient.objects.all()
     permission_classes = [IsAuthenticated]
 
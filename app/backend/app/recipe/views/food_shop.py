@@ -5,11 +5,16 @@ from rest_framework.permissions import IsAuthenticated
 
 from core import models
 from recipe import serializers
+from recipe.cache import ReferenceCacheMixin
 from recipe.permissions import (
     OnDeleteIsStaff,
     IsOwnerOrIsStaff,
 )
-from .general import BaseAuthModelViewSet
+from .general import (
+    BaseAuthModelViewSet,
+    OwnerScopedMixin,
+    SearchMixin,
+)
 
 
 class BaseOnDeleteIsStaffViewSet(BaseAuthModelViewSet):
@@ -17,7 +22,11 @@ class BaseOnDeleteIsStaffViewSet(BaseAuthModelViewSet):
     permission_classes = [IsAuthenticated, OnDeleteIsStaff]
 
 
-class FoodShopViewSet(BaseOnDeleteIsStaffViewSet):
+class FoodShopViewSet(
+    SearchMixin,
+    ReferenceCacheMixin,
+    BaseOnDeleteIsStaffViewSet
+):
     """Endpoints for FoodShop"""
     serializer_class = serializers.FoodShopSerializer
     queryset = models.FoodShop.objects.all()
@@ -26,12 +35,14 @@ class FoodShopViewSet(BaseOnDeleteIsStaffViewSet):
 class FoodShopAreaViewSet(BaseOnDeleteIsStaffViewSet):
     """Endpoints for FoodShopArea"""
     serializer_class = serializers.FoodShopAreaSerializer
+    detail_serializer_class = serializers.FoodShopAreaDetailSerializer
     queryset = models.FoodShopArea.objects.all()
 
 
 class FoodShopAreaPartViewSet(BaseOnDeleteIsStaffViewSet):
     """Endpoints for FoodShopAreaPart"""
     serializer_class = serializers.FoodShopAreaPartSerializer
+    detail_serializer_class = serializers.FoodShopAreaPartDetailSerializer
     queryset = models.FoodShopAreaPart.objects.all()
     # -> endpoint for new Order!
 
@@ -39,11 +50,14 @@ class FoodShopAreaPartViewSet(BaseOnDeleteIsStaffViewSet):
 class FoodShopAreaPartIngViewSet(BaseOnDeleteIsStaffViewSet):
     """Endpoints for FoodShopAreaPartIngredient"""
     serializer_class = serializers.FoodShopAreaPartIngredientSerializer
+    detail_serializer_class = \
+        serializers.FoodShopAreaPartIngredientDetailSerializer
     queryset = models.FoodShopAreaPartIngredient.objects.all()
 
 
-class FoodShopUserFavorite(BaseAuthModelViewSet):
+class FoodShopUserFavorite(OwnerScopedMixin, BaseAuthModelViewSet):
     """Endpoints for FoodShopFavorite"""
     serializer_class = serializers.PreferredUserFoodShopSerializer
+    detail_serializer_class = serializers.PreferredUserFoodShopDetailSerializer
     queryset = models.PreferredUserFoodShop.objects.all()
     permission_classes = [IsAuthenticated, IsOwnerOrIsStaff]
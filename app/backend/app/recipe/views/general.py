@@ -1,19 +1,242 @@
 """
 Module for general ModelViewsets
 """
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.db import IntegrityError, transaction
+
 from rest_framework import mixins
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from app_auth.authentication import JWTAuthentication
 
+from djdevted.request import IRequest
+from djdevted import response as res
+
+from app import settings
+from recipe.pagination import IdCursorPagination
+from recipe.permissions import OwnerPath, check_parent_owners, get_owner_path
+from recipe.query_planner import plan_queryset
+from recipe.services import search as search_service
+from recipe.signals import bulk_saved
+
+
+DETAIL_QUERY_PARAM = "detail"
+DETAIL_QUERY_VALUES = ("1", "true")
+DETAIL_ACTIONS = ("list", "retrieve", "search")
+SEARCH_QUERY_PARAM = "search"
+SEARCH_DEFAULT_LIMIT = 20
+
+
+def get_limit_param(request: IRequest, default: int) -> int:
+    """
+    Returns the ?limit=<count> parameter, capped by API_MAX_PAGE_SIZE
+    Raises ValueError
+    """
+    limit = int(request.query_params.get("limit", default))
+    return max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+
+class PlannedQuerysetMixin:
+    """
+    Joins the queryset with the nested fields of the serializer
+    Uses the 'detail_serializer_class' on reads with '?detail=1'
+    """
+    detail_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.detail_serializer_class and self.is_detail_request():
+            return self.detail_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return plan_queryset(queryset, self.get_serializer_class())
+
+    def is_detail_request(self) -> bool:
+        """Checks whether the full joined objects are requested"""
+        if self.action not in DETAIL_ACTIONS:
+            return False
+        detail = self.request.query_params.get(DETAIL_QUERY_PARAM, "")
+        return detail.lower() in DETAIL_QUERY_VALUES
+
+
+class OwnerScopedMixin:
+    """
+    Lists only the rows of the JWT user for non-staff users
+    (for every user, if 'staff_lists_all' is False)
+    Object routes keep the 403 of IsOwnerOrIsStaff
+    """
+    owner_field = "user_id"
+    owner_scoped_actions = ("list",)
+    staff_lists_all = True
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        is_unscoped = self.staff_lists_all and self.request.user.is_staff
+        if self.action in self.owner_scoped_actions and not is_unscoped:
+            queryset = queryset.filter(
+                **{self.owner_field: self.request.user.id}
+            )
+        return queryset
+
+
+class SearchMixin:
+    """
+    Ranked search endpoint (see recipe.services.search)
+    GET <route>/search/?search=<term>&limit=<count>
+    """
+
+    @action(methods=["GET"], detail=False, url_path="search")
+    def search(self, request: IRequest):
+        try:
+            limit = get_limit_param(request, SEARCH_DEFAULT_LIMIT)
+            objects = search_service.search(
+                self.get_queryset(),
+                request.query_params.get(SEARCH_QUERY_PARAM, ""),
+                limit
+            )
+        except ValueError as exp:
+            return res.error_400_bad_request(exp)
+
+        serializer = self.get_serializer(objects, many=True)
+        return res.success(serializer.data)
+
+
+class BulkWriteMixin:
+    """
+    Bulk endpoints for the child rows of an owned parent (see OWNER_PATHS)
+    POST  <route>/bulk/ [{...}, ...]               -> bulk_create
+    PATCH <route>/bulk/ [{"id": <id>, ...}, ...]   -> bulk_update
+    The owners of all parents are checked with one query,
+    the batch is written in one transaction.
+    """
+    bulk_update_allowed = True
+
+    @action(methods=["POST", "PATCH"], detail=False, url_path="bulk")
+    def bulk(self, request: IRequest):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return res.error_400_bad_request("Expected a non-empty list.")
+        if len(rows) > settings.API_MAX_PAGE_SIZE:
+            return res.error_400_bad_request(
+                f"At most {settings.API_MAX_PAGE_SIZE} rows per request."
+            )
+        if request.method == "PATCH" and not self.bulk_update_allowed:
+            return self.http_method_not_allowed(request)
+
+        owner_path = get_owner_path(request)
+        try:
+            if request.method == "POST":
+                return self.bulk_create(request, owner_path, rows)
+            return self.bulk_update(request, owner_path, rows)
+        except (ObjectDoesNotExist, IntegrityError, ValueError) as exp:
+            return res.error_400_bad_request(exp)
+        except PermissionDenied as exp:
+            return res.error_403_forbidden(exp)
+
+    def bulk_create(
+        self,
+        request: IRequest,
+        owner_path: OwnerPath,
+        rows: list
+    ):
+        serializer = self.get_serializer(data=rows, many=True)
+        if not serializer.is_valid():
+            return res.error_400_bad_request(serializer.errors)
+
+        parent_ids = {
+            attrs[owner_path.parent_field].pk
+            for attrs in serializer.validated_data
+        }
+        self.check_bulk_owners(request, owner_path, parent_ids)
+
+        objects = [
+            owner_path.model(**attrs)
+            for attrs in serializer.validated_data
+        ]
+        with transaction.atomic():
+            owner_path.model.objects.bulk_create(objects)
+        bulk_saved.send(sender=owner_path.model, objects=objects)
+
+        return res.created(self.get_serializer(objects, many=True).data)
+
+    def bulk_update(
+        self,
+        request: IRequest,
+        owner_path: OwnerPath,
+        rows: list
+    ):
+        err_msg = "Every row requires a unique 'id'."
+        try:
+            ids = [int(row["id"]) for row in rows]
+        except (KeyError, TypeError):
+            raise ValueError(err_msg)
+        if len(set(ids)) != len(ids):
+            raise ValueError(err_msg)
+
+        instances = owner_path.model.objects.in_bulk(ids)
+        missing_ids = [id for id in ids if id not in instances]
+        if missing_ids:
+            model_name = owner_path.model.__name__
+            raise ObjectDoesNotExist(f"{model_name} {missing_ids} not found.")
+
+        serializers = [
+            self.get_serializer(instances[id], data=row, partial=True)
+            for id, row in zip(ids, rows)
+        ]
+        if not all([serializer.is_valid() for serializer in serializers]):
+            return res.error_400_bad_request(
+                [serializer.errors for serializer in serializers]
+            )
+
+        parent_field = owner_path.parent_field
+        parent_ids = {
+            getattr(instance, f"{parent_field}_id")
+            for instance in instances.values()
+        }
+        for serializer in serializers:
+            if parent_field in serializer.validated_data:
+                parent_ids.add(serializer.validated_data[parent_field].pk)
+        self.check_bulk_owners(request, owner_path, parent_ids)
+
+        fields = set()
+        for serializer in serializers:
+            for attr, value in serializer.validated_data.items():
+                setattr(serializer.instance, attr, value)
+                fields.add(attr)
+        objects = [instances[id] for id in ids]
+        if fields:
+            with transaction.atomic():
+                owner_path.model.objects.bulk_update(objects, fields)
+            bulk_saved.send(sender=owner_path.model, objects=objects)
+
+        return res.success(self.get_serializer(objects, many=True).data)
+
+    def check_bulk_owners(
+        self,
+        request: IRequest,
+        owner_path: OwnerPath,
+        parent_ids: set
+    ) -> None:
+        """
+        Staff users may write every parent, other users only their own
+        Raises ObjectDoesNotExist
+        Raises PermissionDenied
+        """
+        if not request.user.is_staff:
+            check_parent_owners(owner_path, parent_ids, request.user.id)
+
 
-class BaseAuthModelViewSet(viewsets.ModelViewSet):
+class BaseAuthModelViewSet(PlannedQuerysetMixin, viewsets.ModelViewSet):
     """Base model for recipe endpoint authentication"""
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = IdCursorPagination
 
 
 class CRDModelViewSet(
+    PlannedQuerysetMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
@@ -22,3 +245,4 @@ class CRDModelViewSet(
 ):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = IdCursorPagination
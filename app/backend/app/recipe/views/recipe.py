@@ -1,41 +1,49 @@
 """
 Views for recipe.
 """
-from rest_framework.serializers import ModelSerializer
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
 from djdevted.request import IRequest
 from djdevted import response as res
 
+from app import settings
 from core import models
 from recipe import serializers
+from recipe.cache import ReferenceCacheMixin
+from recipe.services import recipe_document
 from recipe.permissions import (
     IsStaff,
     OnDeleteIsStaff,
     IsOwnerOrIsStaff,
     IsRecipeOwnerOrIsStaff,
+    IsWatchlistOwnerOrIsStaff,
 )
 from .general import (
     CRDModelViewSet,
-    BaseAuthModelViewSet
+    BaseAuthModelViewSet,
+    BulkWriteMixin,
+    OwnerScopedMixin,
+    SearchMixin,
+    get_limit_param,
 )
 
 
-class UnitViewSet(BaseAuthModelViewSet):
+class UnitViewSet(ReferenceCacheMixin, BaseAuthModelViewSet):
     """Endpoints for unit"""
     serializer_class = serializers.UnitSerializer
     queryset = models.Unit.objects.all()
     permission_classes = [IsAuthenticated, IsStaff]
 
 
-class TagViewSet(BaseAuthModelViewSet):
+class TagViewSet(ReferenceCacheMixin, BaseAuthModelViewSet):
     """Endpoints for tag"""
     serializer_class = serializers.TagSerializer
     queryset = models.Tag.objects.all()
     permission_classes = [IsAuthenticated, OnDeleteIsStaff]
 
 
-class IngredientViewSet(BaseAuthModelViewSet):
+class IngredientViewSet(SearchMixin, BaseAuthModelViewSet):
     """Endpoints for tag"""
     serializer_class = serializers.IngredientDetailSerializer
     queryset = models.Ingredient.objects.all()
@@ -47,32 +55,64 @@ class IngredientViewSet(BaseAuthModelViewSet):
         return self.serializer_class
 
 
-class RecipeViewSet(BaseAuthModelViewSet):
+class RecipeViewSet(SearchMixin, BaseAuthModelViewSet):
     """Endpoints for tag"""
     serializer_class = serializers.RecipeSerializer
+    detail_serializer_class = serializers.RecipeDetailSerializer
     queryset = models.Recipe.objects.all()
     permission_classes = [IsAuthenticated, IsOwnerOrIsStaff]
 
+    @action(methods=["GET"], detail=False, url_path="top-rated")
+    def top_rated(self, request: IRequest):
+        """
+        Recipes ordered by the rating average (index scan)
+        ?limit=<count>
+        """
+        try:
+            limit = get_limit_param(request, settings.API_PAGE_SIZE)
+        except ValueError as exp:
+            return res.error_400_bad_request(exp)
+
+        queryset = self.get_queryset().order_by(
+            "-rating_avg",
+            "-rating_count",
+            "id"
+        )[:limit]
+        serializer = self.get_serializer(queryset, many=True)
+        return res.success(serializer.data)
 
-class RecipeFavoriteViewSet(CRDModelViewSet):
-    """Endpoints for tag"""
+    @action(methods=["GET"], detail=True, url_path="full")
+    def full(self, request: IRequest, pk=None):
+        """
+        Recipe with ingredients, tags, images, rating aggregate
+        and the favorite/watchlist flags of the caller
+        """
+        try:
+            document = recipe_document.get_full_recipe(
+                int(pk),
+                request.user.id
+            )
+        except ValueError as exp:
+            return res.error_400_bad_request(exp)
+
+        if document is None:
+            return res.error_404_not_found(f"Recipe {pk} not found.")
+        return res.success(document)
+
+
+class RecipeFavoriteViewSet(OwnerScopedMixin, CRDModelViewSet):
+    """Endpoints for recipe favorite (lists the own favorites)"""
     serializer_class = serializers.RecipeFavoriteSerializer
+    detail_serializer_class = serializers.RecipeFavoriteDetailSerializer
     queryset = models.RecipeFavorite.objects.all()
     permission_classes = [IsAuthenticated, IsOwnerOrIsStaff]
-
-    def list(self, request: IRequest):
-        qs = self.queryset.filter(user=request.user.id)
-        serializer: ModelSerializer = self.get_serializer(
-            many=True,
-            data=qs
-        )
-        _ = serializer.is_valid()
-        return res.success(serializer.data)
+    staff_lists_all = False
 
 
-class RecipeIngredientViewSet(BaseAuthModelViewSet):
+class RecipeIngredientViewSet(BulkWriteMixin, BaseAuthModelViewSet):
     """Endpoints for tag"""
     serializer_class = serializers.RecipeIngredientSerializer
+    detail_serializer_class = serializers.RecipeIngredientDetailSerializer
     queryset = models.RecipeIngredient.objects.all()
     permission_classes = [IsAuthenticated]
 
@@ -93,18 +133,21 @@ class RecipeIngredientViewSet(BaseAuthModelViewSet):
         return super().partial_update(request, *args, **kwargs)
 
 
-class RecipeRatingViewSet(BaseAuthModelViewSet):
+class RecipeRatingViewSet(OwnerScopedMixin, BaseAuthModelViewSet):
     """Endpoints for recipe rating"""
     serializer_class = serializers.RecipeRatingSerializer
+    detail_serializer_class = serializers.RecipeRatingDetailsSerializer
     queryset = models.RecipeRating.objects.all()
     permission_classes = [IsAuthenticated, IsOwnerOrIsStaff]
 
 
-class RecipeTagViewSet(CRDModelViewSet):
+class RecipeTagViewSet(BulkWriteMixin, CRDModelViewSet):
     """Endpoints for recipe tag"""
     serializer_class = serializers.RecipeTagSerializer
+    detail_serializer_class = serializers.RecipeTagDetailsSerializer
     queryset = models.RecipeTag.objects.all()
     permission_classes = [IsAuthenticated]
+    bulk_update_allowed = False
 
     @IsRecipeOwnerOrIsStaff
     def create(self, request, *args, **kwargs):
@@ -115,7 +158,7 @@ class RecipeTagViewSet(CRDModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class WatchlistViewSet(BaseAuthModelViewSet):
+class WatchlistViewSet(OwnerScopedMixin, BaseAuthModelViewSet):
     """Endpoints for watchlist"""
     serializer_class = serializers.WatchlistSerializer
     queryset = models.Watchlist.objects.all()
@@ -128,10 +171,10 @@ class RecipeWatchlistViewSet(CRDModelViewSet):
     queryset = models.RecipeWatchlist.objects.all()
     permission_classes = [IsAuthenticated]
 
-    @IsRecipeOwnerOrIsStaff
+    @IsWatchlistOwnerOrIsStaff
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @IsRecipeOwnerOrIsStaff
+    @IsWatchlistOwnerOrIsStaff
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
@@ -0,0 +1,99 @@
+"""
+Views for /user/me/*
+Aggregated, per user cached payloads of the authenticated user
+"""
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+
+from djdevted.request import IRequest
+from djdevted import response as res
+
+from app_auth.authentication import JWTAuthentication
+from core import models
+from recipe import serializers
+from recipe.services import user_data
+
+
+class UserMeViewSet(viewsets.GenericViewSet):
+    """Endpoints for the data of the authenticated user"""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request: IRequest):
+        """The authenticated user"""
+        user_id = request.user.id
+        try:
+            data = user_data.get_cached(
+                user_id,
+                "me",
+                lambda: user_data.load_me(user_id)
+            )
+        except models.User.DoesNotExist as exp:
+            return res.error_404_not_found(exp)
+        return res.success(data)
+
+    @action(methods=["GET"], detail=False, url_path="watchlists")
+    def watchlists(self, request: IRequest):
+        """Watchlists of the user with their recipe rows"""
+        user_id = request.user.id
+        return res.success(user_data.get_cached(
+            user_id,
+            "watchlists",
+            lambda: user_data.load_watchlists(user_id)
+        ))
+
+    @action(methods=["GET"], detail=False, url_path="favorite-recipes")
+    def favorite_recipes(self, request: IRequest):
+        """Favorite recipes of the user with details"""
+        user_id = request.user.id
+        return res.success(user_data.get_cached(
+            user_id,
+            "favorite-recipes",
+            lambda: user_data.load_favorite_recipes(user_id)
+        ))
+
+    @action(methods=["GET"], detail=False, url_path="favorite-foodshop")
+    def favorite_food_shop(self, request: IRequest):
+        """Preferred food shop of the user"""
+        user_id = request.user.id
+        data = user_data.get_cached(
+            user_id,
+            "favorite-foodshop",
+            lambda: user_data.load_favorite_food_shop(user_id)
+        )
+        if not data:
+            return res.error_404_not_found("No preferred food shop.")
+        return res.success(data)
+
+    @action(methods=["GET"], detail=False, url_path="cart")
+    def cart(self, request: IRequest):
+        """
+        Carts of the user with ingredients
+        ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD (default: next 7 days)
+        """
+        return self.cached_cart_response(request, user_data.load_cart)
+
+    @action(methods=["GET"], detail=False, url_path="cart/count")
+    def cart_count(self, request: IRequest):
+        """
+        Number of carts and open cart ingredients of the user
+        ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD (default: next 7 days)
+        """
+        return self.cached_cart_response(request, user_data.load_cart_count)
+
+    def cached_cart_response(self, request: IRequest, load):
+        query = serializers.ShoppingListQuerySerializer(
+            data=request.query_params
+        )
+        if not query.is_valid():
+            return res.error_400_bad_request(query.errors)
+
+        user_id = request.user.id
+        date_from = query.validated_data["date_from"]
+        date_to = query.validated_data["date_to"]
+        return res.success(user_data.get_cached(
+            user_id,
+            f"{self.action}:{date_from}:{date_to}",
+            lambda: load(user_id, date_from, date_to)
+        ))
@@ -1,3 +1,9 @@
+-- Initial design of the schema. The tables of the API are created by the
+-- Django migrations of app/backend/app/core/migrations (manage.py migrate).
+-- Databases created before core had migrations (tables of 0001_initial
+-- exist already) are upgraded with:
+--     python manage.py migrate core 0001 --fake
+--     python manage.py migrate
 -- This script was generated by a beta version of the ERD tool in pgAdmin 4.
 -- Please log an issue at https://redmine.postgresql.org/projects/pgadmin4/issues/new if you find any bugs, including reproduction steps.
 BEGIN;